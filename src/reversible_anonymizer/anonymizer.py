@@ -1,8 +1,10 @@
 # src/reversible_anonymizer/anonymizer.py
-from typing import Optional, List, Dict, Any, Union, TypedDict, Tuple
+from typing import Optional, List, Dict, Any, Union, TypedDict, Tuple, Iterable, Iterator, AsyncIterator, TextIO
+import asyncio
 import uuid
 import concurrent.futures
 import time
+import threading
 import logging
 from datetime import datetime
 import hashlib
@@ -10,10 +12,26 @@ import re
 from google.cloud import dlp_v2, service_usage_v1
 from faker import Faker
 
-from .models import AnonymizationResult, LRUCache
-from .storage.base import MemoryAdapter
+from .models import AnonymizationResult, Finding, LRUCache, MappingPlan
+from .replacement import Replacement, apply_replacements, remove_overlaps
+from .matching import LiteralIndex
+from .detection.base import Detector
+from .detection.batch import DEFAULT_MAX_REQUEST_BYTES
+from .detection.cached_detector import CachedDetector
+from .detection.chunking import (
+    DEFAULT_STREAM_CHUNK_SIZE,
+    DEFAULT_STREAM_OVERLAP,
+    find_boundary,
+    select_window_findings
+)
+from .detection.dlp_detector import DlpDetector
+from .detection.hybrid_detector import HybridDetector
+from .detection.local_detector import LocalDetector
+from .storage.base import MemoryAdapter, MappingRecord
 from .storage.firestore_adapter import FirestoreAdapter
 from .storage.secure_firestore_adapter import SecureFirestoreAdapter
+from .storage.originals_filter import OriginalsFilter
+from .storage.write_behind import WriteBehindBuffer
 from .infotypes.catalog import InfoTypeCatalog
 from .config import AnonymizerConfig
 from .common import (
@@ -30,8 +48,18 @@ from .common import (
 
 # Import our new cache adapters
 from .cache.base import CacheAdapter
+from .cache.mapping_cache import MappingCache
 from .cache.memory_cache import MemoryCacheAdapter
 from .cache.memcache_adapter import MemcacheAdapter
+from .cache.pymemcache_adapter import PymemcacheAdapter
+from .cache.redis_adapter import RedisCacheAdapter
+from .cache.tiered_cache import TieredCacheAdapter
+
+
+# Seconds re-read before the previous re-read of stored fake data, covering
+# clock skew between this host and the storage backend
+FAKE_DATA_SYNC_MARGIN = 30.0
+FAKE_DATA_SYNC_PAGE_SIZE = 1000
 
 
 class ReversibleAnonymizer:
@@ -49,12 +77,20 @@ class ReversibleAnonymizer:
             cache_type: str = "memory",
             cache_config: Optional[Dict[str, Any]] = None,
             storage_type: str = "firestore",
+            storage_config: Optional[Dict[str, Any]] = None,
             encryption_key: Optional[str] = None,
             batch_size: int = 500,
             use_realistic_fake_data: bool = True,
             faker_seed: Optional[int] = None,
             faker_locale: Optional[Union[str, List[str]]] = None,
             async_storage_updates: bool = False,
+            detector: Union[str, Detector] = "dlp",
+            min_likelihood: str = "POSSIBLE",
+            detection_cache_config: Optional[Dict[str, Any]] = None,
+            max_concurrent_dlp_calls: int = 100,
+            originals_filter: Optional[Dict[str, Any]] = None,
+            write_behind: Optional[Dict[str, Any]] = None,
+            fake_data_index: Optional[Dict[str, Any]] = None,
             debug: bool = False
     ):
         """
@@ -67,15 +103,42 @@ class ReversibleAnonymizer:
             location: Google Cloud location
             check_services: Whether to check if required services are enabled
             mode: Operation mode ("strict", "tolerant", or "audit")
-            cache_type: Type of cache to use ("memory" or "memcache")
+            cache_type: Type of cache to use ("memory", "memcache" or "redis")
             cache_config: Configuration for the cache adapter
             storage_type: Storage adapter type ("firestore" or "memory")
+            storage_config: Firestore options: "read_chunk_size" (documents per
+                get_all call), "max_concurrent_reads" (chunks in flight) and, with
+                an encryption_key, "blind_index_key" (HMAC key of the blind index
+                used for reverse lookups; derived from encryption_key by default)
             encryption_key: Optional key for encrypting stored mappings
             batch_size: Size of batches for batch operations
             use_realistic_fake_data: Whether to use realistic fake data (True) or token-based (False)
             faker_seed: Optional seed for Faker to generate consistent data
             faker_locale: Optional locale or list of locales for Faker
-            async_storage_updates: Whether to update storage asynchronously
+            async_storage_updates: Whether to return before mappings are stored;
+                they are written by the write-behind buffer
+            detector: Detection engine ("dlp", "hybrid", "local") or a Detector instance;
+                "hybrid" finds pattern-detectable types locally and sends the rest to DLP
+            min_likelihood: Minimum likelihood for findings (e.g. "POSSIBLE", "LIKELY")
+            detection_cache_config: Enables caching DLP findings per text; takes a
+                "type" ("memory", "memcache" or "redis") plus that cache's configuration
+            max_concurrent_dlp_calls: Maximum in-flight DLP requests from the async API
+            originals_filter: Enables a Bloom filter of stored originals so new
+                values skip the storage lookup; takes "expected_items",
+                "false_positive_rate", "secret", "path", "save_interval",
+                "refresh_interval" and "single_writer". Unless single_writer
+                is set, lookups are only skipped when the storage adapter
+                claims originals atomically and writes are synchronous; new
+                mappings are then written with claims
+            write_behind: Enables a buffer that coalesces the mapping writes of
+                concurrent runs into batched commits; takes "max_batch_size",
+                "flush_interval", "max_pending", "submit_timeout",
+                "max_retries", "retry_backoff", "max_backoff", "wal_path" and
+                "wal_sync" (also used by async_storage_updates)
+            fake_data_index: Options of the index deanonymize finds fake values
+                with: "max_size" (values held, least recently used evicted first;
+                default 100000) and "refresh_interval" (least seconds between
+                reads of mappings other processes stored; default 60, None disables)
             debug: Whether to enable debug logging
         """
         # Initialize basic configuration
@@ -90,6 +153,10 @@ class ReversibleAnonymizer:
         self.use_realistic_fake_data = use_realistic_fake_data
         self.debug = debug
         self.async_storage_updates = async_storage_updates
+        self.min_likelihood = min_likelihood
+        self.check_services = check_services
+        self.detection_cache_config = detection_cache_config
+        self.max_concurrent_dlp_calls = max_concurrent_dlp_calls
 
         # Set up logger
         level = logging.DEBUG if debug else logging.INFO
@@ -102,13 +169,10 @@ class ReversibleAnonymizer:
         if check_services:
             self._check_required_services()
 
-        # Initialize DLP client
-        try:
-            self.dlp_client = dlp_v2.DlpServiceClient()
-        except Exception as e:
-            self.logger.error(f"Failed to initialize DLP client: {str(e)}")
-            if self.mode == AnonymizerMode.STRICT:
-                raise AnonymizationError(f"DLP client initialization failed: {str(e)}")
+        # Initialize detection engine (creates the DLP client when needed)
+        self.dlp_client = None
+        self.cached_detector: Optional[CachedDetector] = None
+        self.detector = self._create_detector(detector)
 
         # Initialize faker for generating fake data
         from faker import Faker
@@ -117,109 +181,298 @@ class ReversibleAnonymizer:
             self.faker.seed_instance(faker_seed)
 
         # Initialize cache adapter
-        cache_config = cache_config or {}
-        if cache_type == "memory":
-            self.cache = MemoryCacheAdapter(
-                capacity=cache_config.get("capacity", 1000),
-                default_ttl=cache_config.get("ttl", 3600)
-            )
-        elif cache_type == "memcache":
-            try:
-                self.cache = MemcacheAdapter(
-                    project_id=project,
-                    host=cache_config.get("host"),
-                    port=cache_config.get("port", 11211),
-                    instance_id=cache_config.get("instance_id"),
-                    region=cache_config.get("region", "us-central1"),
-                    create_if_missing=cache_config.get("create_if_missing", False),
-                    node_count=cache_config.get("node_count", 1),
-                    node_cpu=cache_config.get("node_cpu", 1),
-                    node_memory_gb=cache_config.get("node_memory_gb", 1),
-                    default_ttl=cache_config.get("ttl", 3600),
-                    check_service=check_services
-                )
-            except ImportError as e:
-                self.logger.warning(f"Memcache not available: {str(e)}. Falling back to memory cache.")
-                self.cache = MemoryCacheAdapter(
-                    capacity=cache_config.get("capacity", 1000),
-                    default_ttl=cache_config.get("ttl", 3600)
-                )
-        else:
-            raise ConfigurationError(f"Unsupported cache type: {cache_type}")
+        self.cache = self._create_cache(cache_type, cache_config or {})
+        # Name-part mappings are only needed while their full names are hot
+        self.name_part_cache_ttl = (cache_config or {}).get("name_part_ttl")
+
+        # Index of known fake values for de-anonymization
+        fake_data_index = fake_data_index or {}
+        self.fake_data_refresh_interval = fake_data_index.get("refresh_interval", 60.0)
+        self.fake_data_index = LiteralIndex(max_size=fake_data_index.get("max_size", 100_000))
+        self._fake_data_refresh_lock = threading.Lock()
+        self._fake_data_refreshed_at: Optional[float] = None  # Monotonic time of the last re-read
+        self._fake_data_synced_at: Optional[float] = None  # Wall time the last re-read started
 
         # Initialize storage adapter
         if storage_type == "memory":
             self.storage = MemoryAdapter()
         elif storage_type == "firestore":
+            storage_config = storage_config or {}
+            read_options = {
+                "read_chunk_size": storage_config.get("read_chunk_size", 100),
+                "max_concurrent_reads": storage_config.get("max_concurrent_reads", 8)
+            }
             if encryption_key:
                 self.storage = SecureFirestoreAdapter(
                     project=project,
                     collection_name=collection_name,
-                    encryption_key=encryption_key
+                    encryption_key=encryption_key,
+                    blind_index_key=storage_config.get("blind_index_key"),
+                    **read_options
                 )
             else:
                 self.storage = FirestoreAdapter(
                     project=project,
-                    collection_name=collection_name
+                    collection_name=collection_name,
+                    **read_options
                 )
         else:
             raise ConfigurationError(f"Unsupported storage type: {storage_type}")
 
-        # For async operation, initialize thread pool
-        if self.async_storage_updates:
-            self._thread_pool = concurrent.futures.ThreadPoolExecutor(max_workers=10)
+        # Original <-> fake mappings in both directions; a shared cache gets the
+        # originals in reverse entries sealed with the storage cipher, if any
+        mapping_cipher = None
+        if cache_type != "memory" and getattr(self.storage, "encryption_enabled", False):
+            mapping_cipher = self.storage.fernet
+        self.mapping_cache = MappingCache(self.cache, cipher=mapping_cipher)
+
+        # Bloom filter of stored originals, filled from storage unless loaded from its file
+        self.originals_filter: Optional[OriginalsFilter] = None
+        self._claim_new_mappings = False
+        if originals_filter is not None:
+            self.originals_filter = self._create_originals_filter(originals_filter)
+            if not self.originals_filter.single_writer:
+                # Other writers may store an original this filter has not seen;
+                # a claim per original keeps them from forking its mapping
+                if self.storage.atomic_claims and not async_storage_updates:
+                    self._claim_new_mappings = True
+                else:
+                    self.logger.warning(
+                        "Originals filter will not skip storage lookups: set single_writer, or use "
+                        "synchronous writes to a storage adapter with atomic claims"
+                    )
+
+        # Write-behind buffer shared by all runs; asynchronous storage updates go through it
+        self.write_behind: Optional[WriteBehindBuffer] = None
+        if write_behind is not None or async_storage_updates:
+            write_behind = write_behind or {}
+            self.write_behind = WriteBehindBuffer(
+                self.storage,
+                max_batch_size=write_behind.get("max_batch_size", 500),
+                flush_interval=write_behind.get("flush_interval", 0.05),
+                max_pending=write_behind.get("max_pending", 10000),
+                submit_timeout=write_behind.get("submit_timeout"),
+                max_retries=write_behind.get("max_retries", 5),
+                retry_backoff=write_behind.get("retry_backoff", 0.1),
+                max_backoff=write_behind.get("max_backoff", 10.0),
+                wal_path=write_behind.get("wal_path"),
+                wal_sync=write_behind.get("wal_sync", True)
+            )
 
         self.logger.info(
             f"Initialized ReversibleAnonymizer with {len(self.info_types)} info types, "
             f"using {cache_type} cache and {'realistic' if use_realistic_fake_data else 'token-based'} fake data"
         )
 
-    def _async_store_mapping(self, fake_data: str, original_data: str, metadata: Dict[str, Any]) -> None:
-        """Store mapping asynchronously in storage."""
+    def _create_cache(self, cache_type: str, cache_config: Dict[str, Any]) -> CacheAdapter:
+        """Create a cache adapter of the given type."""
+        if cache_type == "memory":
+            return self._create_memory_cache(cache_config)
+        elif cache_type in ("memcache", "redis"):
+            try:
+                if cache_type == "memcache":
+                    shared = self._create_memcache(cache_config)
+                else:
+                    shared = self._create_redis_cache(cache_config)
+            except ImportError as e:
+                self.logger.warning(f"{cache_type.capitalize()} not available: {str(e)}. Falling back to memory cache.")
+                return self._create_memory_cache(cache_config)
+
+            # Optional in-process near cache in front of the shared cache
+            near_cache_config = cache_config.get("near_cache")
+            if near_cache_config:
+                return TieredCacheAdapter(
+                    l1=self._create_memory_cache(near_cache_config),
+                    l2=shared,
+                    l1_ttl=near_cache_config.get("ttl")
+                )
+            return shared
+        else:
+            raise ConfigurationError(f"Unsupported cache type: {cache_type}")
+
+    def _create_memcache(self, cache_config: Dict[str, Any]) -> MemcacheAdapter:
+        """Create a memcache adapter from cache configuration."""
+        # "pymemcache" selects the pipelined client; it takes extra socket options
+        client = cache_config.get("client", "python-memcached")
+        if client == "pymemcache":
+            adapter_class = PymemcacheAdapter
+            client_options = {
+                "noreply": cache_config.get("noreply", False),
+                "connect_timeout": cache_config.get("connect_timeout", 1.0),
+                "timeout": cache_config.get("timeout", 0.5),
+                "max_pool_size": cache_config.get("max_pool_size")
+            }
+        elif client == "python-memcached":
+            adapter_class = MemcacheAdapter
+            client_options = {}
+        else:
+            raise ConfigurationError(f"Unsupported memcache client: {client}")
+
+        return adapter_class(
+            project_id=self.project,
+            host=cache_config.get("host"),
+            port=cache_config.get("port", 11211),
+            instance_id=cache_config.get("instance_id"),
+            region=cache_config.get("region", "us-central1"),
+            create_if_missing=cache_config.get("create_if_missing", False),
+            node_count=cache_config.get("node_count", 1),
+            node_cpu=cache_config.get("node_cpu", 1),
+            node_memory_gb=cache_config.get("node_memory_gb", 1),
+            default_ttl=cache_config.get("ttl", 3600),
+            check_service=self.check_services,
+            stats_refresh_interval=cache_config.get("stats_refresh_interval"),
+            servers=cache_config.get("servers"),
+            membership_refresh_interval=cache_config.get("membership_refresh_interval"),
+            key_namespace=cache_config.get("key_namespace", "ra"),
+            key_secret=cache_config.get("key_secret"),
+            **client_options
+        )
+
+    @staticmethod
+    def _create_redis_cache(cache_config: Dict[str, Any]) -> RedisCacheAdapter:
+        """Create a Redis adapter from cache configuration."""
+        return RedisCacheAdapter(
+            url=cache_config.get("url"),
+            host=cache_config.get("host", "localhost"),
+            port=cache_config.get("port", 6379),
+            db=cache_config.get("db", 0),
+            password=cache_config.get("password"),
+            cluster=cache_config.get("cluster", False),
+            default_ttl=cache_config.get("ttl", 3600),
+            max_connections=cache_config.get("max_connections", 50),
+            socket_timeout=cache_config.get("timeout", 0.5),
+            client_side_cache=cache_config.get("client_side_cache", False),
+            client_cache_size=cache_config.get("client_cache_size", 10000),
+            key_namespace=cache_config.get("key_namespace", "ra"),
+            key_secret=cache_config.get("key_secret")
+        )
+
+    @staticmethod
+    def _create_memory_cache(cache_config: Dict[str, Any]) -> MemoryCacheAdapter:
+        """Create an in-memory cache adapter from cache configuration."""
+        return MemoryCacheAdapter(
+            capacity=cache_config.get("capacity", 1000),
+            default_ttl=cache_config.get("ttl", 3600),
+            shards=cache_config.get("shards", 16),
+            sweep_interval=cache_config.get("sweep_interval"),
+            max_bytes=cache_config.get("max_bytes"),
+            intern_values=cache_config.get("intern_values", False),
+            policy=cache_config.get("policy", "lru")
+        )
+
+    def _create_originals_filter(self, filter_config: Dict[str, Any]) -> OriginalsFilter:
+        """Create the originals filter and fill it from storage if it was not loaded."""
+        originals_filter = OriginalsFilter(
+            expected_items=filter_config.get("expected_items", 1_000_000),
+            false_positive_rate=filter_config.get("false_positive_rate", 0.001),
+            secret=filter_config.get("secret"),
+            path=filter_config.get("path"),
+            save_interval=filter_config.get("save_interval", 60.0),
+            refresh_interval=filter_config.get("refresh_interval", 5.0),
+            single_writer=filter_config.get("single_writer", False)
+        )
+        if not originals_filter.loaded:
+            try:
+                count = originals_filter.populate(self.storage)
+                self.logger.info(f"Filled originals filter with {count} stored originals")
+            except Exception as e:
+                # A filter missing stored originals would hide their mappings
+                raise ConfigurationError(f"Failed to fill originals filter from storage: {str(e)}")
+        return originals_filter
+
+    def _create_dlp_detector(self, info_type_names: List[str]) -> Detector:
+        """Create the DLP client and a detector for the given info types."""
         try:
-            self.storage.store_mapping(fake_data, original_data, metadata)
+            self.dlp_client = dlp_v2.DlpServiceClient()
         except Exception as e:
-            self.logger.warning(f"Async storage update failed: {str(e)}")
+            self.logger.error(f"Failed to initialize DLP client: {str(e)}")
+            if self.mode == AnonymizerMode.STRICT:
+                raise AnonymizationError(f"DLP client initialization failed: {str(e)}")
+            # Otherwise the detector retries on first use and each run fails by the mode rules
+
+        dlp_detector = DlpDetector(
+            project=self.project,
+            info_types=info_type_names,
+            location=self.location,
+            min_likelihood=self.min_likelihood,
+            client=self.dlp_client,
+            max_concurrent_requests=self.max_concurrent_dlp_calls
+        )
+        if self.detection_cache_config is None:
+            return dlp_detector
+
+        # Cache findings in front of DLP so repeated payloads skip inspection
+        detection_cache_config = dict(self.detection_cache_config)
+        self.cached_detector = CachedDetector(
+            detector=dlp_detector,
+            cache=self._create_cache(detection_cache_config.pop("type", "memory"), detection_cache_config),
+            info_types=[it["name"] for it in self.info_types],
+            min_likelihood=self.min_likelihood
+        )
+        return self.cached_detector
+
+    def _create_detector(self, detector: Union[str, Detector]) -> Detector:
+        """Create the detection engine from a name or use the given instance."""
+        if isinstance(detector, Detector):
+            return detector
+
+        info_type_names = [it["name"] for it in self.info_types]
+        if detector == "dlp":
+            return self._create_dlp_detector(info_type_names)
+        elif detector == "local":
+            return LocalDetector(info_types=info_type_names, min_likelihood=self.min_likelihood)
+        elif detector == "hybrid":
+            # Pattern-detectable types stay local; DLP only sees types that need ML
+            routes = HybridDetector.split_info_types(info_type_names)
+            return HybridDetector(
+                local=LocalDetector(info_types=routes["local"], min_likelihood=self.min_likelihood),
+                remote=self._create_dlp_detector(routes["remote"]) if routes["remote"] else None
+            )
+        else:
+            raise ConfigurationError(f"Unsupported detector: {detector}")
 
     def _store_mapping(self, fake_data: str, original_data: str, metadata: Dict[str, Any]) -> None:
         """Store mapping in cache and storage (possibly asynchronously)."""
         # Always store in cache immediately
-        self.cache.put(original_data, fake_data)
-
-        # Store in persistent storage
-        if self.async_storage_updates:
-            # Use thread pool for asynchronous storage update
-            self._thread_pool.submit(
-                self._async_store_mapping, fake_data, original_data, metadata
-            )
-        else:
-            # Synchronous storage update
-            try:
-                self.storage.store_mapping(fake_data, original_data, metadata)
-            except StorageError as e:
-                self.logger.error(f"Storage error: {str(e)}")
-                if self.mode == AnonymizerMode.STRICT:
-                    raise
+        self.mapping_cache.put({original_data: fake_data})
+        self._remember_originals([original_data])
+        self._write_records([(fake_data, original_data, metadata)])
 
     def _batch_store_mappings(self, mappings: Dict[str, str], metadata: Dict[str, Any]) -> None:
         """Store multiple mappings in cache and storage."""
         # Store all mappings in cache immediately
-        self.cache.batch_put(mappings)
+        self.mapping_cache.put({original: fake for fake, original in mappings.items()})
+        self._remember_originals(mappings.values())
+        self._write_records([(fake, original, metadata) for fake, original in mappings.items()])
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """
+        Wait until every mapping handed to the write-behind buffer is stored.
+
+        Returns:
+            Whether all writes finished before the timeout
+        """
+        if self.write_behind is None:
+            return True
+        return self.write_behind.flush(timeout)
+
+    def close(self, timeout: Optional[float] = None) -> None:
+        """Flush pending mapping writes and release background resources."""
+        if self.write_behind is not None:
+            self.write_behind.close(timeout)
+        if self.originals_filter is not None:
+            self.originals_filter.save()
+        if hasattr(self.cache, "close"):
+            self.cache.close()
+        if hasattr(self.storage, "close"):
+            self.storage.close()
+
+    def __enter__(self) -> 'ReversibleAnonymizer':
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
 
-        # Store in persistent storage
-        if self.async_storage_updates:
-            # Use thread pool for asynchronous storage update
-            self._thread_pool.submit(
-                lambda: self.storage.batch_store_mappings(mappings, metadata)
-            )
-        else:
-            # Synchronous storage update
-            try:
-                self.storage.batch_store_mappings(mappings, metadata)
-            except StorageError as e:
-                self.logger.error(f"Batch storage error: {str(e)}")
-                if self.mode == AnonymizerMode.STRICT:
-                    raise
     @classmethod
     def from_config(cls, config_path: Optional[str] = None) -> 'ReversibleAnonymizer':
         """Create an anonymizer instance from a configuration file or environment variables."""
@@ -580,285 +833,603 @@ class ReversibleAnonymizer:
             run_id = uuid.uuid4().hex
 
         # Statistics for detailed result
-        stats = {
+        stats = self._new_stats()
+
+        try:
+            # Detect sensitive data
+            self.logger.debug(f"Inspecting text with run_id: {run_id}")
+            findings = self.detector.inspect(text_to_deidentify)
+
+            original_to_fake_map = self._resolve_fake_data(
+                self._unique_originals(findings), run_id, stats
+            )
+
+            anonymized_text, findings_data = self._apply_findings(
+                text_to_deidentify, findings, original_to_fake_map, stats, detailed_result
+            )
+            return self._finish_anonymization(anonymized_text, findings_data, stats, run_id, detailed_result)
+
+        except Exception as e:
+            return self._handle_anonymization_error(e, text_to_deidentify, run_id, detailed_result)
+
+    async def anonymize_async(
+            self,
+            text_to_deidentify: str,
+            detailed_result: bool = False,
+            run_id: Optional[str] = None
+    ) -> Union[str, AnonymizationResult]:
+        """
+        Anonymize text without blocking the event loop.
+
+        Uses the async DLP client, async storage and cache interfaces; in-flight
+        DLP calls are bounded by max_concurrent_dlp_calls.
+
+        Args:
+            text_to_deidentify: Text to anonymize
+            detailed_result: Whether to return detailed result information
+            run_id: Optional identifier for this anonymization run
+
+        Returns:
+            By default: Anonymized text string
+            If detailed_result=True: AnonymizationResult with text and metadata
+        """
+        if run_id is None:
+            run_id = uuid.uuid4().hex
+
+        stats = self._new_stats()
+
+        try:
+            self.logger.debug(f"Inspecting text with run_id: {run_id}")
+            findings = await self.detector.inspect_async(text_to_deidentify)
+
+            original_to_fake_map = await self._resolve_fake_data_async(
+                self._unique_originals(findings), run_id, stats
+            )
+
+            anonymized_text, findings_data = self._apply_findings(
+                text_to_deidentify, findings, original_to_fake_map, stats, detailed_result
+            )
+            return self._finish_anonymization(anonymized_text, findings_data, stats, run_id, detailed_result)
+
+        except Exception as e:
+            return self._handle_anonymization_error(e, text_to_deidentify, run_id, detailed_result)
+
+    async def anonymize_many_async(
+            self,
+            texts: Iterable[str],
+            max_concurrency: int = 100,
+            detailed_result: bool = False
+    ) -> AsyncIterator[Tuple[int, Union[str, AnonymizationResult]]]:
+        """
+        Anonymize many texts concurrently, yielding results as they complete.
+
+        At most max_concurrency texts are in flight at once and texts are pulled
+        from the iterable lazily, so memory stays bounded for long streams.
+
+        Args:
+            texts: Texts to anonymize
+            max_concurrency: Maximum number of texts processed at once
+            detailed_result: Whether to return detailed result information
+
+        Yields:
+            Tuples of (index of the text in the input, anonymization result)
+        """
+        iterator = iter(enumerate(texts))
+        pending: Dict[asyncio.Future, int] = {}
+
+        def schedule_next() -> bool:
+            try:
+                index, text = next(iterator)
+            except StopIteration:
+                return False
+            task = asyncio.ensure_future(self.anonymize_async(text, detailed_result=detailed_result))
+            pending[task] = index
+            return True
+
+        try:
+            while len(pending) < max_concurrency and schedule_next():
+                pass
+
+            while pending:
+                done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    index = pending.pop(task)
+                    yield index, task.result()
+                    schedule_next()
+        finally:
+            # Cancel outstanding work if the consumer stops early
+            for task in pending:
+                task.cancel()
+
+    def _new_stats(self) -> Dict[str, Any]:
+        """Create an empty statistics dictionary for one anonymization run."""
+        return {
             "start_time": time.time(),
             "total_findings": 0,
             "findings_by_type": {},
             "cache_hits": 0,
             "storage_hits": 0,
             "new_generations": 0,
-            "name_part_mappings": 0
+            "name_part_mappings": 0,
+            "storage_lookups_skipped": 0,
+            "filter_false_positives": 0,
+            "claim_conflicts": 0
         }
 
+    def _unique_originals(self, findings: List[Finding]) -> Dict[str, str]:
+        """Map each distinct quoted original to its info type."""
+        unique_originals = {}
+        for finding in findings:
+            unique_originals[finding.quote] = finding.info_type
+        return unique_originals
+
+    def _finish_anonymization(
+            self,
+            anonymized_text: str,
+            findings_data: List[Dict[str, Any]],
+            stats: Dict[str, Any],
+            run_id: str,
+            detailed_result: bool
+    ) -> Union[str, AnonymizationResult]:
+        """Complete statistics, log the run and build the return value."""
+        # Complete statistics
+        stats["end_time"] = time.time()
+        stats["duration_ms"] = int((stats["end_time"] - stats["start_time"]) * 1000)
+
+        # Add cache statistics
+        cache_stats = self.cache.get_stats()
+        stats["cache_type"] = cache_stats.get("type", "unknown")
+        stats["cache_status"] = cache_stats
+        stats["detector_status"] = self.detector.get_stats()
+        if self.cached_detector is not None:
+            stats["detection_cache"] = self.cached_detector.get_cache_stats()
+        if self.originals_filter is not None:
+            stats["originals_filter"] = self.originals_filter.get_stats()
+        if self.write_behind is not None:
+            stats["write_behind"] = self.write_behind.get_stats()
+
+        # Log the result
+        self.logger.info(
+            f"Anonymization completed for run_id: {run_id}",
+            extra={
+                "findings": stats["total_findings"],
+                "duration_ms": stats["duration_ms"],
+                "cache_hits": stats["cache_hits"],
+                "storage_hits": stats["storage_hits"],
+                "new_generations": stats["new_generations"],
+                "name_part_mappings": stats["name_part_mappings"]
+            }
+        )
+
+        # Return appropriate result
+        if detailed_result:
+            return {
+                "anonymized_text": anonymized_text,
+                "findings": findings_data,
+                "stats": stats,
+                "run_id": run_id
+            }
+        return anonymized_text
+
+    def _handle_anonymization_error(
+            self,
+            error: Exception,
+            text_to_deidentify: str,
+            run_id: str,
+            detailed_result: bool
+    ) -> Union[str, AnonymizationResult]:
+        """Return the original text in tolerant mode, otherwise raise."""
+        error_msg = f"Anonymization failed: {str(error)}"
+        self.logger.error(error_msg, exc_info=True)
+
+        if self.mode == AnonymizerMode.TOLERANT:
+            # In tolerant mode, return original text
+            return text_to_deidentify if not detailed_result else {
+                "anonymized_text": text_to_deidentify,
+                "findings": [],
+                "stats": {"error": str(error)},
+                "run_id": run_id
+            }
+        else:
+            # In strict mode, raise exception
+            raise AnonymizationError(error_msg, details={"run_id": run_id})
+
+    def _resolve_fake_data(
+            self,
+            unique_originals: Dict[str, str],
+            run_id: str,
+            stats: Dict[str, Any]
+    ) -> Dict[str, str]:
+        """
+        Find or create fake data for every original value.
+
+        Looks originals up in the cache, then storage, and generates and
+        persists new fake data for the rest.
+
+        Args:
+            unique_originals: Maps original data to its info type
+            run_id: Identifier of the current anonymization run
+            stats: Statistics dictionary updated in place
+
+        Returns:
+            Mapping of original data to fake data
+        """
+        if not unique_originals:
+            return {}
+
+        # Check cache for all original values at once
+        cache_results = self.mapping_cache.get_fakes(unique_originals)
+
+        # For items not found in cache, check storage unless they are definitely new
+        missing_originals = self._possibly_stored(
+            [o for o in unique_originals if o not in cache_results], stats
+        )
+        storage_mappings = self._lookup_storage(missing_originals) if missing_originals else {}
+        self._count_false_positives(missing_originals, storage_mappings, stats)
+        if storage_mappings:
+            # Update cache for future lookups
+            self.mapping_cache.put(storage_mappings)
+
+        plan = self._plan_mappings(unique_originals, cache_results, storage_mappings, run_id, stats)
+        if self._claim_new_mappings and plan.new_mappings:
+            existing = self._claim_records(plan.new_mappings)
+            plan = self._adopt_claimed(plan, existing, unique_originals, cache_results, storage_mappings, stats)
+        self._remember_plan(plan)
+        self._persist_mappings(plan, claimed=self._claim_new_mappings)
+        self._index_fake_data(plan)
+        return plan.original_to_fake_map
+
+    async def _resolve_fake_data_async(
+            self,
+            unique_originals: Dict[str, str],
+            run_id: str,
+            stats: Dict[str, Any]
+    ) -> Dict[str, str]:
+        """Async counterpart of _resolve_fake_data."""
+        if not unique_originals:
+            return {}
+
+        cache_results = await self.mapping_cache.get_fakes_async(unique_originals)
+
+        missing_originals = self._possibly_stored(
+            [o for o in unique_originals if o not in cache_results], stats
+        )
+        storage_mappings = await self._lookup_storage_async(missing_originals) if missing_originals else {}
+        self._count_false_positives(missing_originals, storage_mappings, stats)
+        if storage_mappings:
+            await self.mapping_cache.put_async(storage_mappings)
+
+        plan = self._plan_mappings(unique_originals, cache_results, storage_mappings, run_id, stats)
+        if self._claim_new_mappings and plan.new_mappings:
+            existing = await self._claim_records_async(plan.new_mappings)
+            plan = self._adopt_claimed(plan, existing, unique_originals, cache_results, storage_mappings, stats)
+        self._remember_plan(plan)
+        await self._persist_mappings_async(plan, claimed=self._claim_new_mappings)
+        self._index_fake_data(plan)
+        return plan.original_to_fake_map
+
+    def _possibly_stored(self, originals: List[str], stats: Dict[str, Any]) -> List[str]:
+        """Drop originals the originals filter knows were never stored."""
+        if self.originals_filter is None or not originals:
+            return originals
+        if not (self.originals_filter.single_writer or self._claim_new_mappings):
+            return originals
+        candidates = self.originals_filter.split(originals)
+        stats["storage_lookups_skipped"] += len(originals) - len(candidates)
+        return candidates
+
+    def _count_false_positives(
+            self,
+            candidates: List[str],
+            storage_mappings: Dict[str, str],
+            stats: Dict[str, Any]
+    ) -> None:
+        """Count filter candidates that storage did not know."""
+        if self.originals_filter is None:
+            return
+        false_positives = len(candidates) - len(storage_mappings)
+        stats["filter_false_positives"] += false_positives
+        self.originals_filter.record_false_positives(false_positives)
+
+    def _claim_records(self, records: List[MappingRecord]) -> Dict[str, str]:
+        """Store new mappings unless their original was claimed; returns existing fake data."""
         try:
-            # Set up the DLP request
-            parent = f"projects/{self.project}/locations/{self.location}"
-            inspect_config = dlp_v2.InspectConfig(
-                info_types=[dlp_v2.InfoType(name=it["name"]) for it in self.info_types],
-                include_quote=True,
-                min_likelihood=dlp_v2.Likelihood.POSSIBLE
-            )
-            item = dlp_v2.ContentItem(value=text_to_deidentify)
+            return self.storage.claim_mapping_records(records)
+        except Exception as e:
+            self._handle_storage_error(e)
+            return {}
 
-            # Execute the DLP inspect request
-            self.logger.debug(f"Inspecting text with run_id: {run_id}")
-            response = self.dlp_client.inspect_content(
-                request={"parent": parent,
-                         "inspect_config": inspect_config,
-                         "item": item}
-            )
+    async def _claim_records_async(self, records: List[MappingRecord]) -> Dict[str, str]:
+        """Async counterpart of _claim_records."""
+        try:
+            return await self.storage.claim_mapping_records_async(records)
+        except Exception as e:
+            self._handle_storage_error(e)
+            return {}
+
+    def _adopt_claimed(
+            self,
+            plan: MappingPlan,
+            existing: Dict[str, str],
+            unique_originals: Dict[str, str],
+            cache_results: Dict[str, str],
+            storage_mappings: Dict[str, str],
+            stats: Dict[str, Any]
+    ) -> MappingPlan:
+        """Use fake data another writer stored first for originals whose claim was lost."""
+        if not existing:
+            return plan
+        stats["claim_conflicts"] += len(existing)
+        stats["new_generations"] -= len(existing)
+        stats["storage_hits"] += len(existing)
+        self.mapping_cache.put(existing)
+
+        # Re-plan with every fake value known so name parts follow the adopted names
+        known = dict(storage_mappings)
+        known.update({original: fake for fake, original, _ in plan.new_mappings})
+        known.update(existing)
+        replanned = self._plan_mappings(unique_originals, cache_results, known, plan.run_id, self._new_stats())
+        stats["name_part_mappings"] += len(replanned.name_parts) - len(plan.name_parts)
+        return MappingPlan(
+            original_to_fake_map=replanned.original_to_fake_map,
+            new_mappings=[record for record in plan.new_mappings if record[1] not in existing],
+            name_parts=replanned.name_parts,
+            run_id=plan.run_id
+        )
+
+    def _remember_originals(self, originals: Iterable[str]) -> None:
+        """Add originals that are (about to be) stored to the originals filter."""
+        if self.originals_filter is not None:
+            self.originals_filter.add_many(originals)
 
-            # Create a list to store all replacements
-            replacements = []
-            findings_data = []
+    def _remember_plan(self, plan: MappingPlan) -> None:
+        """Add every original of a run to the filter before its mappings are persisted."""
+        self._remember_originals([original for _, original, _ in plan.new_mappings] + list(plan.name_parts))
 
-            # Track positions that have already been processed
-            processed_ranges = []
+    def _lookup_storage(self, missing_originals: List[str]) -> Dict[str, str]:
+        """Look up existing fake data for originals in persistent storage."""
+        try:
+            # Check if we have a reverse lookup method
+            if hasattr(self.storage, "batch_get_fake_data_for_originals"):
+                return self.storage.batch_get_fake_data_for_originals(missing_originals)
+
+            # Fall back to checking each original individually
+            all_mappings = self.storage.get_all_mappings(limit=5000)
+            return self._match_originals(all_mappings, missing_originals)
+        except Exception as e:
+            self.logger.warning(f"Failed to check storage for mappings: {str(e)}")
+            return {}
+
+    async def _lookup_storage_async(self, missing_originals: List[str]) -> Dict[str, str]:
+        """Async counterpart of _lookup_storage."""
+        try:
+            if hasattr(self.storage, "batch_get_fake_data_for_originals_async"):
+                return await self.storage.batch_get_fake_data_for_originals_async(missing_originals)
 
-            # First collect all unique originals
-            unique_originals = {}  # Maps original data to info_type
-            for finding in response.result.findings:
-                unique_originals[finding.quote] = finding.info_type.name
+            all_mappings = await self.storage.get_all_mappings_async(limit=5000)
+            return self._match_originals(all_mappings, missing_originals)
+        except Exception as e:
+            self.logger.warning(f"Failed to check storage for mappings: {str(e)}")
+            return {}
+
+    @staticmethod
+    def _match_originals(all_mappings: Dict[str, str], originals: List[str]) -> Dict[str, str]:
+        """Find fake data for originals in a fake -> original mapping."""
+        reversed_mappings = {}
+        for fake_data, original_data in all_mappings.items():
+            reversed_mappings[original_data] = fake_data
+        return {
+            original: reversed_mappings[original]
+            for original in originals
+            if original in reversed_mappings
+        }
 
-            # Create mappings for original data to fake data and track name parts
-            original_to_fake_map = {}
-            name_parts_mapping = {}  # Storage for the individual name parts
+    def _plan_mappings(
+            self,
+            unique_originals: Dict[str, str],
+            cache_results: Dict[str, str],
+            storage_mappings: Dict[str, str],
+            run_id: str,
+            stats: Dict[str, Any]
+    ) -> MappingPlan:
+        """
+        Combine known mappings and generate fake data for new originals.
 
-            # Check cache for all original values at once
-            cache_results = self.cache.batch_get(list(unique_originals.keys()))
-            stats["cache_hits"] = len(cache_results)
+        Performs no I/O, so the sync and async paths share it.
+        """
+        # Create mappings for original data to fake data and track name parts
+        original_to_fake_map = {}
+        name_parts_mapping = {}  # Storage for the individual name parts
 
-            # Add cache hits to the mapping
-            for original_data, fake_data in cache_results.items():
+        stats["cache_hits"] += len(cache_results)
+        stats["storage_hits"] += len(storage_mappings)
+
+        # Add cache and storage hits to the mapping
+        for known_mappings in (cache_results, storage_mappings):
+            for original_data, fake_data in known_mappings.items():
                 original_to_fake_map[original_data] = fake_data
-                info_type = unique_originals.get(original_data)
 
                 # If this is a person name, store name parts mapping
-                if info_type == "PERSON_NAME":
+                if unique_originals.get(original_data) == "PERSON_NAME":
                     self._add_name_parts_to_mapping(
                         original_data, fake_data, name_parts_mapping
                     )
 
-            # For items not found in cache, check storage
-            missing_originals = [o for o in unique_originals if o not in original_to_fake_map]
-            if missing_originals:
-                try:
-                    # Batch retrieve from storage
-                    storage_mappings = {}
-
-                    # Check if we have a reverse lookup method
-                    if hasattr(self.storage, "batch_get_fake_data_for_originals"):
-                        storage_mappings = self.storage.batch_get_fake_data_for_originals(missing_originals)
-                    else:
-                        # Fall back to checking each original individually
-                        all_mappings = self.storage.get_all_mappings(limit=5000)
-                        reversed_mappings = {}
-                        for fake_data, original_data in all_mappings.items():
-                            reversed_mappings[original_data] = fake_data
-
-                        for original in missing_originals:
-                            if original in reversed_mappings:
-                                storage_mappings[original] = reversed_mappings[original]
-
-                    # Process storage hits
-                    for original, fake in storage_mappings.items():
-                        original_to_fake_map[original] = fake
-                        # Update cache for future lookups
-                        self.cache.put(original, fake)
-
-                        # Handle name parts for person names
-                        info_type = unique_originals.get(original)
-                        if info_type == "PERSON_NAME":
-                            self._add_name_parts_to_mapping(
-                                original, fake, name_parts_mapping
-                            )
-
-                    stats["storage_hits"] = len(storage_mappings)
-
-                except Exception as e:
-                    self.logger.warning(f"Failed to check storage for mappings: {str(e)}")
-
-            # Generate new fake data for remaining items
-            new_mappings = {}
-            for original_data, info_type in unique_originals.items():
-                if original_data not in original_to_fake_map:
-                    # Generate new fake data
-                    fake_data = self._generate_fake_data(info_type, original_data)
-
-                    # Store in our mapping dictionary
-                    original_to_fake_map[original_data] = fake_data
-
-                    # If this is a person name, store name parts mapping
-                    if info_type == "PERSON_NAME":
-                        self._add_name_parts_to_mapping(
-                            original_data, fake_data, name_parts_mapping
-                        )
-
-                    # Store the mapping - using the cache for immediate availability
-                    # and asynchronously store in Firestore if requested
-                    metadata = {
-                        "info_type": info_type,
-                        "run_id": run_id,
-                        "timestamp": datetime.utcnow().isoformat()
-                    }
-
-                    # Always update cache immediately
-                    self.cache.put(original_data, fake_data)
-
-                    # Store in persistent storage
-                    if self.async_storage_updates:
-                        # Use thread for asynchronous storage update
-                        self._thread_pool.submit(
-                            self._async_store_mapping, fake_data, original_data, metadata
-                        )
-                    else:
-                        try:
-                            self.storage.store_mapping(fake_data, original_data, metadata)
-                        except Exception as e:
-                            self.logger.error(f"Storage error: {str(e)}")
-                            if self.mode == AnonymizerMode.STRICT:
-                                raise
-
-                    stats["new_generations"] += 1
-
-            # Add the name parts mappings to cache and storage
-            name_part_batch = {}
-            for name_part, fake_part in name_parts_mapping.items():
-                if name_part not in original_to_fake_map:
-                    # Cache immediately
-                    self.cache.put(name_part, fake_part)
-                    name_part_batch[fake_part] = name_part
-                    stats["name_part_mappings"] += 1
-
-            # Store name part mappings in persistent storage
-            if name_part_batch:
-                metadata = {
-                    "info_type": "PERSON_NAME_PART",
-                    "run_id": run_id,
-                    "timestamp": datetime.utcnow().isoformat()
-                }
+        # Generate new fake data for remaining items
+        new_mappings = []
+        timestamp = datetime.utcnow().isoformat()
+        for original_data, info_type in unique_originals.items():
+            if original_data not in original_to_fake_map:
+                fake_data = self._generate_fake_data(info_type, original_data)
+                original_to_fake_map[original_data] = fake_data
 
-                if self.async_storage_updates:
-                    self._thread_pool.submit(
-                        lambda: self.storage.batch_store_mappings(name_part_batch, metadata)
+                if info_type == "PERSON_NAME":
+                    self._add_name_parts_to_mapping(
+                        original_data, fake_data, name_parts_mapping
                     )
-                else:
-                    try:
-                        self.storage.batch_store_mappings(name_part_batch, metadata)
-                    except Exception as e:
-                        self.logger.warning(f"Failed to store name part mappings: {str(e)}")
 
-            # [Rest of the anonymization process with findings and replacements]
-            # First pass: collect all findings and sort by position
-            all_findings = sorted(
-                response.result.findings,
-                key=lambda f: (f.location.byte_range.start, -f.location.byte_range.end)
-            )
+                new_mappings.append((fake_data, original_data, {
+                    "info_type": info_type,
+                    "run_id": run_id,
+                    "timestamp": timestamp
+                }))
+                stats["new_generations"] += 1
+
+        # Name parts that are not already full mappings of their own
+        name_parts = {}
+        for name_part, fake_part in name_parts_mapping.items():
+            if name_part not in original_to_fake_map:
+                name_parts[name_part] = fake_part
+                stats["name_part_mappings"] += 1
+
+        return MappingPlan(
+            original_to_fake_map=original_to_fake_map,
+            new_mappings=new_mappings,
+            name_parts=name_parts,
+            run_id=run_id
+        )
 
-            # Process findings and create replacements list
-            for finding in all_findings:
-                start = finding.location.byte_range.start
-                end = finding.location.byte_range.end
-                info_type = finding.info_type.name
-                original_data = finding.quote
-
-                # Skip if this range overlaps with an existing processed range
-                should_skip = False
-                for r_start, r_end in processed_ranges:
-                    # Check for any overlap
-                    if (start <= r_end and end >= r_start):
-                        should_skip = True
-                        break
+    def _index_fake_data(self, plan: MappingPlan) -> None:
+        """Make the fake data of a run findable by deanonymize."""
+        self._add_fake_data(list(plan.original_to_fake_map.values()) + list(plan.name_parts.values()))
 
-                if should_skip:
-                    continue
+    def _add_fake_data(self, fake_values: Iterable[str]) -> int:
+        """Add fake values to the index; beyond max_size the least recently used are evicted."""
+        return self.fake_data_index.update(fake_values)
 
-                # Mark this range as processed
-                processed_ranges.append((start, end))
+    def _name_part_metadata(self, run_id: str) -> Dict[str, Any]:
+        return {
+            "info_type": "PERSON_NAME_PART",
+            "run_id": run_id,
+            "timestamp": datetime.utcnow().isoformat()
+        }
 
-                stats["total_findings"] += 1
-                stats["findings_by_type"][info_type] = stats["findings_by_type"].get(info_type, 0) + 1
+    def _plan_records(self, plan: MappingPlan, include_new: bool = True) -> List[MappingRecord]:
+        """New mappings and name parts of a run as storage records."""
+        records = list(plan.new_mappings) if include_new else []
+        if plan.name_parts:
+            metadata = self._name_part_metadata(plan.run_id)
+            records.extend((fake, original, metadata) for original, fake in plan.name_parts.items())
+        return records
+
+    def _handle_storage_error(self, error: Exception) -> None:
+        """Log a failed mapping write; strict mode re-raises it."""
+        self.logger.error(f"Storage error: {str(error)}")
+        if self.mode == AnonymizerMode.STRICT:
+            raise error
+
+    def _log_background_write(self, future: concurrent.futures.Future) -> None:
+        """Log a failed write nobody waits for."""
+        if future.exception() is not None:
+            self.logger.error(f"Async storage update failed: {str(future.exception())}")
+
+    def _write_records(self, records: List[MappingRecord]) -> None:
+        """Write mapping records to persistent storage in one batch."""
+        if not records:
+            return
+        try:
+            if self.write_behind is not None:
+                # Coalesced with concurrent runs; waiting on the future acknowledges the write
+                future = self.write_behind.submit(records)
+                if self.async_storage_updates:
+                    future.add_done_callback(self._log_background_write)
+                else:
+                    future.result()
+            else:
+                self.storage.batch_store_mapping_records(records)
+        except Exception as e:
+            self._handle_storage_error(e)
 
-                # Get fake data from our mapping
-                fake_data = original_to_fake_map[original_data]
+    async def _write_records_async(self, records: List[MappingRecord]) -> None:
+        """Async counterpart of _write_records."""
+        if not records:
+            return
+        try:
+            if self.write_behind is not None:
+                # submit may block under backpressure, so keep it off the event loop
+                loop = asyncio.get_running_loop()
+                future = await loop.run_in_executor(None, self.write_behind.submit, records)
+                if self.async_storage_updates:
+                    future.add_done_callback(self._log_background_write)
+                else:
+                    await asyncio.wrap_future(future)
+            else:
+                await self.storage.batch_store_mapping_records_async(records)
+        except Exception as e:
+            self._handle_storage_error(e)
 
-                # Add to replacements list
-                replacements.append({
-                    "start": start,
-                    "end": end,
-                    "original": original_data,
-                    "fake": fake_data,
-                    "info_type": info_type
-                })
+    def _persist_mappings(self, plan: MappingPlan, claimed: bool = False) -> None:
+        """
+        Write new mappings to the cache and, in one batch, to persistent storage.
 
-                # Collect finding data for detailed result
-                if detailed_result:
-                    findings_data.append({
-                        "info_type": info_type,
-                        "quote": original_data,
-                        "fake_data": fake_data,
-                        "likelihood": str(finding.likelihood),
-                        "location": {
-                            "start": start,
-                            "end": end
-                        }
-                    })
-
-            # Apply replacements in reverse order (from end to beginning)
-            # to avoid position shifts
-            anonymized_text = text_to_deidentify
-            for replacement in sorted(replacements, key=lambda r: r["start"], reverse=True):
-                prefix = anonymized_text[:replacement["start"]]
-                suffix = anonymized_text[replacement["end"]:]
-                anonymized_text = prefix + replacement["fake"] + suffix
-
-            # Complete statistics
-            stats["end_time"] = time.time()
-            stats["duration_ms"] = int((stats["end_time"] - stats["start_time"]) * 1000)
-
-            # Add cache statistics
-            cache_stats = self.cache.get_stats()
-            stats["cache_type"] = cache_stats.get("type", "unknown")
-            stats["cache_status"] = cache_stats
-
-            # Log the result
-            self.logger.info(
-                f"Anonymization completed for run_id: {run_id}",
-                extra={
-                    "findings": stats["total_findings"],
-                    "duration_ms": stats["duration_ms"],
-                    "cache_hits": stats["cache_hits"],
-                    "storage_hits": stats["storage_hits"],
-                    "new_generations": stats["new_generations"],
-                    "name_part_mappings": stats["name_part_mappings"]
-                }
-            )
+        With claimed set, the new mappings were already stored by claims and
+        only name parts are written.
+        """
+        # Always update cache immediately; name parts may use a shorter TTL
+        self.mapping_cache.put({original: fake for fake, original, _ in plan.new_mappings})
+        self.mapping_cache.put(plan.name_parts, self.name_part_cache_ttl)
+        self._write_records(self._plan_records(plan, include_new=not claimed))
+
+    async def _persist_mappings_async(self, plan: MappingPlan, claimed: bool = False) -> None:
+        """Async counterpart of _persist_mappings."""
+        await self.mapping_cache.put_async({original: fake for fake, original, _ in plan.new_mappings})
+        await self.mapping_cache.put_async(plan.name_parts, self.name_part_cache_ttl)
+        await self._write_records_async(self._plan_records(plan, include_new=not claimed))
+
+    def _apply_findings(
+            self,
+            text: str,
+            findings: List[Finding],
+            original_to_fake_map: Dict[str, str],
+            stats: Dict[str, Any],
+            detailed_result: bool = False
+    ) -> Tuple[str, List[Dict[str, Any]]]:
+        """
+        Replace findings in text with their fake data.
 
-            # Return appropriate result
-            if detailed_result:
-                return {
-                    "anonymized_text": anonymized_text,
-                    "findings": findings_data,
-                    "stats": stats,
-                    "run_id": run_id
-                }
-            return anonymized_text
+        Args:
+            text: The inspected text
+            findings: Findings located in text
+            original_to_fake_map: Mapping of original data to fake data
+            stats: Statistics dictionary updated in place
+            detailed_result: Whether to collect per-finding details
 
-        except Exception as e:
-            error_msg = f"Anonymization failed: {str(e)}"
-            self.logger.error(error_msg, exc_info=True)
+        Returns:
+            Tuple of (anonymized text, finding details)
+        """
+        # Sort once and drop findings overlapping an earlier, longer one
+        kept_findings = remove_overlaps(findings)
+
+        replacements = []
+        for finding in kept_findings:
+            stats["total_findings"] += 1
+            stats["findings_by_type"][finding.info_type] = stats["findings_by_type"].get(finding.info_type, 0) + 1
+            replacements.append(Replacement(finding.start, finding.end, original_to_fake_map[finding.quote]))
+
+        # Assemble the output in one pass
+        anonymized_text, span_map = apply_replacements(text, replacements)
+
+        # Collect finding data for detailed result
+        findings_data = []
+        if detailed_result:
+            for finding, replacement, span in zip(kept_findings, replacements, span_map):
+                findings_data.append({
+                    "info_type": finding.info_type,
+                    "quote": finding.quote,
+                    "fake_data": replacement.text,
+                    "likelihood": finding.likelihood,
+                    "location": {
+                        "start": finding.start,
+                        "end": finding.end
+                    },
+                    "output_location": {
+                        "start": span.output_start,
+                        "end": span.output_end
+                    }
+                })
+
+        return anonymized_text, findings_data
 
-            if self.mode == AnonymizerMode.TOLERANT:
-                # In tolerant mode, return original text
-                return text_to_deidentify if not detailed_result else {
-                    "anonymized_text": text_to_deidentify,
-                    "findings": [],
-                    "stats": {"error": str(e)},
-                    "run_id": run_id
-                }
-            else:
-                # In strict mode, raise exception
-                raise AnonymizationError(error_msg, details={"run_id": run_id})
     def _add_name_parts_to_mapping(self, original_name: str, fake_name: str, mapping: Dict[str, str]) -> None:
         """
         Add individual name parts to the mapping.
@@ -888,6 +1459,28 @@ class ReversibleAnonymizer:
                 remaining = ' '.join(original_parts[i:])
                 mapping[remaining] = fake_parts[-1]
 
+    # Match patterns for our standard fake data formats
+    FAKE_DATA_PATTERNS = [
+        r'PERSON-[0-9a-f]{8}',
+        r'EMAIL-[0-9a-f]{8}@example\.com',
+        r'PHONE-[0-9a-f]{8}',
+        r'CC-[0-9a-f]{8}',
+        r'SSN-[0-9a-f]{8}',
+        r'ADDR-[0-9a-f]{8}',
+        r'FNAME-[0-9a-f]{8}',
+        r'LNAME-[0-9a-f]{8}',
+        r'PII-[0-9a-f]{8}',
+        r'FIN-[0-9a-f]{8}',
+        r'MED-[0-9a-f]{8}',
+        r'CRED-[0-9a-f]{8}',
+        r'LOC-[0-9a-f]{8}',
+        r'DOC-[0-9a-f]{8}',
+        r'DATA-[A-Z_]+-[0-9a-f]{8}',
+    ]
+
+    # All token formats in one pass
+    FAKE_DATA_REGEX = re.compile("|".join(FAKE_DATA_PATTERNS))
+
     def deanonymize(self, text: str) -> str:
         """
         De-anonymize text by replacing fake data with original data.
@@ -899,112 +1492,358 @@ class ReversibleAnonymizer:
             De-anonymized text
         """
         try:
-            deanonymized_text = text
-
-            # Extract all potential fake data patterns
-
-            # Match patterns for our standard fake data formats
-            patterns = [
-                r'PERSON-[0-9a-f]{8}',
-                r'EMAIL-[0-9a-f]{8}@example\.com',
-                r'PHONE-[0-9a-f]{8}',
-                r'CC-[0-9a-f]{8}',
-                r'SSN-[0-9a-f]{8}',
-                r'ADDR-[0-9a-f]{8}',
-                r'FNAME-[0-9a-f]{8}',
-                r'LNAME-[0-9a-f]{8}',
-                r'PII-[0-9a-f]{8}',
-                r'FIN-[0-9a-f]{8}',
-                r'MED-[0-9a-f]{8}',
-                r'CRED-[0-9a-f]{8}',
-                r'LOC-[0-9a-f]{8}',
-                r'DOC-[0-9a-f]{8}',
-                r'DATA-[A-Z_]+-[0-9a-f]{8}',
-            ]
-
-            # Find all matches for all patterns
-            fake_data_items = []
-            for pattern in patterns:
-                fake_data_items.extend(re.findall(pattern, deanonymized_text))
-
-            # If no matches found, try a more general approach
-            if not fake_data_items:
-                # Get all mappings and try to identify tokens that match
-                all_mappings = self.storage.get_all_mappings(limit=5000)
-                for fake_data in all_mappings.keys():
-                    if fake_data in deanonymized_text:
-                        fake_data_items.append(fake_data)
-
-            # Remove duplicates
-            fake_data_items = list(set(fake_data_items))
+            # Locate token-format fake data and every fake value known to this instance
+            spans = self._find_fake_data_spans(text)
+
+            # Fake data written by other processes is only known to storage
+            if self._fake_data_refresh_due():
+                self._refresh_fake_data_index()
+                spans = self._find_fake_data_spans(text)
 
             # Early return if no fake data found
-            if not fake_data_items:
+            if not spans:
                 return text
 
-            # Batch retrieve original data for all fake data items
-            try:
-                mappings = self.storage.batch_get_originals(fake_data_items)
-            except StorageError as e:
-                self.logger.error(f"Storage error during deanonymization: {str(e)}")
-                if self.mode == AnonymizerMode.STRICT:
-                    raise DeAnonymizationError(f"Storage error: {str(e)}")
-                mappings = {}
+            # Serve hot values from the reverse cache, then fetch the rest from storage
+            fake_data_items = {text[s:e] for s, e in spans}
+            mappings = self.mapping_cache.get_originals(fake_data_items)
+            missing_fake_data = [f for f in fake_data_items if f not in mappings]
+            if missing_fake_data:
+                try:
+                    storage_mappings = self.storage.batch_get_originals(missing_fake_data)
+                except StorageError as e:
+                    storage_mappings = self._handle_deanonymization_storage_error(e)
+                if storage_mappings:
+                    mappings.update(storage_mappings)
+                    self.mapping_cache.put({o: f for f, o in storage_mappings.items()})
+
+            return self._replace_fake_data(text, spans, mappings)
+
+        except Exception as e:
+            return self._handle_deanonymization_error(e, text)
+
+    async def deanonymize_async(self, text: str) -> str:
+        """
+        De-anonymize text without blocking the event loop.
+
+        Args:
+            text: Text to de-anonymize
+
+        Returns:
+            De-anonymized text
+        """
+        try:
+            spans = self._find_fake_data_spans(text)
 
-            # Replace each fake data with its original, in reverse length order
-            # to avoid replacing parts of other fake data
-            sorted_fake_data = sorted(mappings.keys(), key=len, reverse=True)
+            if self._fake_data_refresh_due():
+                if self.storage.blocking:
+                    await asyncio.get_running_loop().run_in_executor(None, self._refresh_fake_data_index)
+                else:
+                    self._refresh_fake_data_index()
+                spans = self._find_fake_data_spans(text)
 
-            for fake_data in sorted_fake_data:
-                original_data = mappings[fake_data]
-                deanonymized_text = deanonymized_text.replace(fake_data, original_data)
+            if not spans:
+                return text
+
+            fake_data_items = {text[s:e] for s, e in spans}
+            mappings = await self.mapping_cache.get_originals_async(fake_data_items)
+            missing_fake_data = [f for f in fake_data_items if f not in mappings]
+            if missing_fake_data:
+                try:
+                    storage_mappings = await self.storage.batch_get_originals_async(missing_fake_data)
+                except StorageError as e:
+                    storage_mappings = self._handle_deanonymization_storage_error(e)
+                if storage_mappings:
+                    mappings.update(storage_mappings)
+                    await self.mapping_cache.put_async({o: f for f, o in storage_mappings.items()})
 
-            return deanonymized_text
+            return self._replace_fake_data(text, spans, mappings)
 
         except Exception as e:
-            error_msg = f"De-anonymization failed: {str(e)}"
+            return self._handle_deanonymization_error(e, text)
+
+    def refresh_fake_data_index(self) -> int:
+        """
+        Add fake data stored by other processes to the de-anonymization index.
+
+        The index is filled as this instance creates or looks up mappings.
+        De-anonymization also calls this at most once per refresh_interval.
+        The first call reads every stored mapping, page by page; later calls
+        read the mappings created since the previous one (with a margin for
+        clock skew) where the storage adapter supports that.
+
+        Returns:
+            Number of fake values added to the index
+        """
+        with self._fake_data_refresh_lock:
+            self._fake_data_refreshed_at = time.monotonic()
+        return self._refresh_fake_data_index()
+
+    def _fake_data_refresh_due(self) -> bool:
+        """Claim the next re-read of stored mappings once refresh_interval has passed."""
+        if self.fake_data_refresh_interval is None:
+            return False
+        now = time.monotonic()
+        with self._fake_data_refresh_lock:
+            refreshed_at = self._fake_data_refreshed_at
+            if refreshed_at is not None and now - refreshed_at < self.fake_data_refresh_interval:
+                return False
+            self._fake_data_refreshed_at = now
+            return True
+
+    def _refresh_fake_data_index(self) -> int:
+        """Read stored mappings created since the last re-read into the index."""
+        started = time.time()
+        since = self._fake_data_synced_at
+        if since is not None:
+            since -= FAKE_DATA_SYNC_MARGIN
+        added = 0
+        for page in self.storage.iter_mappings(FAKE_DATA_SYNC_PAGE_SIZE, created_since=since):
+            added += self._add_fake_data(page.keys())
+        self._fake_data_synced_at = started
+        return added
+
+    def _find_fake_data_spans(self, text: str) -> List[Tuple[int, int]]:
+        """Find ranges of text that may hold fake data."""
+        spans = [match.span() for match in self.FAKE_DATA_REGEX.finditer(text)]
+        spans.extend(self.fake_data_index.find_all(text))
+        return spans
+
+    @staticmethod
+    def _replace_fake_data(text: str, spans: List[Tuple[int, int]], mappings: Dict[str, str]) -> str:
+        """Replace fake data with originals."""
+        # Keep spans with a known original; the leftmost, then longest, wins
+        # so parts of other fake data are never replaced
+        replacements = []
+        for start, end in spans:
+            original_data = mappings.get(text[start:end])
+            if original_data is not None:
+                replacements.append(Replacement(start, end, original_data))
+
+        deanonymized_text, _ = apply_replacements(text, replacements)
+        return deanonymized_text
+
+    def _handle_deanonymization_storage_error(self, error: StorageError) -> Dict[str, str]:
+        """Log a storage lookup failure; raise in strict mode."""
+        self.logger.error(f"Storage error during deanonymization: {str(error)}")
+        if self.mode == AnonymizerMode.STRICT:
+            raise DeAnonymizationError(f"Storage error: {str(error)}")
+        return {}
+
+    def _handle_deanonymization_error(self, error: Exception, text: str) -> str:
+        """Return the input text in tolerant mode, otherwise raise."""
+        error_msg = f"De-anonymization failed: {str(error)}"
+        self.logger.error(error_msg, exc_info=True)
+
+        if self.mode == AnonymizerMode.TOLERANT:
+            # In tolerant mode, return original text
+            return text
+        else:
+            # In strict mode, raise exception
+            raise DeAnonymizationError(error_msg)
+
+    def anonymize_stream(
+            self,
+            chunks: Iterable[str],
+            chunk_size: int = DEFAULT_STREAM_CHUNK_SIZE,
+            overlap: int = DEFAULT_STREAM_OVERLAP,
+            run_id: Optional[str] = None,
+            stats: Optional[Dict[str, Any]] = None
+    ) -> Iterator[str]:
+        """
+        Anonymize a stream of text chunks, yielding anonymized text incrementally.
+
+        Input is re-split into windows of about chunk_size characters at line
+        or word boundaries. Each window is inspected together with the next
+        overlap characters, so entities spanning a window edge are still
+        detected, and findings in the overlap are left to the next window.
+        Memory use is bounded by chunk_size plus the size of the input chunks.
+
+        Args:
+            chunks: Text chunks in order (e.g. lines or blocks read from a file)
+            chunk_size: Target number of characters per inspected window
+            overlap: Characters of look-ahead past each window; must exceed
+                the longest expected entity
+            run_id: Optional identifier for this anonymization run
+            stats: Optional statistics dictionary updated in place
+
+        Yields:
+            Anonymized text; the concatenation equals the anonymized input
+        """
+        if chunk_size <= 0 or overlap < 0 or overlap >= chunk_size:
+            raise ConfigurationError("chunk_size must be positive and larger than overlap")
+
+        if run_id is None:
+            run_id = uuid.uuid4().hex
+        if stats is None:
+            stats = self._new_stats()
+
+        chunks = iter(chunks)
+        buffer = ""
+        position = 0  # Start of the unprocessed text in buffer
+        exhausted = False
+
+        while True:
+            # Read until the buffer holds a full window plus look-ahead
+            if not exhausted and len(buffer) - position < chunk_size + overlap:
+                pending = [buffer[position:]]
+                pending_length = len(pending[0])
+                while pending_length < chunk_size + overlap:
+                    try:
+                        chunk = next(chunks)
+                    except StopIteration:
+                        exhausted = True
+                        break
+                    pending.append(chunk)
+                    pending_length += len(chunk)
+                buffer = "".join(pending)
+                position = 0
+
+            remaining = len(buffer) - position
+            if remaining == 0:
+                return
+
+            if exhausted and remaining <= chunk_size:
+                window = buffer[position:]
+                cut = len(window)
+            else:
+                window = buffer[position:position + chunk_size + overlap]
+                cut = find_boundary(window, chunk_size)
+
+            complete = exhausted and position + len(window) == len(buffer)
+            anonymized_text, consumed = self._anonymize_window(window, cut, complete, run_id, stats)
+            position += consumed
+            yield anonymized_text
+
+    def anonymize_file(
+            self,
+            input_file: TextIO,
+            output_file: TextIO,
+            chunk_size: int = DEFAULT_STREAM_CHUNK_SIZE,
+            overlap: int = DEFAULT_STREAM_OVERLAP,
+            run_id: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        Anonymize a text file into another file without loading it whole.
+
+        Args:
+            input_file: Text file object to read from
+            output_file: Text file object to write anonymized text to
+            chunk_size: Target number of characters per inspected window
+            overlap: Characters of look-ahead past each window
+            run_id: Optional identifier for this anonymization run
+
+        Returns:
+            Statistics for the whole file
+        """
+        stats = self._new_stats()
+        chunks = iter(lambda: input_file.read(chunk_size), "")
+        for anonymized_text in self.anonymize_stream(
+                chunks, chunk_size=chunk_size, overlap=overlap, run_id=run_id, stats=stats
+        ):
+            output_file.write(anonymized_text)
+
+        stats["end_time"] = time.time()
+        stats["duration_ms"] = int((stats["end_time"] - stats["start_time"]) * 1000)
+        return stats
+
+    def _anonymize_window(
+            self,
+            window: str,
+            cut: int,
+            complete: bool,
+            run_id: str,
+            stats: Dict[str, Any]
+    ) -> Tuple[str, int]:
+        """
+        Anonymize the part of a streamed window that this window owns.
+
+        Returns:
+            Tuple of (anonymized text, number of window characters consumed)
+        """
+        try:
+            findings = self.detector.inspect(window)
+            owned, emit_end = select_window_findings(findings, cut, len(window), complete)
+
+            original_to_fake_map = self._resolve_fake_data(
+                self._unique_originals(owned), run_id, stats
+            )
+            anonymized_text, _ = self._apply_findings(
+                window[:emit_end], owned, original_to_fake_map, stats
+            )
+            return anonymized_text, emit_end
+
+        except Exception as e:
+            error_msg = f"Anonymization failed: {str(e)}"
             self.logger.error(error_msg, exc_info=True)
 
             if self.mode == AnonymizerMode.TOLERANT:
-                # In tolerant mode, return original text
-                return text
-            else:
-                # In strict mode, raise exception
-                raise DeAnonymizationError(error_msg)
+                # In tolerant mode, pass this window through unchanged
+                return window[:cut], cut
+            raise AnonymizationError(error_msg, details={"run_id": run_id})
 
-    def anonymize_batch(self, texts: List[str], max_workers: int = 5) -> List[str]:
+    def anonymize_batch(
+            self,
+            texts: List[str],
+            max_workers: int = 5,
+            max_request_bytes: int = DEFAULT_MAX_REQUEST_BYTES
+    ) -> List[str]:
         """
-        Anonymize multiple texts efficiently in parallel.
+        Anonymize multiple texts efficiently.
+
+        Texts are packed into as few DLP requests as the request-size budget
+        allows, so detection cost scales with total bytes rather than with the
+        number of texts. Cache and storage lookups run once for the whole batch.
 
         Args:
             texts: List of texts to anonymize
-            max_workers: Maximum number of parallel workers
+            max_workers: Maximum number of concurrent DLP requests
+            max_request_bytes: Maximum size of a single DLP request
 
         Returns:
             List of anonymized texts
         """
-        result = [""] * len(texts)
+        run_id = uuid.uuid4().hex
+        stats = self._new_stats()
 
         try:
-            # Process in parallel for better performance
-            with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
-                # Start the load operations and mark each future with its index
-                future_to_index = {
-                    executor.submit(self.anonymize, text): i
-                    for i, text in enumerate(texts)
-                }
+            # Detect findings for all texts (packed into shared requests for DLP)
+            findings_by_text = self.detector.inspect_batch(
+                texts,
+                max_workers=max_workers,
+                raise_on_error=self.mode == AnonymizerMode.STRICT,
+                max_request_bytes=max_request_bytes
+            )
 
-                # Process results as they complete
-                for future in concurrent.futures.as_completed(future_to_index):
-                    index = future_to_index[future]
-                    try:
-                        result[index] = future.result()
-                    except Exception as e:
-                        self.logger.error(f"Error processing batch item {index}: {str(e)}")
-                        if self.mode == AnonymizerMode.STRICT:
-                            raise
-                        result[index] = texts[index]  # Use original in case of error
+            # Collect unique originals across the whole batch
+            unique_originals = {}
+            for findings in findings_by_text:
+                for finding in findings or []:
+                    unique_originals[finding.quote] = finding.info_type
+
+            original_to_fake_map = self._resolve_fake_data(unique_originals, run_id, stats)
 
+            result = []
+            for index, text in enumerate(texts):
+                findings = findings_by_text[index]
+                if findings is None:
+                    self.logger.error(f"Error processing batch item {index}: detection failed")
+                    result.append(text)  # Use original in case of error
+                    continue
+                anonymized_text, _ = self._apply_findings(text, findings, original_to_fake_map, stats)
+                result.append(anonymized_text)
+
+            self.logger.info(
+                f"Batch anonymization completed for run_id: {run_id}",
+                extra={
+                    "texts": len(texts),
+                    "findings": stats["total_findings"],
+                    "duration_ms": int((time.time() - stats["start_time"]) * 1000),
+                    "cache_hits": stats["cache_hits"],
+                    "storage_hits": stats["storage_hits"],
+                    "new_generations": stats["new_generations"]
+                }
+            )
             return result
         except Exception as e:
             error_msg = f"Batch anonymization failed: {str(e)}"
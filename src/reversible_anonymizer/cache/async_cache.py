@@ -0,0 +1,57 @@
+from typing import Optional, Dict, List, Union, Any, Callable
+import asyncio
+import functools
+
+from .base import CacheAdapter, AsyncCacheAdapter
+
+
+class AsyncCacheWrapper(AsyncCacheAdapter):
+    """
+    Expose a synchronous cache adapter through the async interface.
+
+    Non-blocking adapters (such as the in-memory cache) are called inline;
+    blocking adapters run on the event loop's default executor so network
+    round trips never stall the loop.
+    """
+
+    def __init__(self, cache: CacheAdapter):
+        """
+        Initialize the wrapper.
+
+        Args:
+            cache: Synchronous cache adapter to wrap
+        """
+        self.cache = cache
+
+    async def _call(self, method: Callable[..., Any], *args: Any) -> Any:
+        if not self.cache.blocking:
+            return method(*args)
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, functools.partial(method, *args))
+
+    async def get(self, key: str) -> Optional[str]:
+        """Get a value from cache."""
+        return await self._call(self.cache.get, key)
+
+    async def put(self, key: str, value: str, ttl: Optional[int] = None) -> bool:
+        """Put a value in cache with optional TTL in seconds."""
+        return await self._call(self.cache.put, key, value, ttl)
+
+    async def delete(self, key: str) -> bool:
+        """Delete a key from cache."""
+        return await self._call(self.cache.delete, key)
+
+    async def batch_get(self, keys: List[str]) -> Dict[str, str]:
+        """Get multiple keys at once."""
+        return await self._call(self.cache.batch_get, keys)
+
+    async def batch_put(self, key_values: Dict[str, str], ttl: Optional[int] = None) -> bool:
+        """Put multiple key-value pairs at once."""
+        return await self._call(self.cache.batch_put, key_values, ttl)
+
+
+def as_async_cache(cache: Union[CacheAdapter, AsyncCacheAdapter]) -> AsyncCacheAdapter:
+    """Return an async view of a cache adapter."""
+    if isinstance(cache, AsyncCacheAdapter):
+        return cache
+    return AsyncCacheWrapper(cache)
@@ -5,6 +5,9 @@ from typing import Optional, Dict, Any, List
 class CacheAdapter(ABC):
     """Base cache adapter interface for anonymization mappings."""
 
+    # Whether calls may block on I/O (async callers run blocking adapters in a thread)
+    blocking: bool = True
+
     @abstractmethod
     def get(self, key: str) -> Optional[str]:
         """Get a value from cache."""
@@ -43,4 +46,33 @@ class CacheAdapter(ABC):
     @abstractmethod
     def health_check(self) -> bool:
         """Check if cache is available and working."""
+        pass
+
+
+class AsyncCacheAdapter(ABC):
+    """Coroutine-based cache adapter interface for use from asyncio code."""
+
+    @abstractmethod
+    async def get(self, key: str) -> Optional[str]:
+        """Get a value from cache."""
+        pass
+
+    @abstractmethod
+    async def put(self, key: str, value: str, ttl: Optional[int] = None) -> bool:
+        """Put a value in cache with optional TTL in seconds."""
+        pass
+
+    @abstractmethod
+    async def delete(self, key: str) -> bool:
+        """Delete a key from cache."""
+        pass
+
+    @abstractmethod
+    async def batch_get(self, keys: List[str]) -> Dict[str, str]:
+        """Get multiple keys at once. Returns a dictionary of found keys."""
+        pass
+
+    @abstractmethod
+    async def batch_put(self, key_values: Dict[str, str], ttl: Optional[int] = None) -> bool:
+        """Put multiple key-value pairs at once."""
         pass
\ No newline at end of file
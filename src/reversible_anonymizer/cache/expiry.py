@@ -0,0 +1,56 @@
+from typing import Dict, Hashable, Iterator, List, Set
+import heapq
+import math
+
+
+class TimingWheel:
+    """
+    Hashed timing wheel that finds expired keys without scanning live ones.
+
+    Keys are bucketed by expiry tick (expiry time divided by the resolution,
+    rounded up). A heap orders the non-empty ticks, so scheduling is O(1)
+    amortized and reclaiming costs O(log ticks) per bucket plus O(1) per key.
+    The wheel may hold stale keys (overwritten or deleted entries); callers
+    check each due key against the entry's current expiry.
+    """
+
+    __slots__ = ("resolution", "_buckets", "_ticks")
+
+    def __init__(self, resolution: float = 1.0):
+        """
+        Initialize the wheel.
+
+        Args:
+            resolution: Width of one bucket in seconds
+        """
+        self.resolution = resolution
+        self._buckets: Dict[int, Set[Hashable]] = {}
+        self._ticks: List[int] = []
+
+    def schedule(self, key: Hashable, expires_at: float) -> None:
+        """Register a key to be checked once expires_at has passed."""
+        tick = math.ceil(expires_at / self.resolution)
+        bucket = self._buckets.get(tick)
+        if bucket is None:
+            bucket = self._buckets[tick] = set()
+            heapq.heappush(self._ticks, tick)
+        bucket.add(key)
+
+    def next_due(self) -> float:
+        """Time at which the earliest bucket becomes due (inf if empty)."""
+        return self._ticks[0] * self.resolution if self._ticks else math.inf
+
+    def due(self, now: float) -> Iterator[Hashable]:
+        """Remove and yield keys from every bucket that is due at now."""
+        ticks = self._ticks
+        while ticks and ticks[0] * self.resolution <= now:
+            yield from self._buckets.pop(heapq.heappop(ticks))
+
+    def clear(self) -> None:
+        """Forget all scheduled keys."""
+        self._buckets.clear()
+        self._ticks.clear()
+
+    def __len__(self) -> int:
+        """Return the number of scheduled keys, stale ones included."""
+        return sum(len(bucket) for bucket in self._buckets.values())
@@ -0,0 +1,60 @@
+from bisect import bisect_left
+from typing import Dict, Iterable, List, Tuple
+import hashlib
+
+# Ketama: 40 MD5 digests per node, each split into four 32-bit ring points
+_DIGESTS_PER_NODE = 40
+
+
+class HashRing:
+    """
+    Ketama-style consistent-hash ring over cache nodes.
+
+    Each node owns 160 points on a 32-bit ring and a key belongs to the
+    first point at or after its hash. Adding or removing a node only moves
+    the keys of the ring segments it gains or loses (about 1/N of them),
+    and the placement matches other ketama clients given the same node
+    names.
+    """
+
+    __slots__ = ("nodes", "_points", "_owners")
+
+    def __init__(self, nodes: Iterable[str]):
+        """
+        Build the ring.
+
+        Args:
+            nodes: Node names, conventionally "host:port"
+        """
+        self.nodes: Tuple[str, ...] = tuple(sorted(set(nodes)))
+        ring: List[Tuple[int, str]] = []
+        for node in self.nodes:
+            for i in range(_DIGESTS_PER_NODE):
+                digest = hashlib.md5(f"{node}-{i}".encode("utf-8")).digest()
+                for part in range(4):
+                    ring.append((int.from_bytes(digest[part * 4:part * 4 + 4], "little"), node))
+        ring.sort()
+        self._points = [point for point, _ in ring]
+        self._owners = [node for _, node in ring]
+
+    @staticmethod
+    def _hash(key: str) -> int:
+        return int.from_bytes(hashlib.md5(key.encode("utf-8")).digest()[:4], "little")
+
+    def get_node(self, key: str) -> str:
+        """Return the node owning a key."""
+        if not self._points:
+            raise LookupError("Hash ring has no nodes")
+        index = bisect_left(self._points, self._hash(key))
+        return self._owners[index if index < len(self._owners) else 0]
+
+    def group(self, keys: Iterable[str]) -> Dict[str, List[str]]:
+        """Group keys by owning node."""
+        groups: Dict[str, List[str]] = {}
+        for key in keys:
+            groups.setdefault(self.get_node(key), []).append(key)
+        return groups
+
+    def __len__(self) -> int:
+        """Return the number of nodes."""
+        return len(self.nodes)
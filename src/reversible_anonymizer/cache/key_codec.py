@@ -0,0 +1,41 @@
+from typing import Optional, Union
+import base64
+import hashlib
+
+
+class KeyCodec:
+    """
+    Fixed-size, one-way encoding of cache keys for external caches.
+
+    A key becomes "<namespace>:v<version>:<digest>", where the digest is a
+    16-byte BLAKE2b hash (keyed when a secret is given) in unpadded URL-safe
+    base64. Keys of any length encode to the same short, protocol-safe
+    string, and the original text (PII) never travels to the cache server
+    as a key. Values are stored as given: MappingCache seals the originals
+    it stores as values only when given a cipher.
+    Bumping the version orphans every key written by the previous scheme.
+    """
+
+    __slots__ = ("prefix", "_secret")
+
+    def __init__(self, namespace: str = "ra", version: int = 1, secret: Optional[Union[str, bytes]] = None):
+        """
+        Initialize the codec.
+
+        Args:
+            namespace: Prefix separating these keys from other applications
+            version: Encoding version, part of every key
+            secret: Optional BLAKE2b key (up to 64 bytes); without it, anyone
+                who can read the cache can test guesses of the originals
+        """
+        if isinstance(secret, str):
+            secret = secret.encode("utf-8")
+        if secret is not None and len(secret) > hashlib.blake2b.MAX_KEY_SIZE:
+            secret = hashlib.blake2b(secret).digest()
+        self.prefix = f"{namespace}:v{version}:"
+        self._secret = secret or b""
+
+    def encode(self, key: str) -> str:
+        """Encode a key for the cache server."""
+        digest = hashlib.blake2b(key.encode("utf-8"), digest_size=16, key=self._secret).digest()
+        return self.prefix + base64.urlsafe_b64encode(digest).rstrip(b"=").decode("ascii")
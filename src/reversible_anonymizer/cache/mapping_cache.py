@@ -0,0 +1,105 @@
+from typing import Any, Optional, Dict, Iterable
+
+from .base import CacheAdapter
+from .async_cache import as_async_cache
+
+# Key namespaces for the two directions of a mapping
+FORWARD_PREFIX = "o2f:"
+REVERSE_PREFIX = "f2o:"
+
+
+class MappingCache:
+    """
+    Bidirectional original <-> fake mapping cache on top of a cache adapter.
+
+    Both directions share one adapter under namespaced keys and are always
+    written together in a single batch. Mappings never change once created,
+    so an entry evicted from one direction can only cause a miss, never a
+    wrong answer; callers repopulate both directions from storage on a miss.
+
+    Reverse entries hold originals as values. With a cipher, those values
+    are sealed before they reach the cache, and values that do not unseal
+    (written without the cipher or under another key) count as misses.
+    """
+
+    def __init__(self, cache: CacheAdapter, cipher: Optional[Any] = None):
+        """
+        Initialize the mapping cache.
+
+        Args:
+            cache: Cache adapter holding both directions
+            cipher: Optional object with encrypt and decrypt over bytes
+                (e.g. Fernet) sealing the originals in reverse entries
+        """
+        self.cache = cache
+        self.async_cache = as_async_cache(cache)
+        self.cipher = cipher
+
+    def _entries(self, original_to_fake: Dict[str, str]) -> Dict[str, str]:
+        """Cache entries for both directions of the mappings."""
+        entries = {}
+        for original, fake in original_to_fake.items():
+            entries[FORWARD_PREFIX + original] = fake
+            entries[REVERSE_PREFIX + fake] = self._seal(original)
+        return entries
+
+    def _seal(self, original: str) -> str:
+        """Encrypt an original for a reverse entry, if a cipher is set."""
+        if self.cipher is None:
+            return original
+        return self.cipher.encrypt(original.encode("utf-8")).decode("ascii")
+
+    def _unseal(self, found: Dict[str, str]) -> Dict[str, str]:
+        """Decrypt originals of reverse entries, dropping those that do not decrypt."""
+        if self.cipher is None:
+            return found
+        originals = {}
+        for fake, sealed in found.items():
+            try:
+                originals[fake] = self.cipher.decrypt(sealed.encode("ascii")).decode("utf-8")
+            except Exception:
+                continue
+        return originals
+
+    @staticmethod
+    def _lookup(prefix: str, found: Dict[str, str]) -> Dict[str, str]:
+        """Strip the namespace from found keys."""
+        return {key[len(prefix):]: value for key, value in found.items()}
+
+    def get_fakes(self, originals: Iterable[str]) -> Dict[str, str]:
+        """Get cached fake data for originals. Returns found originals only."""
+        keys = [FORWARD_PREFIX + original for original in originals]
+        return self._lookup(FORWARD_PREFIX, self.cache.batch_get(keys)) if keys else {}
+
+    def get_originals(self, fakes: Iterable[str]) -> Dict[str, str]:
+        """Get cached originals for fake data. Returns found fake data only."""
+        keys = [REVERSE_PREFIX + fake for fake in fakes]
+        return self._unseal(self._lookup(REVERSE_PREFIX, self.cache.batch_get(keys))) if keys else {}
+
+    def put(self, original_to_fake: Dict[str, str], ttl: Optional[int] = None) -> bool:
+        """Cache mappings in both directions."""
+        if not original_to_fake:
+            return True
+        return self.cache.batch_put(self._entries(original_to_fake), ttl)
+
+    def delete(self, original: str, fake: str) -> bool:
+        """Remove both directions of a mapping."""
+        forward = self.cache.delete(FORWARD_PREFIX + original)
+        reverse = self.cache.delete(REVERSE_PREFIX + fake)
+        return forward or reverse
+
+    async def get_fakes_async(self, originals: Iterable[str]) -> Dict[str, str]:
+        """Async counterpart of get_fakes."""
+        keys = [FORWARD_PREFIX + original for original in originals]
+        return self._lookup(FORWARD_PREFIX, await self.async_cache.batch_get(keys)) if keys else {}
+
+    async def get_originals_async(self, fakes: Iterable[str]) -> Dict[str, str]:
+        """Async counterpart of get_originals."""
+        keys = [REVERSE_PREFIX + fake for fake in fakes]
+        return self._unseal(self._lookup(REVERSE_PREFIX, await self.async_cache.batch_get(keys))) if keys else {}
+
+    async def put_async(self, original_to_fake: Dict[str, str], ttl: Optional[int] = None) -> bool:
+        """Async counterpart of put."""
+        if not original_to_fake:
+            return True
+        return await self.async_cache.batch_put(self._entries(original_to_fake), ttl)
@@ -4,25 +4,45 @@ import json
 import logging
 import subprocess
 import threading
-import base64
 from concurrent.futures import ThreadPoolExecutor
 
 try:
-    import memcache
     from google.cloud import service_usage_v1
     from google.cloud import memcache_v1
     from google.api_core.exceptions import NotFound, PermissionDenied
 
-    MEMCACHE_AVAILABLE = True
+    GOOGLE_MEMCACHE_AVAILABLE = True
+except ImportError:
+    GOOGLE_MEMCACHE_AVAILABLE = False
+
+try:
+    import memcache
+
+    MEMCACHE_AVAILABLE = GOOGLE_MEMCACHE_AVAILABLE
 except ImportError:
     MEMCACHE_AVAILABLE = False
 
 from .base import CacheAdapter
+from .hash_ring import HashRing
+from .key_codec import KeyCodec
 from ..common import ServiceNotEnabledError, ConfigurationError
 
 
 class MemcacheAdapter(CacheAdapter):
-    """Google Cloud Memcache adapter."""
+    """
+    Google Cloud Memcache adapter.
+
+    Keys are spread over all nodes of the instance with a ketama consistent-
+    hash ring, so capacity and throughput grow with the node count and a
+    membership change only remaps the keys of the nodes that changed. Each
+    node has its own client; python-memcached clients are thread-local, so
+    every thread holds its own connection to each node. Batches are split
+    per node and sent to the nodes concurrently.
+    """
+
+    # Whether the client library is installed, and what to install if not
+    client_available = MEMCACHE_AVAILABLE
+    client_requirement = "python-memcached and google-cloud-memcache packages"
 
     def __init__(
             self,
@@ -37,6 +57,11 @@ class MemcacheAdapter(CacheAdapter):
             node_memory_gb: int = 1,
             default_ttl: int = 3600,
             check_service: bool = True,
+            stats_refresh_interval: Optional[float] = None,
+            servers: Optional[List[str]] = None,
+            membership_refresh_interval: Optional[float] = None,
+            key_namespace: str = "ra",
+            key_secret: Optional[str] = None,
             debug: bool = False
     ):
         """
@@ -54,10 +79,18 @@ class MemcacheAdapter(CacheAdapter):
             node_memory_gb: Memory in GB per node if creating a new instance
             default_ttl: Default time-to-live in seconds
             check_service: Whether to check if Memcache service is enabled
+            stats_refresh_interval: Seconds between background refreshes of
+                server statistics (default: fetch only via get_server_stats)
+            servers: Explicit "host:port" node list (takes precedence over host)
+            membership_refresh_interval: Seconds between background re-discovery
+                of the instance's nodes (instance_id only; default: never)
+            key_namespace: Prefix of every key this adapter writes
+            key_secret: Secret for the keyed key digest; share it between
+                processes that share the cache
             debug: Whether to enable debug logging
         """
-        if not MEMCACHE_AVAILABLE:
-            raise ImportError("Memcache functionality requires python-memcached and google-cloud-memcache packages")
+        if not self.client_available:
+            raise ImportError(f"Memcache functionality requires {self.client_requirement}")
 
         self.project_id = project_id
         self.instance_id = instance_id
@@ -68,46 +101,175 @@ class MemcacheAdapter(CacheAdapter):
         self.node_memory_gb = node_memory_gb
         self.default_ttl = default_ttl
         self.debug = debug
+        self.key_codec = KeyCodec(namespace=key_namespace, secret=key_secret)
+
+        # Client-side counters, maintained on every operation
+        self._stats_lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._sets = 0
+        self._errors = 0
+
+        # Last server statistics snapshot and when it was taken
+        self._server_stats: Optional[Dict[str, Any]] = None
+        self._server_stats_time: Optional[float] = None
+        self._stop_refresh = threading.Event()
+        self._refresh_thread: Optional[threading.Thread] = None
+        self._membership_thread: Optional[threading.Thread] = None
+
+        # Node ring and per-node clients, replaced together on membership changes
+        self._membership_lock = threading.Lock()
+        self._topology: Tuple[HashRing, Dict[str, Any]] = (HashRing(()), {})
+        self._executor = ThreadPoolExecutor(max_workers=8, thread_name_prefix="memcache-fanout")
 
         # Check if Memcache service is enabled
         if check_service:
             self._check_memcache_service()
 
-        # Initialize client with provided host:port or discover from instance
-        if host:
-            self.host = host
-            self.port = port
-            self.client = memcache.Client([(host, port)], debug=0)
+        # Initialize clients with the provided nodes or discover them from the instance
+        if servers:
+            nodes = [self._parse_node(server) for server in servers]
+        elif host:
+            nodes = [(host, port)]
         elif instance_id:
-            # Get host:port from instance ID
-            self.host, self.port = self._discover_memcache_endpoint()
-            self.client = memcache.Client([(self.host, self.port)], debug=0)
+            nodes = self._discover_memcache_nodes()
         else:
             raise ConfigurationError("Either host or instance_id must be provided")
+        self.host, self.port = nodes[0]
+        self._set_nodes(nodes)
 
         # Verify connection
         if not self.health_check():
             raise ConfigurationError("Could not connect to Memcache instance")
 
+        if stats_refresh_interval:
+            self._refresh_thread = threading.Thread(
+                target=self._refresh_server_stats,
+                args=(stats_refresh_interval,),
+                name="memcache-stats-refresh",
+                daemon=True
+            )
+            self._refresh_thread.start()
+
+        if membership_refresh_interval and instance_id and not servers and not host:
+            self._membership_thread = threading.Thread(
+                target=self._refresh_membership,
+                args=(membership_refresh_interval,),
+                name="memcache-membership-refresh",
+                daemon=True
+            )
+            self._membership_thread.start()
+
+    @staticmethod
+    def _parse_node(server: str) -> Tuple[str, int]:
+        """Parse "host[:port]" into (host, port)."""
+        host, _, port = server.rpartition(":")
+        if not host:
+            return server, 11211
+        return host, int(port)
+
+    def _set_nodes(self, nodes: List[Tuple[str, int]]) -> bool:
+        """
+        Point the ring at a new node list, reusing clients of kept nodes.
+
+        Returns:
+            True if the membership changed
+        """
+        with self._membership_lock:
+            clients = self._topology[1]
+            # python-memcached reads a (host, port) tuple as (server, weight); pass "host:port"
+            names = {f"{host}:{port}" for host, port in nodes}
+            if names == set(clients):
+                return False
+
+            new_clients = {
+                name: clients[name] if name in clients else self._new_client(name)
+                for name in names
+            }
+            self._topology = (HashRing(names), new_clients)
+
+        for name, client in clients.items():
+            if name not in new_clients:
+                self._close_client(client)
+        return True
+
+    def _new_client(self, node: str) -> Any:
+        """Create the client for one "host:port" node."""
+        return memcache.Client([node], debug=0)
+
+    def _close_client(self, client: Any) -> None:
+        """Disconnect a node client, ignoring errors."""
+        try:
+            client.disconnect_all()
+        except Exception:
+            pass
+
+    def _node_stats(self, client: Any) -> Optional[Dict[Any, Any]]:
+        """Raw statistics of one node, or None if unavailable."""
+        stats = client.get_stats()
+        return stats[0][1] if stats else None  # [(server, stats_dict)]
+
+    @property
+    def nodes(self) -> List[str]:
+        """Names of the nodes keys are currently spread over."""
+        return list(self._topology[0].nodes)
+
+    def refresh_nodes(self) -> bool:
+        """
+        Re-discover the instance's nodes and update the ring.
+
+        Returns:
+            True if the membership changed
+        """
+        if not self.instance_id:
+            return False
+        changed = self._set_nodes(self._discover_memcache_nodes())
+        if changed:
+            logging.info(f"Memcache membership changed: {self.nodes}")
+        return changed
+
+    def _refresh_membership(self, interval: float) -> None:
+        """Background loop re-discovering the instance's nodes."""
+        while not self._stop_refresh.wait(interval):
+            try:
+                self.refresh_nodes()
+            except Exception as e:
+                logging.warning(f"Memcache membership refresh error: {str(e)}")
+
+    def _client(self, key: str) -> Any:
+        """Client of the node owning a (sanitized) key."""
+        ring, clients = self._topology
+        return clients[ring.get_node(key)]
+
+    def _fan_out(self, keys: List[str], operation) -> List[Any]:
+        """
+        Run operation(client, node_keys) for each node owning some keys.
+
+        Single-node batches run inline; larger ones run on the nodes concurrently.
+        """
+        ring, clients = self._topology
+        groups = ring.group(keys)
+        if len(groups) == 1:
+            node, node_keys = next(iter(groups.items()))
+            return [operation(clients[node], node_keys)]
+        futures = [
+            self._executor.submit(operation, clients[node], node_keys)
+            for node, node_keys in groups.items()
+        ]
+        return [future.result() for future in futures]
+
     def _sanitize_key(self, key: str) -> str:
         """
-        Sanitize a key for use with Memcached.
-        Memcached doesn't allow spaces or control characters in keys.
+        Encode a key for use with Memcached.
+
+        Keys are replaced by a fixed-size keyed digest, so they are always
+        valid Memcached keys and the original value never goes on the wire.
         """
-        # Base64 encode the key to ensure it's valid for Memcached
-        # This is reversible and preserves uniqueness
-        sanitized = base64.b64encode(key.encode('utf-8')).decode('ascii')
+        sanitized = self.key_codec.encode(key)
         if self.debug:
-            logging.debug(f"Sanitized key: '{key}' -> '{sanitized}'")
+            logging.debug(f"Sanitized key -> '{sanitized}'")
         return sanitized
 
-    def _desanitize_key(self, sanitized_key: str) -> str:
-        """Convert a sanitized key back to the original."""
-        try:
-            return base64.b64decode(sanitized_key.encode('ascii')).decode('utf-8')
-        except:
-            return sanitized_key  # Return as is if not base64 encoded
-
     def _check_memcache_service(self) -> None:
         """Check if Memcache service is enabled."""
         try:
@@ -154,8 +316,8 @@ class MemcacheAdapter(CacheAdapter):
         except Exception as e:
             raise ServiceNotEnabledError(f"Failed to enable Memcache service: {str(e)}")
 
-    def _discover_memcache_endpoint(self) -> Tuple[str, int]:
-        """Discover Memcache endpoint from instance ID."""
+    def _discover_memcache_nodes(self) -> List[Tuple[str, int]]:
+        """Discover the (host, port) of every ready node from the instance ID."""
         try:
             client = memcache_v1.CloudMemcacheClient()
             name = f"projects/{self.project_id}/locations/{self.region}/instances/{self.instance_id}"
@@ -173,23 +335,25 @@ class MemcacheAdapter(CacheAdapter):
                         f"in project {self.project_id}, region {self.region}"
                     )
 
-            # Get the discovery endpoint
+            # Prefer the individual nodes so keys can be spread over all of them
+            ready = memcache_v1.Instance.Node.State.READY
+            nodes = [
+                (node.host, node.port or 11211)
+                for node in instance.memcache_nodes
+                if node.host and node.state == ready
+            ]
+            if nodes:
+                return nodes
+
+            # Fall back to the discovery endpoint (typically host:port format)
             discovery_endpoint = instance.discovery_endpoint
             if not discovery_endpoint:
-                # If no discovery endpoint, use the first node's IP
-                if instance.nodes:
-                    host = instance.nodes[0].host
-                    port = 11211  # Default Memcache port
-                    return host, port
-
-            # Parse the discovery endpoint (typically host:port format)
-            parts = discovery_endpoint.split(':')
-            host = parts[0]
-            port = int(parts[1]) if len(parts) > 1 else 11211
-
-            return host, port
+                raise ConfigurationError(f"Memcache instance {self.instance_id} has no ready nodes")
+            return [self._parse_node(discovery_endpoint)]
+        except ConfigurationError:
+            raise
         except Exception as e:
-            raise ConfigurationError(f"Failed to discover Memcache endpoint: {str(e)}")
+            raise ConfigurationError(f"Failed to discover Memcache nodes: {str(e)}")
 
     def _create_memcache_instance(self) -> Any:
         """Create a new Memcache instance."""
@@ -223,13 +387,22 @@ class MemcacheAdapter(CacheAdapter):
         except Exception as e:
             raise ConfigurationError(f"Failed to create Memcache instance: {str(e)}")
 
+    def _record(self, hits: int = 0, misses: int = 0, sets: int = 0, errors: int = 0) -> None:
+        with self._stats_lock:
+            self._hits += hits
+            self._misses += misses
+            self._sets += sets
+            self._errors += errors
+
     def get(self, key: str) -> Optional[str]:
         """Get a value from Memcache."""
         try:
             sanitized_key = self._sanitize_key(key)
-            value = self.client.get(sanitized_key)
+            value = self._client(sanitized_key).get(sanitized_key)
             if value is None:
+                self._record(misses=1)
                 return None
+            self._record(hits=1)
 
             # Convert bytes to string if needed
             if isinstance(value, bytes):
@@ -238,6 +411,7 @@ class MemcacheAdapter(CacheAdapter):
             return value
         except Exception as e:
             logging.warning(f"Memcache get error: {str(e)}")
+            self._record(misses=1, errors=1)
             return None
 
     def put(self, key: str, value: str, ttl: Optional[int] = None) -> bool:
@@ -245,16 +419,18 @@ class MemcacheAdapter(CacheAdapter):
         try:
             sanitized_key = self._sanitize_key(key)
             expiry = ttl if ttl is not None else self.default_ttl
-            return self.client.set(sanitized_key, value, time=expiry)
+            self._record(sets=1)
+            return self._client(sanitized_key).set(sanitized_key, value, time=expiry)
         except Exception as e:
             logging.warning(f"Memcache put error: {str(e)}")
+            self._record(errors=1)
             return False
 
     def delete(self, key: str) -> bool:
         """Delete a key from Memcache."""
         try:
             sanitized_key = self._sanitize_key(key)
-            return self.client.delete(sanitized_key)
+            return self._client(sanitized_key).delete(sanitized_key)
         except Exception as e:
             logging.warning(f"Memcache delete error: {str(e)}")
             return False
@@ -262,35 +438,39 @@ class MemcacheAdapter(CacheAdapter):
     def clear(self) -> None:
         """Clear all items from Memcache (flush)."""
         try:
-            self.client.flush_all()
+            for client in self._topology[1].values():
+                client.flush_all()
         except Exception as e:
             logging.warning(f"Memcache clear error: {str(e)}")
 
     def batch_get(self, keys: List[str]) -> Dict[str, str]:
         """Get multiple keys at once."""
         try:
-            # Sanitize all keys
-            sanitized_keys = [self._sanitize_key(k) for k in keys]
-
-            # Create a mapping from sanitized keys back to original keys
+            # Sanitize each key once; digests are one-way, so keep the mapping back
             sanitized_to_original = {self._sanitize_key(k): k for k in keys}
 
-            # Get values using sanitized keys
-            sanitized_values = self.client.get_multi(sanitized_keys)
+            # Get values using sanitized keys, one request per node
+            sanitized_values = {}
+            for found in self._fan_out(
+                    list(sanitized_to_original), lambda client, node_keys: client.get_multi(node_keys)
+            ):
+                sanitized_values.update(found)
 
             # Convert back to original keys
             result = {}
             for sanitized_key, value in sanitized_values.items():
                 original_key = sanitized_to_original.get(sanitized_key)
-                if original_key:
+                if original_key is not None:
                     if isinstance(value, bytes):
                         result[original_key] = value.decode('utf-8')
                     else:
                         result[original_key] = value
 
+            self._record(hits=len(result), misses=len(sanitized_to_original) - len(result))
             return result
         except Exception as e:
             logging.warning(f"Memcache batch_get error: {str(e)}")
+            self._record(misses=len(keys), errors=1)
             return {}
 
     def batch_put(self, key_values: Dict[str, str], ttl: Optional[int] = None) -> bool:
@@ -300,61 +480,113 @@ class MemcacheAdapter(CacheAdapter):
             sanitized_dict = {self._sanitize_key(k): v for k, v in key_values.items()}
 
             expiry = ttl if ttl is not None else self.default_ttl
-            return self.client.set_multi(sanitized_dict, time=expiry)
+            self._record(sets=len(sanitized_dict))
+
+            # set_multi returns the keys that failed
+            failed = self._fan_out(
+                list(sanitized_dict),
+                lambda client, node_keys: client.set_multi(
+                    {key: sanitized_dict[key] for key in node_keys}, time=expiry
+                )
+            )
+            return not any(failed)
         except Exception as e:
             logging.warning(f"Memcache batch_put error: {str(e)}")
+            self._record(errors=1)
             return False
 
     def get_stats(self) -> Dict[str, Any]:
-        """Get Memcache statistics."""
+        """
+        Get a snapshot of client-side counters without contacting the server.
+
+        Includes the last server statistics fetched by get_server_stats or
+        the background refresh, if any.
+        """
+        with self._stats_lock:
+            hits, misses, sets, errors = self._hits, self._misses, self._sets, self._errors
+
+        lookups = hits + misses
+        return {
+            "type": "memcache",
+            "host": self.host,
+            "port": self.port,
+            "nodes": self.nodes,
+            "default_ttl": self.default_ttl,
+            "hits": hits,
+            "misses": misses,
+            "hit_rate": hits / lookups if lookups else 0.0,
+            "sets": sets,
+            "errors": errors,
+            "server": self._server_stats,
+            "server_stats_age": (
+                time.time() - self._server_stats_time if self._server_stats_time is not None else None
+            )
+        }
+
+    def get_server_stats(self) -> Dict[str, Any]:
+        """
+        Fetch statistics from every Memcache node (one round trip per node).
+
+        Counters are summed over the nodes; per-node figures are under "nodes".
+        """
+        fields = ("curr_items", "get_hits", "get_misses", "total_items", "bytes", "limit_maxbytes", "evictions")
         try:
-            stats = self.client.get_stats()
-            if stats:
-                # Extract relevant stats from the first server
-                server_stats = stats[0][1]  # (server, stats_dict)
-                return {
-                    "type": "memcache",
-                    "host": self.host,
-                    "port": self.port,
-                    "curr_items": int(server_stats.get(b'curr_items', 0)),
-                    "get_hits": int(server_stats.get(b'get_hits', 0)),
-                    "get_misses": int(server_stats.get(b'get_misses', 0)),
-                    "total_items": int(server_stats.get(b'total_items', 0)),
-                    "bytes": int(server_stats.get(b'bytes', 0)),
-                    "limit_maxbytes": int(server_stats.get(b'limit_maxbytes', 0)),
-                    "evictions": int(server_stats.get(b'evictions', 0)),
-                    "default_ttl": self.default_ttl
-                }
-            return {
-                "type": "memcache",
-                "host": self.host,
-                "port": self.port,
-                "default_ttl": self.default_ttl,
-                "error": "No stats available"
-            }
+            result = {field: 0 for field in fields}
+            per_node = {}
+            for node, client in self._topology[1].items():
+                server_stats = self._node_stats(client)
+                if not server_stats:
+                    per_node[node] = {"error": "No stats available"}
+                    continue
+
+                def stat(name: str) -> int:
+                    # Keys are bytes or str depending on the client version
+                    return int(server_stats.get(name.encode(), server_stats.get(name, 0)))
+
+                per_node[node] = {field: stat(field) for field in fields}
+                for field in fields:
+                    result[field] += per_node[node][field]
+
+            if not any("error" not in node_stats for node_stats in per_node.values()):
+                result = {"error": "No stats available"}
+            result["nodes"] = per_node
         except Exception as e:
-            return {
-                "type": "memcache",
-                "host": self.host,
-                "port": self.port,
-                "default_ttl": self.default_ttl,
-                "error": str(e)
-            }
+            result = {"error": str(e)}
+
+        self._server_stats = result
+        self._server_stats_time = time.time()
+        return result
+
+    def _refresh_server_stats(self, interval: float) -> None:
+        """Background loop refreshing server statistics."""
+        while not self._stop_refresh.wait(interval):
+            self.get_server_stats()
+
+    def close(self) -> None:
+        """Stop the background refreshes and disconnect from every node."""
+        self._stop_refresh.set()
+        for thread in (self._refresh_thread, self._membership_thread):
+            if thread is not None:
+                thread.join(timeout=1)
+        self._executor.shutdown(wait=False)
+        for client in self._topology[1].values():
+            self._close_client(client)
 
     def health_check(self) -> bool:
-        """Check if Memcache is available and working."""
+        """Check if every Memcache node is available and working."""
         try:
-            # Try to set and get a test value
+            # Try to set and get a test value on each node
             test_key = "_health_check_"
             test_value = "ok"
 
-            success = self.client.set(test_key, test_value)
-            if not success:
-                return False
+            for client in self._topology[1].values():
+                success = client.set(test_key, test_value)
+                if not success:
+                    return False
 
-            value = self.client.get(test_key)
-            if value != test_value:
-                return False
+                value = client.get(test_key)
+                if value not in (test_value, test_value.encode()):
+                    return False
 
             return True
         except Exception:
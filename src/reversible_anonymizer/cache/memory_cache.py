@@ -1,110 +1,497 @@
-from typing import Optional, Dict, Any, List, Tuple
+from typing import Optional, Dict, Any, List
+import math
+import sys
 import time
+import threading
 from collections import OrderedDict
 
 from .base import CacheAdapter
+from .expiry import TimingWheel
+from .tinylfu import FrequencySketch
+from ..common import ConfigurationError
+
+
+class _Entry:
+    """A cached value with its expiry time and accounted size."""
+
+    __slots__ = ("value", "expires_at", "size")
+
+    def __init__(self, value: str, expires_at: float, size: int):
+        self.value = value
+        self.expires_at = expires_at
+        self.size = size
+
+
+# Approximate per-entry bookkeeping: the entry object plus its ordered-dict slot
+_ENTRY_OVERHEAD = sys.getsizeof(_Entry("", 0.0, 0)) + 100
+
+# Typical entry size, used to size the frequency sketch in max_bytes mode
+_TYPICAL_ENTRY_BYTES = 256
+
+POLICIES = ("lru", "tinylfu")
+
+
+class _Shard:
+    """One independently locked LRU partition of the memory cache."""
+
+    __slots__ = ("lock", "entries", "capacity", "max_bytes", "bytes", "wheel",
+                 "hits", "misses", "evictions", "expirations")
+
+    def __init__(self, capacity: float, max_bytes: float, resolution: float):
+        self.lock = threading.Lock()
+        self.entries: OrderedDict[str, _Entry] = OrderedDict()
+        self.capacity = capacity
+        self.max_bytes = max_bytes
+        self.bytes = 0
+        self.wheel = TimingWheel(resolution)
+
+        # Counters, updated under the shard lock
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    # Policy hooks; every one is called with the shard lock held
+
+    def touch(self, key: str) -> None:
+        """Record a hit on a stored key."""
+        self.entries.move_to_end(key)
+
+    def record_miss(self, key: str) -> None:
+        """Record a lookup of a key that is not stored."""
+
+    def insert(self, key: str, entry: _Entry) -> bool:
+        """Store an entry, evicting as needed. False if it can never fit."""
+        if entry.size > self.max_bytes:
+            return False
+
+        entries = self.entries
+        previous = entries.pop(key, None)
+        if previous is not None:
+            self.bytes -= previous.size
+
+        # Remove least recently used items until the new entry fits
+        while entries and (len(entries) >= self.capacity or self.bytes + entry.size > self.max_bytes):
+            _, evicted = entries.popitem(last=False)
+            self.bytes -= evicted.size
+            self.evictions += 1
+
+        entries[key] = entry
+        self.bytes += entry.size
+        return True
+
+    def remove(self, key: str) -> Optional[_Entry]:
+        """Remove and return an entry, if stored."""
+        entry = self.entries.pop(key, None)
+        if entry is not None:
+            self.bytes -= entry.size
+        return entry
+
+    def clear(self) -> None:
+        """Remove every entry."""
+        self.entries.clear()
+        self.wheel.clear()
+        self.bytes = 0
+
+
+# Segments of a W-TinyLFU shard
+_WINDOW, _PROBATION, _PROTECTED = 0, 1, 2
+
+
+class _TinyLfuShard(_Shard):
+    """
+    Shard using the W-TinyLFU policy instead of plain LRU.
+
+    New entries enter a small window LRU (1% of the shard). Entries leaving
+    the window compete for the main area, a segmented LRU with probation
+    and protected parts: a candidate is admitted only if the frequency
+    sketch has seen it more often than the main area's eviction victim.
+    One-off keys therefore pass through the window without displacing
+    frequently used entries. Limits are in items, or in bytes when the
+    shard has a byte budget.
+    """
+
+    __slots__ = ("sketch", "segments", "used", "by_bytes", "limit",
+                 "window_limit", "main_limit", "protected_limit")
+
+    def __init__(self, capacity: float, max_bytes: float, resolution: float, expected_entries: int):
+        super().__init__(capacity, max_bytes, resolution)
+        self.entries = {}  # Lookup only; recency order lives in the segments
+        self.sketch = FrequencySketch(expected_entries)
+        self.segments = (OrderedDict(), OrderedDict(), OrderedDict())  # Key -> weight
+        self.used = [0, 0, 0]
+
+        self.by_bytes = max_bytes != math.inf
+        self.limit = max_bytes if self.by_bytes else capacity
+        self.window_limit = max(1, self.limit // 100)
+        self.main_limit = self.limit - self.window_limit
+        self.protected_limit = self.main_limit * 0.8
+
+    def touch(self, key: str) -> None:
+        self.sketch.increment(key)
+        window, probation, protected = self.segments
+        if key in protected:
+            protected.move_to_end(key)
+        elif key in window:
+            window.move_to_end(key)
+        else:
+            # A second hit promotes a probation entry to the protected segment
+            weight = probation.pop(key)
+            self.used[_PROBATION] -= weight
+            protected[key] = weight
+            self.used[_PROTECTED] += weight
+            self._demote()
+
+    def record_miss(self, key: str) -> None:
+        self.sketch.increment(key)
+
+    def insert(self, key: str, entry: _Entry) -> bool:
+        weight = entry.size if self.by_bytes else 1
+        if weight > self.limit:
+            return False
+
+        self.sketch.increment(key)
+        self.remove(key)
+        self.entries[key] = entry
+        self.bytes += entry.size
+        self.segments[_WINDOW][key] = weight
+        self.used[_WINDOW] += weight
+
+        # Entries overflowing the window become candidates for the main area
+        window = self.segments[_WINDOW]
+        while self.used[_WINDOW] > self.window_limit:
+            candidate, candidate_weight = window.popitem(last=False)
+            self.used[_WINDOW] -= candidate_weight
+            self._admit(candidate, candidate_weight)
+        return True
+
+    def _admit(self, candidate: str, weight: float) -> None:
+        """Move a window candidate into probation if it beats the victims."""
+        _, probation, protected = self.segments
+        used = self.used
+        candidate_frequency = self.sketch.frequency(candidate)
+        while used[_PROBATION] + used[_PROTECTED] + weight > self.main_limit:
+            victims = probation if probation else protected
+            if victims:
+                victim = next(iter(victims))
+                if candidate_frequency > self.sketch.frequency(victim):
+                    self._evict(victim)
+                    continue
+            # The candidate is not worth more than what it would displace
+            self.bytes -= self.entries.pop(candidate).size
+            self.evictions += 1
+            return
+        probation[candidate] = weight
+        used[_PROBATION] += weight
+
+    def _demote(self) -> None:
+        """Move protected overflow back to the probation segment."""
+        _, probation, protected = self.segments
+        used = self.used
+        while used[_PROTECTED] > self.protected_limit:
+            key, weight = protected.popitem(last=False)
+            used[_PROTECTED] -= weight
+            probation[key] = weight
+            used[_PROBATION] += weight
+
+    def _evict(self, key: str) -> None:
+        self.remove(key)
+        self.evictions += 1
+
+    def remove(self, key: str) -> Optional[_Entry]:
+        entry = self.entries.pop(key, None)
+        if entry is None:
+            return None
+        self.bytes -= entry.size
+        for segment, order in enumerate(self.segments):
+            weight = order.pop(key, None)
+            if weight is not None:
+                self.used[segment] -= weight
+                break
+        return entry
+
+    def clear(self) -> None:
+        super().clear()
+        for order in self.segments:
+            order.clear()
+        self.used = [0, 0, 0]
 
 
 class MemoryCacheAdapter(CacheAdapter):
-    """In-memory cache adapter using LRU strategy."""
+    """
+    Thread-safe in-memory cache adapter using a sharded LRU strategy.
+
+    Keys are spread over shards by hash. Each shard has its own lock and LRU
+    order, so concurrent workers only contend when they touch the same
+    shard. Batch operations take each shard lock once. Statistics are
+    counters maintained on the hot path, so get_stats never scans entries.
 
-    def __init__(self, capacity: int = 1000, default_ttl: int = 3600):
+    Every entry carries its own expiry time. Expired entries are reclaimed
+    through a timing wheel per shard, piggybacked on writes to that shard
+    and, optionally, by a background sweeper, so memory tracks live entries.
+
+    The cache is bounded by item count (capacity) or, when max_bytes is set,
+    by the approximate memory of keys, values and entry bookkeeping. The
+    eviction policy is plain LRU or, with policy="tinylfu", W-TinyLFU, which
+    keeps frequently used entries when bursts of one-off keys arrive.
+    """
+
+    blocking = False
+
+    def __init__(
+            self,
+            capacity: int = 1000,
+            default_ttl: int = 3600,
+            shards: int = 16,
+            sweep_interval: Optional[float] = None,
+            expiry_resolution: float = 1.0,
+            max_bytes: Optional[int] = None,
+            intern_values: bool = False,
+            policy: str = "lru"
+    ):
         """
         Initialize LRU cache.
 
         Args:
             capacity: Maximum number of items in cache
-            default_ttl: Default time-to-live in seconds (default: 1 hour)
+            default_ttl: Default time-to-live in seconds (default: 1 hour);
+                a TTL of 0 or less never expires
+            shards: Number of independently locked partitions
+            sweep_interval: Seconds between background expiry sweeps
+                (default: expire only while writing)
+            expiry_resolution: Granularity in seconds of the expiry wheel
+            max_bytes: Memory budget in bytes; replaces the item-count capacity
+            intern_values: Whether to intern values so repeated values share memory
+            policy: Eviction policy, "lru" or "tinylfu"
+
+        Raises:
+            ConfigurationError: If the policy is unknown
         """
+        if policy not in POLICIES:
+            raise ConfigurationError(f"Unknown cache policy: {policy}. Must be one of {list(POLICIES)}")
+
         self.capacity = capacity
         self.default_ttl = default_ttl
-        self.cache: OrderedDict[str, Tuple[str, float]] = OrderedDict()
+        self.max_bytes = max_bytes
+        self.intern_values = intern_values
+        self.policy = policy
 
-    def get(self, key: str) -> Optional[str]:
-        """Get a value from the cache."""
-        if key not in self.cache:
-            return None
+        if max_bytes is not None:
+            # Split the budget evenly; item count is unbounded
+            shard_count = max(1, shards)
+            limits = [(math.inf, max_bytes / shard_count)] * shard_count
+        else:
+            # Split the capacity exactly; never create shards that cannot hold an item
+            shard_count = max(1, min(shards, capacity))
+            base, remainder = divmod(capacity, shard_count)
+            limits = [(base + (1 if i < remainder else 0), math.inf) for i in range(shard_count)]
+
+        if policy == "tinylfu":
+            self._shards = [
+                _TinyLfuShard(
+                    shard_capacity, shard_bytes, expiry_resolution,
+                    int(shard_bytes // _TYPICAL_ENTRY_BYTES) if max_bytes is not None else shard_capacity
+                )
+                for shard_capacity, shard_bytes in limits
+            ]
+        else:
+            self._shards = [
+                _Shard(shard_capacity, shard_bytes, expiry_resolution)
+                for shard_capacity, shard_bytes in limits
+            ]
 
-        value, timestamp = self.cache[key]
+        self._stop_sweeper = threading.Event()
+        self._sweeper: Optional[threading.Thread] = None
+        if sweep_interval:
+            self._sweeper = threading.Thread(
+                target=self._sweep,
+                args=(sweep_interval,),
+                name="memory-cache-sweeper",
+                daemon=True
+            )
+            self._sweeper.start()
+
+    def _shard(self, key: str) -> _Shard:
+        return self._shards[hash(key) % len(self._shards)]
+
+    def _group(self, keys) -> Dict[int, List[str]]:
+        """Group keys by shard index."""
+        groups: Dict[int, List[str]] = {}
+        shard_count = len(self._shards)
+        for key in keys:
+            groups.setdefault(hash(key) % shard_count, []).append(key)
+        return groups
+
+    def _expires_at(self, ttl: Optional[int], now: float) -> float:
+        """Absolute expiry time for a TTL (default TTL when None)."""
+        if ttl is None:
+            ttl = self.default_ttl
+        return now + ttl if ttl > 0 else math.inf
+
+    @staticmethod
+    def _expire_locked(shard: _Shard, now: float) -> int:
+        """Drop entries whose wheel bucket is due; the shard lock must be held."""
+        if shard.wheel.next_due() > now:
+            return 0
+
+        removed = 0
+        entries = shard.entries
+        for key in shard.wheel.due(now):
+            entry = entries.get(key)
+            # The wheel may hold keys since overwritten with a later expiry
+            if entry is not None and entry.expires_at <= now:
+                shard.remove(key)
+                removed += 1
+        shard.expirations += removed
+        return removed
+
+    def _get_locked(self, shard: _Shard, key: str, now: float) -> Optional[str]:
+        """Look up a key; the shard lock must be held."""
+        entry = shard.entries.get(key)
+        if entry is None:
+            shard.record_miss(key)
+            shard.misses += 1
+            return None
 
         # Check if item has expired
-        if time.time() - timestamp > self.default_ttl:
-            self.cache.pop(key)
+        if entry.expires_at <= now:
+            shard.remove(key)
+            shard.record_miss(key)
+            shard.expirations += 1
+            shard.misses += 1
             return None
 
-        # Move to end (most recently used)
-        self.cache.move_to_end(key)
-        return value
+        shard.touch(key)
+        shard.hits += 1
+        return entry.value
+
+    def _put_locked(self, shard: _Shard, key: str, value: str, expires_at: float) -> bool:
+        """Store a key; the shard lock must be held. False if it can never fit."""
+        if self.intern_values and type(value) is str:
+            value = sys.intern(value)
+        size = sys.getsizeof(key) + sys.getsizeof(value) + _ENTRY_OVERHEAD
+        if not shard.insert(key, _Entry(value, expires_at, size)):
+            return False
+        if expires_at != math.inf:
+            shard.wheel.schedule(key, expires_at)
+        return True
+
+    def get(self, key: str) -> Optional[str]:
+        """Get a value from the cache."""
+        shard = self._shard(key)
+        with shard.lock:
+            return self._get_locked(shard, key, time.time())
 
     def put(self, key: str, value: str, ttl: Optional[int] = None) -> bool:
-        """Put a value in the cache."""
+        """Put a value in the cache with optional TTL in seconds."""
+        shard = self._shard(key)
         try:
-            if key in self.cache:
-                self.cache.pop(key)
-            elif len(self.cache) >= self.capacity:
-                # Remove least recently used item
-                self.cache.popitem(last=False)
-
-            self.cache[key] = (value, time.time())
-            return True
+            now = time.time()
+            with shard.lock:
+                self._expire_locked(shard, now)
+                return self._put_locked(shard, key, value, self._expires_at(ttl, now))
         except Exception:
             return False
 
     def delete(self, key: str) -> bool:
         """Remove a key from the cache."""
-        if key in self.cache:
-            self.cache.pop(key)
-            return True
-        return False
+        shard = self._shard(key)
+        with shard.lock:
+            return shard.remove(key) is not None
 
     def clear(self) -> None:
         """Clear all items from the cache."""
-        self.cache.clear()
+        for shard in self._shards:
+            with shard.lock:
+                shard.clear()
 
     def batch_get(self, keys: List[str]) -> Dict[str, str]:
-        """Get multiple keys at once."""
+        """Get multiple keys at once, locking each shard once."""
         result = {}
-        for key in keys:
-            value = self.get(key)
-            if value is not None:
-                result[key] = value
+        now = time.time()
+        for index, shard_keys in self._group(keys).items():
+            shard = self._shards[index]
+            with shard.lock:
+                for key in shard_keys:
+                    value = self._get_locked(shard, key, now)
+                    if value is not None:
+                        result[key] = value
         return result
 
     def batch_put(self, key_values: Dict[str, str], ttl: Optional[int] = None) -> bool:
-        """Put multiple key-value pairs at once."""
+        """Put multiple key-value pairs at once, locking each shard once."""
         try:
-            for key, value in key_values.items():
-                self.put(key, value, ttl)
-            return True
+            now = time.time()
+            expires_at = self._expires_at(ttl, now)
+            stored = True
+            for index, shard_keys in self._group(key_values).items():
+                shard = self._shards[index]
+                with shard.lock:
+                    self._expire_locked(shard, now)
+                    for key in shard_keys:
+                        stored &= self._put_locked(shard, key, key_values[key], expires_at)
+            return stored
         except Exception:
             return False
 
+    def expire(self) -> int:
+        """Reclaim all expired entries now. Returns the number removed."""
+        removed = 0
+        now = time.time()
+        for shard in self._shards:
+            with shard.lock:
+                removed += self._expire_locked(shard, now)
+        return removed
+
+    def _sweep(self, interval: float) -> None:
+        """Background loop reclaiming expired entries."""
+        while not self._stop_sweeper.wait(interval):
+            self.expire()
+
+    def close(self) -> None:
+        """Stop the background sweeper, if running."""
+        self._stop_sweeper.set()
+        if self._sweeper is not None:
+            self._sweeper.join(timeout=1)
+
     def __len__(self) -> int:
         """Return the number of items in the cache."""
-        return len(self.cache)
+        return sum(len(shard.entries) for shard in self._shards)
 
     def get_stats(self) -> Dict[str, Any]:
-        """Get cache statistics."""
-        valid_items = 0
-        expired_items = 0
-
-        current_time = time.time()
-        for _, (_, timestamp) in self.cache.items():
-            if current_time - timestamp <= self.default_ttl:
-                valid_items += 1
-            else:
-                expired_items += 1
+        """Get a snapshot of the cache counters; costs O(shards), not O(items)."""
+        total_items = bytes_used = hits = misses = evictions = expirations = 0
+        for shard in self._shards:
+            # Plain int reads; a snapshot may mix shards read at slightly different times
+            total_items += len(shard.entries)
+            bytes_used += shard.bytes
+            hits += shard.hits
+            misses += shard.misses
+            evictions += shard.evictions
+            expirations += shard.expirations
 
+        lookups = hits + misses
+        if self.max_bytes is not None:
+            usage_percent = (bytes_used / self.max_bytes) * 100 if self.max_bytes > 0 else 0
+        else:
+            usage_percent = (total_items / self.capacity) * 100 if self.capacity > 0 else 0
         return {
             "type": "memory",
-            "total_items": len(self.cache),
-            "valid_items": valid_items,
-            "expired_items": expired_items,
-            "capacity": self.capacity,
+            "policy": self.policy,
+            "total_items": total_items,
+            "capacity": self.capacity if self.max_bytes is None else None,
+            "max_bytes": self.max_bytes,
+            "bytes_used": bytes_used,
+            "shards": len(self._shards),
             "ttl": self.default_ttl,
-            "usage_percent": (len(self.cache) / self.capacity) * 100 if self.capacity > 0 else 0
+            "usage_percent": usage_percent,
+            "hits": hits,
+            "misses": misses,
+            "hit_rate": hits / lookups if lookups else 0.0,
+            "evictions": evictions,
+            "expirations": expirations
         }
 
     def health_check(self) -> bool:
         """Check if cache is available and working."""
-        return True  # In-memory cache is always available
\ No newline at end of file
+        return True  # In-memory cache is always available
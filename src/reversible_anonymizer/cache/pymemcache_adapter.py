@@ -0,0 +1,144 @@
+from typing import Optional, Dict, Any, List
+import logging
+
+try:
+    from pymemcache.client.base import PooledClient
+
+    PYMEMCACHE_AVAILABLE = True
+except ImportError:
+    PYMEMCACHE_AVAILABLE = False
+
+from .memcache_adapter import MemcacheAdapter, GOOGLE_MEMCACHE_AVAILABLE
+
+
+class PymemcacheAdapter(MemcacheAdapter):
+    """
+    Memcache adapter on pymemcache with pipelined batches.
+
+    Shares node discovery, consistent hashing, key encoding and statistics
+    with MemcacheAdapter, but talks to each node through a pymemcache
+    connection pool: a batch read is a single multi-key get per node, a
+    batch write sends every set command in one write, and writes can be
+    sent with noreply so they never wait for the server. Values are stored
+    as UTF-8 bytes without type sniffing, and connect and socket timeouts
+    are configurable.
+    """
+
+    client_available = PYMEMCACHE_AVAILABLE and GOOGLE_MEMCACHE_AVAILABLE
+    client_requirement = "pymemcache and google-cloud-memcache packages"
+
+    def __init__(
+            self,
+            project_id: str,
+            noreply: bool = False,
+            connect_timeout: Optional[float] = 1.0,
+            timeout: Optional[float] = 0.5,
+            max_pool_size: Optional[int] = None,
+            **kwargs: Any
+    ):
+        """
+        Initialize the pymemcache adapter.
+
+        Args:
+            project_id: Google Cloud project ID
+            noreply: Whether writes skip waiting for the server's reply; put
+                and batch_put then report success without confirmation
+            connect_timeout: Seconds to wait for a connection
+            timeout: Seconds to wait on a socket read or write
+            max_pool_size: Maximum connections per node (default: unbounded)
+            **kwargs: MemcacheAdapter arguments (host, servers, instance_id, ...)
+        """
+        self.noreply = noreply
+        self.connect_timeout = connect_timeout
+        self.timeout = timeout
+        self.max_pool_size = max_pool_size
+        super().__init__(project_id, **kwargs)
+
+    def _new_client(self, node: str) -> Any:
+        host, port = self._parse_node(node)
+        return PooledClient(
+            (host, port),
+            connect_timeout=self.connect_timeout,
+            timeout=self.timeout,
+            no_delay=True,
+            max_pool_size=self.max_pool_size,
+            default_noreply=False
+        )
+
+    def _close_client(self, client: Any) -> None:
+        try:
+            client.close()
+        except Exception:
+            pass
+
+    def _node_stats(self, client: Any) -> Optional[Dict[Any, Any]]:
+        return client.stats()
+
+    def put(self, key: str, value: str, ttl: Optional[int] = None) -> bool:
+        """Put a value in Memcache."""
+        try:
+            sanitized_key = self._sanitize_key(key)
+            expiry = ttl if ttl is not None else self.default_ttl
+            self._record(sets=1)
+            return self._client(sanitized_key).set(
+                sanitized_key, value.encode("utf-8"), expire=expiry, noreply=self.noreply
+            )
+        except Exception as e:
+            logging.warning(f"Memcache put error: {str(e)}")
+            self._record(errors=1)
+            return False
+
+    def delete(self, key: str) -> bool:
+        """Delete a key from Memcache."""
+        try:
+            sanitized_key = self._sanitize_key(key)
+            return self._client(sanitized_key).delete(sanitized_key, noreply=False)
+        except Exception as e:
+            logging.warning(f"Memcache delete error: {str(e)}")
+            return False
+
+    def batch_get(self, keys: List[str]) -> Dict[str, str]:
+        """Get multiple keys with one pipelined get per node."""
+        try:
+            sanitized_to_original = {self._sanitize_key(k): k for k in keys}
+
+            result = {}
+            for found in self._fan_out(
+                    list(sanitized_to_original), lambda client, node_keys: client.get_many(node_keys)
+            ):
+                for sanitized_key, value in found.items():
+                    result[sanitized_to_original[sanitized_key]] = value.decode("utf-8")
+
+            self._record(hits=len(result), misses=len(sanitized_to_original) - len(result))
+            return result
+        except Exception as e:
+            logging.warning(f"Memcache batch_get error: {str(e)}")
+            self._record(misses=len(keys), errors=1)
+            return {}
+
+    def batch_put(self, key_values: Dict[str, str], ttl: Optional[int] = None) -> bool:
+        """Put multiple key-value pairs with one pipelined write per node."""
+        try:
+            encoded = {self._sanitize_key(k): v.encode("utf-8") for k, v in key_values.items()}
+            expiry = ttl if ttl is not None else self.default_ttl
+            self._record(sets=len(encoded))
+
+            # set_many returns the keys that failed (always none with noreply)
+            failed = self._fan_out(
+                list(encoded),
+                lambda client, node_keys: client.set_many(
+                    {key: encoded[key] for key in node_keys}, expire=expiry, noreply=self.noreply
+                )
+            )
+            return not any(failed)
+        except Exception as e:
+            logging.warning(f"Memcache batch_put error: {str(e)}")
+            self._record(errors=1)
+            return False
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get client-side counters plus the client settings."""
+        stats = super().get_stats()
+        stats["client"] = "pymemcache"
+        stats["noreply"] = self.noreply
+        return stats
@@ -0,0 +1,298 @@
+from typing import Optional, Dict, Any, List
+import logging
+import threading
+import time
+from urllib.parse import urlparse
+
+try:
+    import redis
+    from redis.cluster import RedisCluster
+    from redis.crc import key_slot
+
+    REDIS_AVAILABLE = True
+except ImportError:
+    REDIS_AVAILABLE = False
+
+from .base import CacheAdapter
+from .key_codec import KeyCodec
+from ..common import ConfigurationError
+
+
+class RedisCacheAdapter(CacheAdapter):
+    """
+    Redis and Redis Cluster cache adapter.
+
+    Batch reads are MGET and batch writes are one pipeline of SET EX
+    commands. On a cluster a multi-key command must stay within one hash
+    slot, and encoded keys are uniform digests, so almost every key has a
+    slot of its own: batch reads become a pipeline of single-key MGETs.
+    The saving there comes from the pipeline, which sends each node its
+    commands in one round trip, not from MGET. Connections come from a
+    bounded pool.
+    Optionally, RESP3 client-side caching keeps hot keys in process; the
+    server invalidates them when they change. Keys are encoded with the
+    same keyed digest as the memcache adapters, so originals never go on
+    the wire.
+    """
+
+    def __init__(
+            self,
+            url: Optional[str] = None,
+            host: str = "localhost",
+            port: int = 6379,
+            db: int = 0,
+            password: Optional[str] = None,
+            cluster: bool = False,
+            default_ttl: int = 3600,
+            max_connections: int = 50,
+            socket_timeout: Optional[float] = 0.5,
+            client_side_cache: bool = False,
+            client_cache_size: int = 10000,
+            key_namespace: str = "ra",
+            key_secret: Optional[str] = None
+    ):
+        """
+        Initialize the Redis adapter.
+
+        Args:
+            url: Redis URL (redis://, rediss://); takes precedence over host/port
+            host: Redis host
+            port: Redis port (default: 6379)
+            db: Database number (standalone only)
+            password: Redis password
+            cluster: Whether the server is a Redis Cluster
+            default_ttl: Default time-to-live in seconds; 0 or less never expires
+            max_connections: Maximum pooled connections (per node on a cluster)
+            socket_timeout: Seconds to wait on a socket read or write
+            client_side_cache: Whether to cache hot keys in process with
+                RESP3 tracking (Redis 6+)
+            client_cache_size: Maximum keys in the client-side cache
+            key_namespace: Prefix of every key this adapter writes
+            key_secret: Secret for the keyed key digest; share it between
+                processes that share the cache
+
+        Raises:
+            ConfigurationError: If the server cannot be reached
+        """
+        if not REDIS_AVAILABLE:
+            raise ImportError("Redis functionality requires the redis package")
+
+        if url:
+            parsed = urlparse(url)
+            host, port = parsed.hostname or host, parsed.port or port
+        self.host = host
+        self.port = port
+        self.cluster = cluster
+        self.default_ttl = default_ttl
+        self.client_side_cache = client_side_cache
+        self.key_codec = KeyCodec(namespace=key_namespace, secret=key_secret)
+
+        # Client-side counters, maintained on every operation
+        self._stats_lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._sets = 0
+        self._errors = 0
+        self._server_stats: Optional[Dict[str, Any]] = None
+        self._server_stats_time: Optional[float] = None
+
+        options: Dict[str, Any] = {
+            "password": password,
+            "socket_timeout": socket_timeout,
+            "decode_responses": True,
+            "max_connections": max_connections
+        }
+        if client_side_cache:
+            from redis.cache import CacheConfig
+            options["protocol"] = 3
+            options["cache_config"] = CacheConfig(max_size=client_cache_size)
+
+        # Each client owns a pool of at most max_connections connections (per node on a cluster)
+        if cluster:
+            if url:
+                self.client = RedisCluster.from_url(url, **options)
+            else:
+                self.client = RedisCluster(host=host, port=port, **options)
+        else:
+            if url:
+                self.client = redis.Redis.from_url(url, **options)
+            else:
+                self.client = redis.Redis(host=host, port=port, db=db, **options)
+
+        # Verify connection
+        if not self.health_check():
+            raise ConfigurationError("Could not connect to Redis")
+
+    def _record(self, hits: int = 0, misses: int = 0, sets: int = 0, errors: int = 0) -> None:
+        with self._stats_lock:
+            self._hits += hits
+            self._misses += misses
+            self._sets += sets
+            self._errors += errors
+
+    def _expiry(self, ttl: Optional[int]) -> Optional[int]:
+        """SET EX seconds for a TTL (None when the entry never expires)."""
+        if ttl is None:
+            ttl = self.default_ttl
+        return ttl if ttl > 0 else None
+
+    def _slot_groups(self, keys: List[str]) -> List[List[str]]:
+        """
+        Split keys into groups that may share one multi-key command.
+
+        On a cluster this is one group per hash slot. With digest keys,
+        groups of more than one key are rare once a batch is much smaller
+        than the 16384 slots.
+        """
+        if not self.cluster:
+            return [keys]
+        groups: Dict[int, List[str]] = {}
+        for key in keys:
+            groups.setdefault(key_slot(key.encode("utf-8")), []).append(key)
+        return list(groups.values())
+
+    def get(self, key: str) -> Optional[str]:
+        """Get a value from Redis."""
+        try:
+            value = self.client.get(self.key_codec.encode(key))
+            if value is None:
+                self._record(misses=1)
+                return None
+            self._record(hits=1)
+            return value
+        except Exception as e:
+            logging.warning(f"Redis get error: {str(e)}")
+            self._record(misses=1, errors=1)
+            return None
+
+    def put(self, key: str, value: str, ttl: Optional[int] = None) -> bool:
+        """Put a value in Redis."""
+        try:
+            self._record(sets=1)
+            return bool(self.client.set(self.key_codec.encode(key), value, ex=self._expiry(ttl)))
+        except Exception as e:
+            logging.warning(f"Redis put error: {str(e)}")
+            self._record(errors=1)
+            return False
+
+    def delete(self, key: str) -> bool:
+        """Delete a key from Redis."""
+        try:
+            return self.client.delete(self.key_codec.encode(key)) > 0
+        except Exception as e:
+            logging.warning(f"Redis delete error: {str(e)}")
+            return False
+
+    def clear(self) -> None:
+        """Clear all items from the Redis database (FLUSHDB)."""
+        try:
+            if self.cluster:
+                self.client.flushdb(target_nodes=RedisCluster.PRIMARIES)
+            else:
+                self.client.flushdb()
+        except Exception as e:
+            logging.warning(f"Redis clear error: {str(e)}")
+
+    def batch_get(self, keys: List[str]) -> Dict[str, str]:
+        """Get multiple keys with one MGET per hash slot."""
+        if not keys:
+            return {}
+        try:
+            encoded_to_original = {self.key_codec.encode(k): k for k in keys}
+            groups = self._slot_groups(list(encoded_to_original))
+
+            if len(groups) == 1:
+                replies = [self.client.mget(groups[0])]
+            else:
+                pipeline = self.client.pipeline(transaction=False)
+                for group in groups:
+                    pipeline.mget(group)
+                replies = pipeline.execute()
+
+            result = {}
+            for group, values in zip(groups, replies):
+                for encoded_key, value in zip(group, values):
+                    if value is not None:
+                        result[encoded_to_original[encoded_key]] = value
+
+            self._record(hits=len(result), misses=len(encoded_to_original) - len(result))
+            return result
+        except Exception as e:
+            logging.warning(f"Redis batch_get error: {str(e)}")
+            self._record(misses=len(keys), errors=1)
+            return {}
+
+    def batch_put(self, key_values: Dict[str, str], ttl: Optional[int] = None) -> bool:
+        """Put multiple key-value pairs with one pipeline of SET EX commands."""
+        if not key_values:
+            return True
+        try:
+            expiry = self._expiry(ttl)
+            encoded = {self.key_codec.encode(k): v for k, v in key_values.items()}
+            pipeline = self.client.pipeline(transaction=False)
+            for group in self._slot_groups(list(encoded)):
+                for key in group:
+                    pipeline.set(key, encoded[key], ex=expiry)
+            self._record(sets=len(encoded))
+            return all(pipeline.execute())
+        except Exception as e:
+            logging.warning(f"Redis batch_put error: {str(e)}")
+            self._record(errors=1)
+            return False
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get a snapshot of client-side counters without contacting the server.
+
+        Includes the last server statistics fetched by get_server_stats, if any.
+        """
+        with self._stats_lock:
+            hits, misses, sets, errors = self._hits, self._misses, self._sets, self._errors
+
+        lookups = hits + misses
+        return {
+            "type": "redis",
+            "host": self.host,
+            "port": self.port,
+            "cluster": self.cluster,
+            "client_side_cache": self.client_side_cache,
+            "default_ttl": self.default_ttl,
+            "hits": hits,
+            "misses": misses,
+            "hit_rate": hits / lookups if lookups else 0.0,
+            "sets": sets,
+            "errors": errors,
+            "server": self._server_stats,
+            "server_stats_age": (
+                time.time() - self._server_stats_time if self._server_stats_time is not None else None
+            )
+        }
+
+    def get_server_stats(self) -> Dict[str, Any]:
+        """Fetch statistics from Redis with INFO, summed over cluster nodes."""
+        fields = ("keyspace_hits", "keyspace_misses", "evicted_keys", "expired_keys", "used_memory")
+        try:
+            info = self.client.info()
+            # A cluster answers per node: {node: info}
+            nodes = info.values() if self.cluster else [info]
+            result = {field: sum(int(node.get(field, 0)) for node in nodes) for field in fields}
+        except Exception as e:
+            result = {"error": str(e)}
+
+        self._server_stats = result
+        self._server_stats_time = time.time()
+        return result
+
+    def close(self) -> None:
+        """Close pooled connections."""
+        try:
+            self.client.close()
+        except Exception:
+            pass
+
+    def health_check(self) -> bool:
+        """Check if Redis is available and working."""
+        try:
+            return bool(self.client.ping())
+        except Exception:
+            return False
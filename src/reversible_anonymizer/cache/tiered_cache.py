@@ -0,0 +1,130 @@
+from typing import Optional, Dict, Any, List
+import threading
+
+from .base import CacheAdapter
+
+
+class TieredCacheAdapter(CacheAdapter):
+    """
+    Two-tier cache: a small in-process L1 in front of a shared L2.
+
+    Reads are read-through: L1 first, then L2 for the misses, copying L2
+    hits into L1. Writes are write-through to both tiers. An optional short
+    L1 TTL bounds how long this process can serve an entry that another
+    process deleted or replaced in L2. Hits are counted per tier.
+    """
+
+    def __init__(self, l1: CacheAdapter, l2: CacheAdapter, l1_ttl: Optional[int] = None):
+        """
+        Initialize the tiered cache.
+
+        Args:
+            l1: Near cache, typically a MemoryCacheAdapter
+            l2: Shared cache, typically a MemcacheAdapter
+            l1_ttl: Maximum L1 time-to-live in seconds (default: the L1 adapter's TTL)
+        """
+        self.l1 = l1
+        self.l2 = l2
+        self.l1_ttl = l1_ttl
+        self.blocking = l1.blocking or l2.blocking
+
+        self._stats_lock = threading.Lock()
+        self._l1_hits = 0
+        self._l2_hits = 0
+        self._misses = 0
+
+    def _record(self, l1_hits: int = 0, l2_hits: int = 0, misses: int = 0) -> None:
+        with self._stats_lock:
+            self._l1_hits += l1_hits
+            self._l2_hits += l2_hits
+            self._misses += misses
+
+    def _near_ttl(self, ttl: Optional[int]) -> Optional[int]:
+        """L1 TTL for a write with the given TTL: never longer than l1_ttl."""
+        if self.l1_ttl is None:
+            return ttl
+        if ttl is None or ttl <= 0:
+            return self.l1_ttl
+        return min(ttl, self.l1_ttl)
+
+    def get(self, key: str) -> Optional[str]:
+        """Get a value from L1, falling back to L2."""
+        value = self.l1.get(key)
+        if value is not None:
+            self._record(l1_hits=1)
+            return value
+
+        value = self.l2.get(key)
+        if value is None:
+            self._record(misses=1)
+            return None
+
+        self._record(l2_hits=1)
+        self.l1.put(key, value, self.l1_ttl)
+        return value
+
+    def put(self, key: str, value: str, ttl: Optional[int] = None) -> bool:
+        """Write a value through to both tiers."""
+        stored = self.l2.put(key, value, ttl)
+        self.l1.put(key, value, self._near_ttl(ttl))
+        return stored
+
+    def delete(self, key: str) -> bool:
+        """Delete a key from both tiers."""
+        near = self.l1.delete(key)
+        shared = self.l2.delete(key)
+        return near or shared
+
+    def clear(self) -> None:
+        """Clear both tiers."""
+        self.l1.clear()
+        self.l2.clear()
+
+    def batch_get(self, keys: List[str]) -> Dict[str, str]:
+        """Get multiple keys, asking L2 only for the L1 misses."""
+        result = self.l1.batch_get(keys)
+        missing = [key for key in keys if key not in result]
+        if not missing:
+            self._record(l1_hits=len(result))
+            return result
+
+        found = self.l2.batch_get(missing)
+        if found:
+            self.l1.batch_put(found, self.l1_ttl)
+            result.update(found)
+        self._record(l1_hits=len(result) - len(found), l2_hits=len(found), misses=len(missing) - len(found))
+        return result
+
+    def batch_put(self, key_values: Dict[str, str], ttl: Optional[int] = None) -> bool:
+        """Write multiple key-value pairs through to both tiers."""
+        stored = self.l2.batch_put(key_values, ttl)
+        self.l1.batch_put(key_values, self._near_ttl(ttl))
+        return stored
+
+    def close(self) -> None:
+        """Release resources held by either tier."""
+        for tier in (self.l1, self.l2):
+            close = getattr(tier, "close", None)
+            if close is not None:
+                close()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get per-tier hit counters and the statistics of each tier."""
+        with self._stats_lock:
+            l1_hits, l2_hits, misses = self._l1_hits, self._l2_hits, self._misses
+        lookups = l1_hits + l2_hits + misses
+        return {
+            "type": "tiered",
+            "l1_hits": l1_hits,
+            "l2_hits": l2_hits,
+            "misses": misses,
+            "l1_hit_rate": l1_hits / lookups if lookups else 0.0,
+            "hit_rate": (l1_hits + l2_hits) / lookups if lookups else 0.0,
+            "l1_ttl": self.l1_ttl,
+            "l1": self.l1.get_stats(),
+            "l2": self.l2.get_stats()
+        }
+
+    def health_check(self) -> bool:
+        """Check that both tiers are available."""
+        return self.l1.health_check() and self.l2.health_check()
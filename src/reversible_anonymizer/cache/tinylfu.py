@@ -0,0 +1,65 @@
+from typing import Hashable, List
+
+_ROWS = 4
+_MAX_COUNT = 15
+# Translation table halving every counter at once during aging
+_HALVE = bytes(count >> 1 for count in range(256))
+
+
+class FrequencySketch:
+    """
+    Count-min sketch of recent access frequencies, as used by TinyLFU.
+
+    Four rows of small saturating counters (0-15) estimate how often a key
+    was seen; the estimate is the minimum over the rows, so it may overcount
+    on collisions but never undercounts. After a sample of accesses ten times
+    the expected number of entries, every counter is halved, so the sketch
+    favours recent popularity over all-time popularity.
+    """
+
+    __slots__ = ("_table", "_width", "_additions", "_sample_size")
+
+    def __init__(self, expected_entries: int):
+        """
+        Initialize the sketch.
+
+        Args:
+            expected_entries: Approximate number of entries the cache holds
+        """
+        expected_entries = max(16, expected_entries)
+        self._width = 1 << (expected_entries - 1).bit_length()
+        self._table = bytearray(self._width * _ROWS)
+        self._additions = 0
+        self._sample_size = 10 * expected_entries
+
+    def _indexes(self, key: Hashable) -> List[int]:
+        """Counter positions of a key, one per row (double hashing)."""
+        h = hash(key)
+        first = h & 0xFFFFFFFF
+        step = ((h >> 32) & 0xFFFFFFFF) | 1
+        width = self._width
+        mask = width - 1
+        return [
+            (first & mask),
+            width + ((first + step) & mask),
+            2 * width + ((first + 2 * step) & mask),
+            3 * width + ((first + 3 * step) & mask),
+        ]
+
+    def increment(self, key: Hashable) -> None:
+        """Record one access to a key."""
+        table = self._table
+        for index in self._indexes(key):
+            if table[index] < _MAX_COUNT:
+                table[index] += 1
+
+        self._additions += 1
+        if self._additions >= self._sample_size:
+            self._table = table.translate(_HALVE)
+            self._additions //= 2
+
+    def frequency(self, key: Hashable) -> int:
+        """Estimated number of recent accesses to a key."""
+        table = self._table
+        a, b, c, d = self._indexes(key)
+        return min(table[a], table[b], table[c], table[d])
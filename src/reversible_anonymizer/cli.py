@@ -16,6 +16,7 @@ from reversible_anonymizer import (
     DeAnonymizationError,
     ConfigurationError
 )
+from reversible_anonymizer.detection.chunking import DEFAULT_STREAM_CHUNK_SIZE, DEFAULT_STREAM_OVERLAP
 
 
 def list_info_types(args) -> int:
@@ -79,13 +80,6 @@ def list_info_types(args) -> int:
 def anonymize_text(args) -> int:
     """Anonymize text from input file or stdin."""
     try:
-        # Read input text
-        if args.input == "-":
-            input_text = sys.stdin.read()
-        else:
-            with open(args.input, 'r', encoding='utf-8') as file:
-                input_text = file.read()
-
         # Parse info types if specified
         info_types = None
         if args.info_types:
@@ -98,6 +92,17 @@ def anonymize_text(args) -> int:
             mode="tolerant" if args.tolerant else "strict"
         )
 
+        # Plain output is streamed so large files are never loaded whole
+        if not args.json:
+            return anonymize_stream(anonymizer, args)
+
+        # Read input text
+        if args.input == "-":
+            input_text = sys.stdin.read()
+        else:
+            with open(args.input, 'r', encoding='utf-8') as file:
+                input_text = file.read()
+
         # Process text
         result = anonymizer.anonymize(input_text, detailed_result=args.json)
 
@@ -120,6 +125,22 @@ def anonymize_text(args) -> int:
         return 1
 
 
+def anonymize_stream(anonymizer: ReversibleAnonymizer, args) -> int:
+    """Anonymize input to output chunk by chunk."""
+    input_file = sys.stdin if args.input == "-" else open(args.input, 'r', encoding='utf-8')
+    output_file = sys.stdout if not args.output else open(args.output, 'w', encoding='utf-8')
+    try:
+        # Without --overlap, keep the default look-ahead below small chunk sizes
+        overlap = args.overlap if args.overlap is not None else min(DEFAULT_STREAM_OVERLAP, args.chunk_size // 2)
+        anonymizer.anonymize_file(input_file, output_file, chunk_size=args.chunk_size, overlap=overlap)
+    finally:
+        if input_file is not sys.stdin:
+            input_file.close()
+        if output_file is not sys.stdout:
+            output_file.close()
+    return 0
+
+
 def deanonymize_text(args) -> int:
     """De-anonymize text from input file or stdin."""
     try:
@@ -186,6 +207,11 @@ def main() -> int:
                                   help="Return detailed JSON result")
     anonymize_parser.add_argument("--tolerant", action="store_true",
                                   help="Continue despite errors")
+    anonymize_parser.add_argument("--chunk-size", type=int, default=DEFAULT_STREAM_CHUNK_SIZE,
+                                  help="Characters inspected per request when streaming")
+    anonymize_parser.add_argument("--overlap", type=int,
+                                  help="Characters of look-ahead past each streamed chunk "
+                                       f"(default: {DEFAULT_STREAM_OVERLAP}, at most half the chunk size)")
 
     # De-anonymize command
     deanonymize_parser = subparsers.add_parser("deanonymize",
@@ -3,6 +3,9 @@ import os
 from typing import Dict, Any, List
 from .infotypes.catalog import InfoTypeCatalog
 from .common import AnonymizerMode
+from .detection.base import LIKELIHOODS
+from .detection.local_detector import SUPPORTED_INFO_TYPES as LOCAL_INFO_TYPES
+from .cache.memory_cache import POLICIES as CACHE_POLICIES
 
 
 class AnonymizerConfig:
@@ -25,6 +28,9 @@ class AnonymizerConfig:
         if cache_type == "memory":
             cache_config["capacity"] = int(os.environ.get("ANONYMIZER_CACHE_CAPACITY", "1000"))
             cache_config["ttl"] = int(os.environ.get("ANONYMIZER_CACHE_TTL", "3600"))
+            if os.environ.get("ANONYMIZER_CACHE_MAX_BYTES"):
+                cache_config["max_bytes"] = int(os.environ["ANONYMIZER_CACHE_MAX_BYTES"])
+            cache_config["policy"] = os.environ.get("ANONYMIZER_CACHE_POLICY", "lru").lower()
         elif cache_type == "memcache":
             cache_config["host"] = os.environ.get("ANONYMIZER_MEMCACHE_HOST")
             cache_config["port"] = int(os.environ.get("ANONYMIZER_MEMCACHE_PORT", "11211"))
@@ -35,6 +41,74 @@ class AnonymizerConfig:
             cache_config["node_cpu"] = int(os.environ.get("ANONYMIZER_MEMCACHE_CPU", "1"))
             cache_config["node_memory_gb"] = int(os.environ.get("ANONYMIZER_MEMCACHE_MEMORY", "1"))
             cache_config["ttl"] = int(os.environ.get("ANONYMIZER_CACHE_TTL", "3600"))
+            cache_config["client"] = os.environ.get("ANONYMIZER_MEMCACHE_CLIENT", "python-memcached").lower()
+            if os.environ.get("ANONYMIZER_MEMCACHE_SERVERS"):
+                cache_config["servers"] = os.environ["ANONYMIZER_MEMCACHE_SERVERS"].split(",")
+        elif cache_type == "redis":
+            cache_config["url"] = os.environ.get("ANONYMIZER_REDIS_URL")
+            cache_config["host"] = os.environ.get("ANONYMIZER_REDIS_HOST", "localhost")
+            cache_config["port"] = int(os.environ.get("ANONYMIZER_REDIS_PORT", "6379"))
+            cache_config["cluster"] = os.environ.get("ANONYMIZER_REDIS_CLUSTER", "false").lower() == "true"
+            cache_config["client_side_cache"] = (
+                os.environ.get("ANONYMIZER_REDIS_CLIENT_CACHE", "false").lower() == "true"
+            )
+            cache_config["ttl"] = int(os.environ.get("ANONYMIZER_CACHE_TTL", "3600"))
+
+        if cache_type in ("memcache", "redis"):
+            if os.environ.get("ANONYMIZER_CACHE_KEY_SECRET"):
+                cache_config["key_secret"] = os.environ["ANONYMIZER_CACHE_KEY_SECRET"]
+            if os.environ.get("ANONYMIZER_NEAR_CACHE_CAPACITY"):
+                cache_config["near_cache"] = {
+                    "capacity": int(os.environ["ANONYMIZER_NEAR_CACHE_CAPACITY"]),
+                    "ttl": int(os.environ.get("ANONYMIZER_NEAR_CACHE_TTL", "60"))
+                }
+
+        # Detection cache configuration
+        detection_cache_config = None
+        if os.environ.get("ANONYMIZER_DETECTION_CACHE"):
+            detection_cache_config = {
+                "type": os.environ.get("ANONYMIZER_DETECTION_CACHE").lower(),
+                "capacity": int(os.environ.get("ANONYMIZER_DETECTION_CACHE_CAPACITY", "10000")),
+                "ttl": int(os.environ.get("ANONYMIZER_DETECTION_CACHE_TTL", "3600"))
+            }
+            if detection_cache_config["type"] in ("memcache", "redis"):
+                detection_cache_config.update({k: v for k, v in cache_config.items() if k != "ttl"})
+
+        # Bloom filter of stored originals
+        originals_filter = None
+        if os.environ.get("ANONYMIZER_ORIGINALS_FILTER", "false").lower() == "true":
+            originals_filter = {
+                "expected_items": int(os.environ.get("ANONYMIZER_ORIGINALS_FILTER_ITEMS", "1000000")),
+                "false_positive_rate": float(os.environ.get("ANONYMIZER_ORIGINALS_FILTER_FP_RATE", "0.001")),
+                "path": os.environ.get("ANONYMIZER_ORIGINALS_FILTER_PATH"),
+                "secret": os.environ.get("ANONYMIZER_ORIGINALS_FILTER_SECRET"),
+                "single_writer": os.environ.get("ANONYMIZER_ORIGINALS_FILTER_SINGLE_WRITER", "false").lower() == "true"
+            }
+
+        # Write-behind buffer for mapping writes
+        write_behind = None
+        if os.environ.get("ANONYMIZER_WRITE_BEHIND", "false").lower() == "true":
+            write_behind = {
+                "max_batch_size": int(os.environ.get("ANONYMIZER_WRITE_BEHIND_BATCH_SIZE", "500")),
+                "flush_interval": float(os.environ.get("ANONYMIZER_WRITE_BEHIND_INTERVAL", "0.05")),
+                "max_pending": int(os.environ.get("ANONYMIZER_WRITE_BEHIND_MAX_PENDING", "10000")),
+                "max_retries": int(os.environ.get("ANONYMIZER_WRITE_BEHIND_RETRIES", "5")),
+                "wal_path": os.environ.get("ANONYMIZER_WRITE_BEHIND_WAL")
+            }
+
+        # Index of fake values searched by deanonymize
+        fake_data_index = {
+            "max_size": int(os.environ.get("ANONYMIZER_FAKE_DATA_INDEX_SIZE", "100000")),
+            "refresh_interval": float(os.environ.get("ANONYMIZER_FAKE_DATA_REFRESH_INTERVAL", "60"))
+        }
+
+        # Firestore storage options
+        storage_config = {
+            "read_chunk_size": int(os.environ.get("ANONYMIZER_FIRESTORE_READ_CHUNK_SIZE", "100")),
+            "max_concurrent_reads": int(os.environ.get("ANONYMIZER_FIRESTORE_CONCURRENT_READS", "8"))
+        }
+        if os.environ.get("ANONYMIZER_BLIND_INDEX_KEY"):
+            storage_config["blind_index_key"] = os.environ["ANONYMIZER_BLIND_INDEX_KEY"]
 
         return {
             "project": os.environ.get("ANONYMIZER_PROJECT"),
@@ -44,6 +118,7 @@ class AnonymizerConfig:
             "location": os.environ.get("ANONYMIZER_LOCATION", "global"),
             "mode": os.environ.get("ANONYMIZER_MODE", "strict"),
             "storage_type": os.environ.get("ANONYMIZER_STORAGE_TYPE", "firestore"),
+            "storage_config": storage_config,
             "encryption_key": os.environ.get("ANONYMIZER_ENCRYPTION_KEY"),
             "use_realistic_fake_data": os.environ.get("ANONYMIZER_USE_REALISTIC_FAKE_DATA", "true").lower() == "true",
             "faker_seed": int(os.environ.get("ANONYMIZER_FAKER_SEED")) if os.environ.get(
@@ -51,8 +126,15 @@ class AnonymizerConfig:
             "faker_locale": os.environ.get("ANONYMIZER_FAKER_LOCALE", "").split(",") if os.environ.get(
                 "ANONYMIZER_FAKER_LOCALE") else None,
             "async_storage_updates": os.environ.get("ANONYMIZER_ASYNC_STORAGE", "false").lower() == "true",
+            "detector": os.environ.get("ANONYMIZER_DETECTOR", "dlp").lower(),
+            "min_likelihood": os.environ.get("ANONYMIZER_MIN_LIKELIHOOD", "POSSIBLE").upper(),
+            "max_concurrent_dlp_calls": int(os.environ.get("ANONYMIZER_MAX_CONCURRENT_DLP_CALLS", "100")),
             "cache_type": cache_type,
-            "cache_config": cache_config
+            "cache_config": cache_config,
+            "detection_cache_config": detection_cache_config,
+            "originals_filter": originals_filter,
+            "write_behind": write_behind,
+            "fake_data_index": fake_data_index
         }
 
     @classmethod
@@ -91,17 +173,91 @@ class AnonymizerConfig:
         if storage_type not in valid_storage_types:
             errors.append(f"Invalid storage_type: {storage_type}. Must be one of {valid_storage_types}")
 
+        # Validate Firestore read tuning
+        storage_config = config.get("storage_config") or {}
+        for field in ("read_chunk_size", "max_concurrent_reads"):
+            value = storage_config.get(field, 1)
+            if not isinstance(value, int) or value < 1:
+                errors.append(f"storage_config {field} must be a positive integer")
+
         # Validate cache_type
-        valid_cache_types = ["memory", "memcache"]
+        valid_cache_types = ["memory", "memcache", "redis"]
         cache_type = config.get("cache_type", "memory")
         if cache_type not in valid_cache_types:
             errors.append(f"Invalid cache_type: {cache_type}. Must be one of {valid_cache_types}")
 
+        # Validate memory cache eviction policy
+        cache_policy = (config.get("cache_config") or {}).get("policy", "lru")
+        if cache_type == "memory" and cache_policy not in CACHE_POLICIES:
+            errors.append(f"Invalid cache policy: {cache_policy}. Must be one of {list(CACHE_POLICIES)}")
+
+        # Validate originals filter sizing
+        originals_filter = config.get("originals_filter")
+        if originals_filter is not None:
+            expected_items = originals_filter.get("expected_items", 1000000)
+            if not isinstance(expected_items, int) or expected_items < 1:
+                errors.append("originals_filter expected_items must be a positive integer")
+            false_positive_rate = originals_filter.get("false_positive_rate", 0.001)
+            if not isinstance(false_positive_rate, (int, float)) or not 0 < false_positive_rate < 1:
+                errors.append("originals_filter false_positive_rate must be between 0 and 1")
+
+        # Validate write-behind buffer limits
+        write_behind = config.get("write_behind")
+        if write_behind is not None:
+            for field in ("max_batch_size", "max_pending"):
+                value = write_behind.get(field, 1)
+                if not isinstance(value, int) or value < 1:
+                    errors.append(f"write_behind {field} must be a positive integer")
+            max_retries = write_behind.get("max_retries", 5)
+            if not isinstance(max_retries, int) or max_retries < 0:
+                errors.append("write_behind max_retries must be a non-negative integer")
+
+        # Validate fake data index bound
+        fake_data_index = config.get("fake_data_index") or {}
+        max_size = fake_data_index.get("max_size", 100000)
+        if not isinstance(max_size, int) or max_size < 1:
+            errors.append("fake_data_index max_size must be a positive integer")
+
+        # Validate async concurrency limit
+        max_concurrent_dlp_calls = config.get("max_concurrent_dlp_calls", 100)
+        if not isinstance(max_concurrent_dlp_calls, int) or max_concurrent_dlp_calls < 1:
+            errors.append("max_concurrent_dlp_calls must be a positive integer")
+
+        # Validate detection cache configuration
+        detection_cache_config = config.get("detection_cache_config")
+        if detection_cache_config is not None:
+            if not isinstance(detection_cache_config, dict):
+                errors.append("detection_cache_config must be a dictionary")
+            elif detection_cache_config.get("type", "memory") not in valid_cache_types:
+                errors.append(
+                    f"Invalid detection cache type: {detection_cache_config.get('type')}. "
+                    f"Must be one of {valid_cache_types}"
+                )
+
+        # Validate detector
+        valid_detectors = ["hybrid", "dlp", "local"]
+        detector = config.get("detector", "dlp")
+        if isinstance(detector, str) and detector not in valid_detectors:
+            errors.append(f"Invalid detector: {detector}. Must be one of {valid_detectors}")
+
+        if detector == "local":
+            for info_type in info_types:
+                name = info_type["name"] if isinstance(info_type, dict) else info_type
+                if isinstance(name, str) and name not in LOCAL_INFO_TYPES:
+                    errors.append(f"Info type {name} is not supported by the local detector")
+
+        # Validate min_likelihood
+        min_likelihood = config.get("min_likelihood", "POSSIBLE")
+        if min_likelihood not in LIKELIHOODS:
+            errors.append(f"Invalid min_likelihood: {min_likelihood}. Must be one of {LIKELIHOODS}")
+
         # Validate memcache configuration if used
         if cache_type == "memcache":
             cache_config = config.get("cache_config", {})
-            if not (cache_config.get("host") or cache_config.get("instance_id")):
-                errors.append("Memcache requires either host or instance_id to be specified")
+            if not (cache_config.get("servers") or cache_config.get("host") or cache_config.get("instance_id")):
+                errors.append("Memcache requires servers, host or instance_id to be specified")
+            if cache_config.get("client", "python-memcached") not in ("python-memcached", "pymemcache"):
+                errors.append(f"Invalid memcache client: {cache_config.get('client')}. Must be one of ['python-memcached', 'pymemcache']")
 
         # Validate numeric fields
         try:
@@ -0,0 +1,24 @@
+"""Detection engines for locating sensitive data in text."""
+from .base import Detector
+from .cached_detector import CachedDetector
+from .chunking import find_boundary, select_window_findings
+from .batch import inspect_batch, pack_texts, split_findings, PackedContent
+from .dlp_detector import DlpDetector
+from .hybrid_detector import HybridDetector
+from .local_detector import LocalDetector
+from .offsets import OffsetIndex
+
+__all__ = [
+    "Detector",
+    "CachedDetector",
+    "DlpDetector",
+    "HybridDetector",
+    "LocalDetector",
+    "OffsetIndex",
+    "inspect_batch",
+    "pack_texts",
+    "split_findings",
+    "PackedContent",
+    "find_boundary",
+    "select_window_findings"
+]
@@ -0,0 +1,65 @@
+from abc import ABC, abstractmethod
+from typing import Any, Dict, List, Optional, Sequence
+import asyncio
+
+from ..models import Finding
+from .batch import DEFAULT_MAX_REQUEST_BYTES
+
+# DLP likelihood names in increasing order of confidence
+LIKELIHOODS = ["VERY_UNLIKELY", "UNLIKELY", "POSSIBLE", "LIKELY", "VERY_LIKELY"]
+
+
+class Detector(ABC):
+    """Base interface for engines that locate sensitive data in text."""
+
+    @abstractmethod
+    def inspect(self, text: str) -> List[Finding]:
+        """Find sensitive data in a single text."""
+        pass
+
+    @abstractmethod
+    def supports(self, info_type: str) -> bool:
+        """Check if this detector can detect the given info type."""
+        pass
+
+    def inspect_batch(
+            self,
+            texts: Sequence[str],
+            max_workers: int = 5,
+            raise_on_error: bool = True,
+            max_request_bytes: int = DEFAULT_MAX_REQUEST_BYTES
+    ) -> List[Optional[List[Finding]]]:
+        """
+        Find sensitive data in many texts.
+
+        Returns findings for each text in input order. When raise_on_error is
+        False, texts whose detection failed get None.
+        """
+        results: List[Optional[List[Finding]]] = []
+        for text in texts:
+            try:
+                results.append(self.inspect(text) if text else [])
+            except Exception:
+                if raise_on_error:
+                    raise
+                results.append(None)
+        return results
+
+    async def inspect_async(self, text: str) -> List[Finding]:
+        """
+        Find sensitive data in a single text from asyncio code.
+
+        The default runs inspect on the event loop's executor; detectors with
+        native async clients override this.
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, self.inspect, text)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get detector statistics."""
+        return {"type": type(self).__name__}
+
+
+def likelihood_at_least(likelihood: str, minimum: str) -> bool:
+    """Check if a likelihood name meets a minimum likelihood name."""
+    return LIKELIHOODS.index(likelihood) >= LIKELIHOODS.index(minimum)
@@ -0,0 +1,164 @@
+"""Batched inspection: pack many texts into a small number of DLP requests."""
+from bisect import bisect_right
+from typing import Callable, Dict, List, NamedTuple, Optional, Sequence, Tuple
+import concurrent.futures
+
+from ..models import Finding
+from .offsets import utf8_length
+
+# DLP rejects inspect_content requests over 0.5 MB; leave headroom for the
+# inspect config and request envelope.
+DEFAULT_MAX_REQUEST_BYTES = 480_000
+
+# Placed between packed texts so no finding can join tokens from two texts.
+SEPARATOR = "\n\x1e\n"
+
+InspectFn = Callable[[str], Tuple[List[Finding], bool]]
+
+
+class PackedContent(NamedTuple):
+    """Several texts joined into a single content item."""
+    content: str
+    indices: List[int]  # Position of each text in the original batch
+    starts: List[int]   # Character offset of each text within content
+    ends: List[int]
+
+
+def pack_texts(
+        texts: Sequence[str],
+        indices: Optional[Sequence[int]] = None,
+        max_request_bytes: int = DEFAULT_MAX_REQUEST_BYTES,
+        separator: str = SEPARATOR
+) -> List[PackedContent]:
+    """
+    Group texts into content items that each fit the request-size budget.
+
+    The budget is in UTF-8 bytes, as DLP counts them; offsets are character
+    offsets, matching findings. A text larger than the budget is packed on
+    its own. Empty texts are skipped.
+
+    Args:
+        texts: The full batch of texts
+        indices: Positions in texts to pack (default: all)
+        max_request_bytes: Maximum encoded size of one content item
+        separator: String placed between consecutive texts
+
+    Returns:
+        List of packed content items
+    """
+    if indices is None:
+        indices = range(len(texts))
+
+    separator_bytes = utf8_length(separator)
+    packs = []
+    parts: List[str] = []
+    pack_indices: List[int] = []
+    starts: List[int] = []
+    ends: List[int] = []
+    offset = 0
+    pack_bytes = 0
+
+    for index in indices:
+        text = texts[index]
+        if not text:
+            continue
+        size = utf8_length(text)
+
+        if parts and pack_bytes + separator_bytes + size > max_request_bytes:
+            packs.append(PackedContent(separator.join(parts), pack_indices, starts, ends))
+            parts, pack_indices, starts, ends = [], [], [], []
+            offset = 0
+            pack_bytes = 0
+
+        if parts:
+            offset += len(separator)
+            pack_bytes += separator_bytes
+        parts.append(text)
+        pack_indices.append(index)
+        starts.append(offset)
+        ends.append(offset + len(text))
+        offset += len(text)
+        pack_bytes += size
+
+    if parts:
+        packs.append(PackedContent(separator.join(parts), pack_indices, starts, ends))
+
+    return packs
+
+
+def split_findings(packed: PackedContent, findings: List[Finding]) -> Dict[int, List[Finding]]:
+    """
+    Map findings on packed content back to the texts they came from.
+
+    Offsets are rebased onto each source text. Findings that straddle a
+    separator belong to no single text and are dropped.
+    """
+    result: Dict[int, List[Finding]] = {index: [] for index in packed.indices}
+    for finding in findings:
+        position = bisect_right(packed.starts, finding.start) - 1
+        if position < 0 or finding.end > packed.ends[position]:
+            continue
+        base = packed.starts[position]
+        result[packed.indices[position]].append(
+            finding._replace(start=finding.start - base, end=finding.end - base)
+        )
+    return result
+
+
+def inspect_batch(
+        texts: Sequence[str],
+        inspect_fn: InspectFn,
+        max_request_bytes: int = DEFAULT_MAX_REQUEST_BYTES,
+        max_workers: int = 5,
+        raise_on_error: bool = True
+) -> List[Optional[List[Finding]]]:
+    """
+    Inspect many texts with as few requests as the size budget allows.
+
+    Packed requests run concurrently on a bounded thread pool. If a response
+    reports truncated findings, the pack is split in half and re-inspected so
+    no text silently loses findings.
+
+    Args:
+        texts: Texts to inspect
+        inspect_fn: Callable inspecting one content string, returning
+            (findings, truncated)
+        max_request_bytes: Maximum encoded size of one request
+        max_workers: Maximum number of concurrent requests
+        raise_on_error: Re-raise request failures; otherwise the affected
+            texts get None instead of a findings list
+
+    Returns:
+        Findings for each text, in input order
+    """
+    results: List[Optional[List[Finding]]] = [[] for _ in texts]
+
+    def inspect_pack(packed: PackedContent) -> Dict[int, List[Finding]]:
+        findings, truncated = inspect_fn(packed.content)
+        if not truncated or len(packed.indices) == 1:
+            return split_findings(packed, findings)
+
+        middle = len(packed.indices) // 2
+        mapped = {}
+        for half in (packed.indices[:middle], packed.indices[middle:]):
+            for sub_pack in pack_texts(texts, half, max_request_bytes):
+                mapped.update(inspect_pack(sub_pack))
+        return mapped
+
+    packs = pack_texts(texts, max_request_bytes=max_request_bytes)
+    if not packs:
+        return results
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(packs)))) as executor:
+        future_to_pack = {executor.submit(inspect_pack, packed): packed for packed in packs}
+        for future in concurrent.futures.as_completed(future_to_pack):
+            try:
+                for index, findings in future.result().items():
+                    results[index] = findings
+            except Exception:
+                if raise_on_error:
+                    raise
+                for index in future_to_pack[future].indices:
+                    results[index] = None
+
+    return results
@@ -0,0 +1,194 @@
+from typing import Any, Dict, List, Optional, Sequence
+import hashlib
+import json
+import threading
+
+from ..cache.base import CacheAdapter
+from ..cache.async_cache import as_async_cache
+from ..models import Finding
+from .base import Detector
+from .batch import DEFAULT_MAX_REQUEST_BYTES, pack_texts
+from .offsets import utf8_length
+
+
+class CachedDetector(Detector):
+    """
+    Detector wrapper that caches findings per text.
+
+    Keys are a digest of the text combined with a fingerprint of the
+    detection settings, so identical payloads (templated notifications,
+    retries, duplicates) are inspected only once. Values are a compact JSON
+    list of findings; quotes are omitted whenever they can be recovered from
+    the text by offset.
+    """
+
+    def __init__(
+            self,
+            detector: Detector,
+            cache: CacheAdapter,
+            info_types: List[str],
+            min_likelihood: str = "POSSIBLE",
+            ttl: Optional[int] = None
+    ):
+        """
+        Initialize the cached detector.
+
+        Args:
+            detector: Detector to call on cache misses
+            cache: Cache adapter holding serialized findings
+            info_types: Info type names the findings were produced for
+            min_likelihood: Minimum likelihood the findings were produced for
+            ttl: Time-to-live for cached findings (default: the cache default)
+        """
+        self.detector = detector
+        self.cache = cache
+        self.async_cache = as_async_cache(cache)
+        self.ttl = ttl
+
+        # The trailing marker versions the offset unit (character offsets)
+        settings = ",".join(sorted(set(info_types))) + "|" + min_likelihood + "|chars"
+        self._fingerprint = hashlib.blake2b(settings.encode("utf-8"), digest_size=6).hexdigest()
+
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._bytes_saved = 0
+        self._requests_avoided = 0
+
+    @property
+    def info_types(self) -> List[str]:
+        """Info types detected by the wrapped detector."""
+        return getattr(self.detector, "info_types", [])
+
+    def _key(self, text: str) -> str:
+        """Build the cache key for a text."""
+        digest = hashlib.blake2b(text.encode("utf-8"), digest_size=20).hexdigest()
+        return f"det:{self._fingerprint}:{digest}"
+
+    @staticmethod
+    def _encode(text: str, findings: List[Finding]) -> str:
+        """Serialize findings, dropping quotes recoverable from the text."""
+        rows = []
+        for finding in findings:
+            row = [finding.info_type, finding.start, finding.end, finding.likelihood]
+            if text[finding.start:finding.end] != finding.quote:
+                row.append(finding.quote)
+            rows.append(row)
+        return json.dumps(rows, separators=(",", ":"))
+
+    @staticmethod
+    def _decode(text: str, value: str) -> List[Finding]:
+        """Rebuild findings from their serialized form."""
+        findings = []
+        for row in json.loads(value):
+            info_type, start, end, likelihood = row[:4]
+            quote = row[4] if len(row) > 4 else text[start:end]
+            findings.append(Finding(info_type, quote, start, end, likelihood))
+        return findings
+
+    def _record(self, hits: int, misses: int, bytes_saved: int, requests_avoided: int) -> None:
+        with self._lock:
+            self._hits += hits
+            self._misses += misses
+            self._bytes_saved += bytes_saved
+            self._requests_avoided += requests_avoided
+
+    def supports(self, info_type: str) -> bool:
+        """Check if the wrapped detector supports the info type."""
+        return self.detector.supports(info_type)
+
+    def inspect(self, text: str) -> List[Finding]:
+        """Return cached findings, inspecting the text only on a miss."""
+        key = self._key(text)
+        cached = self.cache.get(key)
+        if cached is not None:
+            self._record(1, 0, utf8_length(text), 1)
+            return self._decode(text, cached)
+
+        self._record(0, 1, 0, 0)
+        findings = self.detector.inspect(text)
+        self.cache.put(key, self._encode(text, findings), self.ttl)
+        return findings
+
+    async def inspect_async(self, text: str) -> List[Finding]:
+        """Return cached findings, awaiting the wrapped detector only on a miss."""
+        key = self._key(text)
+        cached = await self.async_cache.get(key)
+        if cached is not None:
+            self._record(1, 0, utf8_length(text), 1)
+            return self._decode(text, cached)
+
+        self._record(0, 1, 0, 0)
+        findings = await self.detector.inspect_async(text)
+        await self.async_cache.put(key, self._encode(text, findings), self.ttl)
+        return findings
+
+    def inspect_batch(
+            self,
+            texts: Sequence[str],
+            max_workers: int = 5,
+            raise_on_error: bool = True,
+            max_request_bytes: int = DEFAULT_MAX_REQUEST_BYTES
+    ) -> List[Optional[List[Finding]]]:
+        """Serve cached texts from the cache and inspect each distinct miss once."""
+        results: List[Optional[List[Finding]]] = [[] for _ in texts]
+        keys = {i: self._key(text) for i, text in enumerate(texts) if text}
+        cached = self.cache.batch_get(list(set(keys.values())))
+
+        hits = 0
+        bytes_saved = 0
+        missing: Dict[str, List[int]] = {}  # Key -> indices of texts with that key
+        for index, key in keys.items():
+            if key in cached:
+                results[index] = self._decode(texts[index], cached[key])
+                hits += 1
+                bytes_saved += utf8_length(texts[index])
+            else:
+                missing.setdefault(key, []).append(index)
+
+        # Texts are packed into shared requests, so hits avoid fewer requests
+        # than texts: compare the requests for the whole batch with those sent
+        requests = len(pack_texts(texts, max_request_bytes=max_request_bytes))
+        first_indices = [indices[0] for indices in missing.values()]
+        requests_sent = len(pack_texts([texts[i] for i in first_indices],
+                                       max_request_bytes=max_request_bytes))
+
+        if missing:
+            inspected = self.detector.inspect_batch(
+                [texts[i] for i in first_indices],
+                max_workers=max_workers,
+                raise_on_error=raise_on_error,
+                max_request_bytes=max_request_bytes
+            )
+
+            to_cache = {}
+            for (key, indices), findings in zip(missing.items(), inspected):
+                for index in indices:
+                    results[index] = list(findings) if findings is not None else None
+                if findings is not None:
+                    to_cache[key] = self._encode(texts[indices[0]], findings)
+                    # Duplicates within the batch are served by the first inspection
+                    hits += len(indices) - 1
+                    bytes_saved += (len(indices) - 1) * utf8_length(texts[indices[0]])
+            if to_cache:
+                self.cache.batch_put(to_cache, self.ttl)
+
+        self._record(hits, len(missing), bytes_saved, requests - requests_sent)
+        return results
+
+    def get_cache_stats(self) -> Dict[str, Any]:
+        """Get detection cache effectiveness counters."""
+        lookups = self._hits + self._misses
+        return {
+            "hits": self._hits,
+            "misses": self._misses,
+            "hit_rate": self._hits / lookups if lookups else 0.0,
+            "bytes_saved": self._bytes_saved,
+            "dlp_calls_avoided": self._requests_avoided
+        }
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get statistics of the wrapped detector and the cache."""
+        stats = self.detector.get_stats()
+        stats["detection_cache"] = self.get_cache_stats()
+        return stats
@@ -0,0 +1,66 @@
+from typing import List, Sequence, Tuple
+
+from ..models import Finding
+
+# Characters per streamed window; with the overlap even four-byte characters
+# keep a window under the DLP request size limit
+DEFAULT_STREAM_CHUNK_SIZE = 100_000
+
+# Characters of look-ahead past each window cut so entities spanning the cut
+# are detected whole
+DEFAULT_STREAM_OVERLAP = 1_000
+
+
+def find_boundary(text: str, limit: int) -> int:
+    """
+    Find a safe position at or before limit to cut text.
+
+    Prefers the last line break, then the last whitespace in the second half
+    of the window, and cuts hard at limit only when neither exists.
+    """
+    if len(text) <= limit:
+        return len(text)
+
+    floor = limit // 2
+    for separator in ("\n", " ", "\t"):
+        position = text.rfind(separator, floor, limit)
+        if position != -1:
+            return position + 1
+    return limit
+
+
+def select_window_findings(
+        findings: Sequence[Finding],
+        cut: int,
+        window_length: int,
+        complete: bool
+) -> Tuple[List[Finding], int]:
+    """
+    Pick the findings a streamed window owns and how much of it to emit.
+
+    Findings starting before the cut belong to this window, and emission
+    extends to the end of the last of them. Findings starting in the overlap
+    are dropped because the next window, which starts where this one stops
+    emitting, finds them again. A finding that runs into the end of an
+    incomplete window may be truncated, so the cut moves back to its start.
+
+    Args:
+        findings: Findings located in the window text
+        cut: Preferred number of characters to emit
+        window_length: Length of the inspected window including the overlap
+        complete: Whether the window ends at the end of the stream
+
+    Returns:
+        Tuple of (owned findings, number of characters to emit)
+    """
+    if not complete:
+        for finding in findings:
+            if 0 < finding.start < cut and finding.end >= window_length:
+                cut = finding.start
+
+    owned = [
+        finding for finding in findings
+        if finding.start < cut and (complete or finding.end < window_length or finding.start == 0)
+    ]
+    emit_end = max([cut] + [finding.end for finding in owned])
+    return owned, emit_end
@@ -0,0 +1,190 @@
+from typing import List, Optional, Sequence, Tuple, Any, Dict
+import asyncio
+import threading
+from google.cloud import dlp_v2
+
+from ..models import Finding
+from .base import Detector
+from .batch import inspect_batch, DEFAULT_MAX_REQUEST_BYTES
+from .offsets import OffsetIndex, utf8_length
+
+
+class DlpDetector(Detector):
+    """Detector backed by the Google Cloud DLP inspect_content API."""
+
+    def __init__(
+            self,
+            project: str,
+            info_types: List[str],
+            location: str = "global",
+            min_likelihood: str = "POSSIBLE",
+            client: Optional[Any] = None,
+            async_client: Optional[Any] = None,
+            max_concurrent_requests: int = 100
+    ):
+        """
+        Initialize the DLP detector.
+
+        Args:
+            project: Google Cloud project ID
+            info_types: Names of the info types to detect
+            location: Google Cloud location
+            min_likelihood: Minimum likelihood name for reported findings
+            client: Existing DlpServiceClient (created on first use if not provided)
+            async_client: Existing DlpServiceAsyncClient (created on first async use)
+            max_concurrent_requests: Maximum in-flight requests from async callers
+        """
+        self.project = project
+        self.location = location
+        self.info_types = list(info_types)
+        self.min_likelihood = min_likelihood
+        self._client = client
+        self._async_client = async_client
+        self.max_concurrent_requests = max_concurrent_requests
+        self._semaphores: Dict[Any, asyncio.Semaphore] = {}
+
+        # Request accounting
+        self._lock = threading.Lock()
+        self._requests = 0
+        self._bytes_inspected = 0
+
+    @property
+    def parent(self) -> str:
+        """Resource name that DLP requests are issued against."""
+        return f"projects/{self.project}/locations/{self.location}"
+
+    def _inspect_config(self) -> Any:
+        """Build the inspect configuration for a request."""
+        return dlp_v2.InspectConfig(
+            info_types=[dlp_v2.InfoType(name=name) for name in self.info_types],
+            include_quote=True,
+            min_likelihood=dlp_v2.Likelihood[self.min_likelihood]
+        )
+
+    def supports(self, info_type: str) -> bool:
+        """DLP detects every info type in the catalog."""
+        return True
+
+    def inspect_content(self, content: str) -> Tuple[List[Finding], bool]:
+        """
+        Run a single DLP inspect request.
+
+        Returns:
+            Tuple of (findings, whether DLP truncated the findings list)
+        """
+        if not self.info_types:
+            return [], False
+
+        self._count_request(content)
+        response = self.client.inspect_content(request=self._request(content))
+        return self._parse_response(response, content)
+
+    def _request(self, content: str) -> Dict[str, Any]:
+        """Build an inspect request for the content."""
+        return {"parent": self.parent,
+                "inspect_config": self._inspect_config(),
+                "item": dlp_v2.ContentItem(value=content)}
+
+    def _count_request(self, content: str) -> None:
+        with self._lock:
+            self._requests += 1
+            self._bytes_inspected += utf8_length(content)
+
+    def _parse_response(self, response: Any, content: str) -> Tuple[List[Finding], bool]:
+        """
+        Convert a DLP inspect response into findings.
+
+        Finding offsets are character offsets into content. DLP's codepoint
+        range is used when present; otherwise the UTF-8 byte range is
+        translated through an index built once for the content.
+        """
+        findings = []
+        index = None
+        for finding in response.result.findings:
+            location = finding.location
+            if location.codepoint_range.end > location.codepoint_range.start:
+                start = location.codepoint_range.start
+                end = location.codepoint_range.end
+            else:
+                if index is None:
+                    index = OffsetIndex(content)
+                start = index.to_char(location.byte_range.start)
+                end = index.to_char(location.byte_range.end)
+
+            findings.append(Finding(
+                info_type=finding.info_type.name,
+                quote=finding.quote,
+                start=start,
+                end=end,
+                likelihood=dlp_v2.Likelihood(finding.likelihood).name
+            ))
+        return findings, bool(response.result.findings_truncated)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get request statistics."""
+        return {
+            "type": "dlp",
+            "info_types": list(self.info_types),
+            "requests": self._requests,
+            "bytes_inspected": self._bytes_inspected
+        }
+
+    @property
+    def client(self) -> Any:
+        """DLP client, created on first use so a failure surfaces as an inspect error."""
+        if self._client is None:
+            self._client = dlp_v2.DlpServiceClient()
+        return self._client
+
+    @property
+    def async_client(self) -> Any:
+        """Async DLP client, created on first use inside the event loop."""
+        if self._async_client is None:
+            self._async_client = dlp_v2.DlpServiceAsyncClient()
+        return self._async_client
+
+    def _semaphore(self) -> asyncio.Semaphore:
+        """Semaphore bounding in-flight requests on the running event loop."""
+        loop = asyncio.get_running_loop()
+        semaphore = self._semaphores.get(loop)
+        if semaphore is None:
+            # Drop semaphores of closed loops so they do not accumulate
+            self._semaphores = {other: s for other, s in self._semaphores.items() if not other.is_closed()}
+            semaphore = self._semaphores[loop] = asyncio.Semaphore(self.max_concurrent_requests)
+        return semaphore
+
+    async def inspect_content_async(self, content: str) -> Tuple[List[Finding], bool]:
+        """Run a single DLP inspect request with the async client."""
+        if not self.info_types:
+            return [], False
+
+        async with self._semaphore():
+            self._count_request(content)
+            response = await self.async_client.inspect_content(request=self._request(content))
+        return self._parse_response(response, content)
+
+    async def inspect_async(self, text: str) -> List[Finding]:
+        """Find sensitive data in a single text without blocking the event loop."""
+        findings, _ = await self.inspect_content_async(text)
+        return findings
+
+    def inspect(self, text: str) -> List[Finding]:
+        """Find sensitive data in a single text with one DLP request."""
+        findings, _ = self.inspect_content(text)
+        return findings
+
+    def inspect_batch(
+            self,
+            texts: Sequence[str],
+            max_workers: int = 5,
+            raise_on_error: bool = True,
+            max_request_bytes: int = DEFAULT_MAX_REQUEST_BYTES
+    ) -> List[Optional[List[Finding]]]:
+        """Find sensitive data in many texts using packed DLP requests."""
+        return inspect_batch(
+            texts,
+            self.inspect_content,
+            max_request_bytes=max_request_bytes,
+            max_workers=max_workers,
+            raise_on_error=raise_on_error
+        )
@@ -0,0 +1,137 @@
+from typing import Any, Dict, List, Optional, Sequence
+import threading
+
+from ..models import Finding
+from ..replacement import remove_overlaps
+from .base import Detector
+from .batch import DEFAULT_MAX_REQUEST_BYTES
+from .local_detector import LocalDetector, SUPPORTED_INFO_TYPES as LOCAL_INFO_TYPES
+
+# Info types whose values are always words, so text without letters
+# cannot contain them
+WORD_INFO_TYPES = frozenset([
+    "PERSON_NAME", "FIRST_NAME", "LAST_NAME", "LOCATION", "CITY", "COUNTRY",
+    "COUNTY", "CONTINENT", "LANDMARK", "NATIONALITY", "GENDER",
+    "MARRIAGE_STATUS", "MEDICAL_TERM", "MEDICAL_TREATMENT", "DIAGNOSIS",
+    "ORGANIZATION_NAME", "COMPANY_NAME", "ETHNIC_GROUP", "RACE", "RELIGION",
+    "POLITICAL_AFFILIATION", "DOCUMENT_TITLE"
+])
+
+
+class HybridDetector(Detector):
+    """
+    Detector that routes each info type to the cheapest capable engine.
+
+    Info types the local detector supports are found in-process; only the
+    remaining types are sent to the remote (DLP) detector, and the remote
+    call is skipped when no remote types are configured or the text is too
+    short to contain one. Findings of both engines are merged in position
+    order, dropping any that overlap an earlier, longer one.
+    """
+
+    def __init__(
+            self,
+            local: LocalDetector,
+            remote: Optional[Detector] = None,
+            min_remote_text_length: int = 2
+    ):
+        """
+        Initialize the hybrid detector.
+
+        Args:
+            local: Detector for structured, pattern-detectable info types
+            remote: Detector for the remaining info types (None if there are none)
+            min_remote_text_length: Shortest text worth sending to the remote detector
+        """
+        self.local = local
+        self.remote = remote
+        self.remote_info_types = list(getattr(remote, "info_types", []) or [])
+        self.min_remote_text_length = min_remote_text_length
+        self._needs_letters = bool(self.remote_info_types) and all(
+            info_type in WORD_INFO_TYPES for info_type in self.remote_info_types
+        )
+        self._lock = threading.Lock()
+        self._remote_skipped = 0
+
+    @classmethod
+    def split_info_types(cls, info_types: List[str]) -> Dict[str, List[str]]:
+        """Split info type names into those detected locally and remotely."""
+        return {
+            "local": [name for name in info_types if name in LOCAL_INFO_TYPES],
+            "remote": [name for name in info_types if name not in LOCAL_INFO_TYPES]
+        }
+
+    def supports(self, info_type: str) -> bool:
+        """Check if either engine can detect the info type."""
+        return self.local.supports(info_type) or (
+            self.remote is not None and self.remote.supports(info_type)
+        )
+
+    def _needs_remote(self, text: str) -> bool:
+        """Check if the text must be sent to the remote detector."""
+        if self.remote is None or not self.remote_info_types:
+            return False
+        if len(text.strip()) < self.min_remote_text_length:
+            return False
+        if self._needs_letters and not any(char.isalpha() for char in text):
+            return False
+        return True
+
+    def _count_skipped(self, count: int) -> None:
+        if self.remote is not None and count:
+            with self._lock:
+                self._remote_skipped += count
+
+    def inspect(self, text: str) -> List[Finding]:
+        """Find sensitive data locally, then remotely only when needed."""
+        findings = self.local.inspect(text)
+        if not self._needs_remote(text):
+            self._count_skipped(1)
+            return findings
+        return remove_overlaps(findings + self.remote.inspect(text))
+
+    async def inspect_async(self, text: str) -> List[Finding]:
+        """Find sensitive data locally, awaiting the remote detector only when needed."""
+        findings = self.local.inspect(text)
+        if not self._needs_remote(text):
+            self._count_skipped(1)
+            return findings
+        return remove_overlaps(findings + await self.remote.inspect_async(text))
+
+    def inspect_batch(
+            self,
+            texts: Sequence[str],
+            max_workers: int = 5,
+            raise_on_error: bool = True,
+            max_request_bytes: int = DEFAULT_MAX_REQUEST_BYTES
+    ) -> List[Optional[List[Finding]]]:
+        """Find sensitive data in many texts, sending only eligible texts remotely."""
+        results = self.local.inspect_batch(texts, raise_on_error=raise_on_error)
+
+        remote_indices = [i for i, text in enumerate(texts) if self._needs_remote(text)]
+        self._count_skipped(len(texts) - len(remote_indices))
+        if not remote_indices:
+            return results
+
+        remote_results = self.remote.inspect_batch(
+            [texts[i] for i in remote_indices],
+            max_workers=max_workers,
+            raise_on_error=raise_on_error,
+            max_request_bytes=max_request_bytes
+        )
+        for index, findings in zip(remote_indices, remote_results):
+            if findings is None or results[index] is None:
+                results[index] = None
+            else:
+                results[index] = remove_overlaps(results[index] + findings)
+        return results
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get routing statistics."""
+        return {
+            "type": "hybrid",
+            "local_info_types": list(self.local.info_types),
+            "remote_info_types": self.remote_info_types,
+            "remote_skipped": self._remote_skipped,
+            "remote": self.remote.get_stats() if self.remote is not None else None
+        }
@@ -0,0 +1,218 @@
+"""Offline detector for structured info types using patterns and checksums."""
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Tuple
+import ipaddress
+import re
+
+from ..common import InfoTypeNotSupportedError
+from ..models import Finding
+from .base import Detector, likelihood_at_least
+
+
+def luhn_valid(digits: str) -> bool:
+    """Check a digit string against the Luhn checksum."""
+    total = 0
+    for position, char in enumerate(reversed(digits)):
+        digit = ord(char) - 48
+        if position % 2 == 1:
+            digit *= 2
+            if digit > 9:
+                digit -= 9
+        total += digit
+    return total % 10 == 0
+
+
+# Expected IBAN length per country code
+IBAN_LENGTHS = {
+    "AD": 24, "AE": 23, "AL": 28, "AT": 20, "AZ": 28, "BA": 20, "BE": 16,
+    "BG": 22, "BH": 22, "BR": 29, "BY": 28, "CH": 21, "CR": 22, "CY": 28,
+    "CZ": 24, "DE": 22, "DK": 18, "DO": 28, "EE": 20, "EG": 29, "ES": 24,
+    "FI": 18, "FO": 18, "FR": 27, "GB": 22, "GE": 22, "GI": 23, "GL": 18,
+    "GR": 27, "GT": 28, "HR": 21, "HU": 28, "IE": 22, "IL": 23, "IQ": 23,
+    "IS": 26, "IT": 27, "JO": 30, "KW": 30, "KZ": 20, "LB": 28, "LC": 32,
+    "LI": 21, "LT": 20, "LU": 20, "LV": 21, "MC": 27, "MD": 24, "ME": 22,
+    "MK": 19, "MR": 27, "MT": 31, "MU": 30, "NL": 18, "NO": 15, "PK": 24,
+    "PL": 28, "PS": 29, "PT": 25, "QA": 29, "RO": 24, "RS": 22, "SA": 24,
+    "SC": 31, "SE": 24, "SI": 19, "SK": 24, "SM": 27, "ST": 25, "SV": 28,
+    "TL": 23, "TN": 24, "TR": 26, "UA": 29, "VA": 22, "VG": 24, "XK": 20
+}
+
+
+def iban_valid(value: str) -> bool:
+    """Check country length and ISO 13616 mod-97 checksum of an IBAN."""
+    compact = value.replace(" ", "")
+    if IBAN_LENGTHS.get(compact[:2]) != len(compact):
+        return False
+    rearranged = compact[4:] + compact[:4]
+    return int("".join(str(int(char, 36)) for char in rearranged)) % 97 == 1
+
+
+def _valid_credit_card(value: str) -> bool:
+    digits = re.sub(r"[ -]", "", value)
+    if not 13 <= len(digits) <= 19 or digits[0] not in "23456":
+        return False
+    # Separators, if any, must be used consistently
+    if " " in value and "-" in value:
+        return False
+    return luhn_valid(digits)
+
+
+def _valid_ssn(value: str) -> bool:
+    area, group, serial = re.split(r"[ -]", value)
+    return (
+        area not in ("000", "666") and not area.startswith("9")
+        and group != "00" and serial != "0000"
+    )
+
+
+def _valid_phone(value: str) -> bool:
+    return 10 <= sum(char.isdigit() for char in value) <= 15
+
+
+def _valid_ip(value: str) -> bool:
+    try:
+        ipaddress.ip_address(value)
+        return True
+    except ValueError:
+        return False
+
+
+def _valid_email(value: str) -> bool:
+    local = value.rpartition("@")[0]
+    return ".." not in value and not local.startswith(".") and not local.endswith(".")
+
+
+class PatternSpec(NamedTuple):
+    """Compiled pattern for one info type."""
+    info_type: str
+    pattern: "re.Pattern[str]"
+    validator: Optional[Callable[[str], bool]]
+    likelihood: str
+    # Substrings of which at least one must occur for a match to be possible
+    hints: Tuple[str, ...] = ()
+    needs_digit: bool = True
+
+
+PATTERNS = [
+    PatternSpec(
+        "EMAIL_ADDRESS",
+        re.compile(r"(?<![\w.%+-])[A-Za-z0-9._%+-]+@(?:[A-Za-z0-9-]+\.)+[A-Za-z]{2,24}(?![\w-])"),
+        _valid_email, "LIKELY", ("@",), needs_digit=False
+    ),
+    PatternSpec(
+        "URL",
+        re.compile(r"(?<![\w/])(?:(?:https?|ftp)://|www\.)[^\s<>\"'`]+[^\s<>\"'`.,;:!?)\]}]", re.IGNORECASE),
+        None, "LIKELY", ("://", "www.", "WWW."), needs_digit=False
+    ),
+    PatternSpec(
+        "CREDIT_CARD_NUMBER",
+        re.compile(r"(?<![\d-])\d(?:[ -]?\d){12,18}(?![\d-])"),
+        _valid_credit_card, "VERY_LIKELY"
+    ),
+    PatternSpec(
+        "US_SOCIAL_SECURITY_NUMBER",
+        re.compile(r"(?<![\d-])\d{3}([ -])\d{2}\1\d{4}(?![\d-])"),
+        _valid_ssn, "LIKELY"
+    ),
+    PatternSpec(
+        "PHONE_NUMBER",
+        re.compile(
+            r"(?<![\w+])(?:"
+            r"\+\d{1,3}(?:[ .-]?\(?\d{1,4}\)?){2,5}"
+            r"|(?:1[ .-]?)?(?:\(\d{3}\)|\d{3})[ .-]?\d{3}[ .-]?\d{4}"
+            r")(?![\w-])"
+        ),
+        _valid_phone, "LIKELY"
+    ),
+    PatternSpec(
+        "IP_ADDRESS",
+        re.compile(r"(?<![\w.])(?:\d{1,3}\.){3}\d{1,3}(?!\w|\.\d)"),
+        _valid_ip, "LIKELY", (".",)
+    ),
+    PatternSpec(
+        "IP_ADDRESS",
+        re.compile(r"(?<![\w:])(?:[0-9A-Fa-f]{0,4}:){2,7}[0-9A-Fa-f]{1,4}(?![\w:])"),
+        _valid_ip, "LIKELY", (":",)
+    ),
+    PatternSpec(
+        "MAC_ADDRESS",
+        re.compile(
+            r"(?<![\w:.-])(?:[0-9A-Fa-f]{2}([:-])(?:[0-9A-Fa-f]{2}\1){4}[0-9A-Fa-f]{2}"
+            r"|[0-9A-Fa-f]{4}\.[0-9A-Fa-f]{4}\.[0-9A-Fa-f]{4})(?![\w:-]|\.\w)"
+        ),
+        None, "LIKELY", (":", "-", ".")
+    ),
+    PatternSpec(
+        "IBAN_CODE",
+        re.compile(r"(?<![A-Za-z0-9])[A-Z]{2}\d{2}(?: ?[A-Z0-9]{4}){2,7}(?: ?[A-Z0-9]{1,3})?(?![A-Za-z0-9])"),
+        iban_valid, "VERY_LIKELY"
+    ),
+]
+
+_DIGIT = re.compile(r"\d")
+
+SUPPORTED_INFO_TYPES = frozenset(spec.info_type for spec in PATTERNS)
+
+
+class LocalDetector(Detector):
+    """
+    In-process detector for structured info types.
+
+    Uses compiled regular expressions plus validators (Luhn, IBAN mod-97,
+    SSN ranges, address parsing) so structured PII never leaves the process.
+    """
+
+    def __init__(self, info_types: Optional[List[str]] = None, min_likelihood: str = "POSSIBLE"):
+        """
+        Initialize the local detector.
+
+        Args:
+            info_types: Names of the info types to detect (default: all supported)
+            min_likelihood: Minimum likelihood name for reported findings
+        """
+        requested = list(info_types) if info_types is not None else sorted(SUPPORTED_INFO_TYPES)
+        unsupported = [name for name in requested if name not in SUPPORTED_INFO_TYPES]
+        if unsupported:
+            raise InfoTypeNotSupportedError(
+                f"Info types not supported by the local detector: {', '.join(unsupported)}"
+            )
+
+        self.info_types = requested
+        self.min_likelihood = min_likelihood
+        self._specs = [
+            spec for spec in PATTERNS
+            if spec.info_type in requested and likelihood_at_least(spec.likelihood, min_likelihood)
+        ]
+
+    def supports(self, info_type: str) -> bool:
+        """Check if the info type has a local pattern."""
+        return info_type in SUPPORTED_INFO_TYPES
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get detector statistics."""
+        return {"type": "local", "info_types": list(self.info_types)}
+
+    async def inspect_async(self, text: str) -> List[Finding]:
+        """Find structured sensitive data; cheap enough to run on the event loop."""
+        return self.inspect(text)
+
+    def inspect(self, text: str) -> List[Finding]:
+        """Find structured sensitive data in a single text."""
+        findings = []
+        has_digit = _DIGIT.search(text) is not None
+        for spec in self._specs:
+            if spec.needs_digit and not has_digit:
+                continue
+            if spec.hints and not any(hint in text for hint in spec.hints):
+                continue
+            for match in spec.pattern.finditer(text):
+                quote = match.group()
+                if spec.validator is not None and not spec.validator(quote):
+                    continue
+                findings.append(Finding(
+                    info_type=spec.info_type,
+                    quote=quote,
+                    start=match.start(),
+                    end=match.end(),
+                    likelihood=spec.likelihood
+                ))
+        return findings
@@ -0,0 +1,60 @@
+"""Translation of DLP UTF-8 byte offsets into Python string offsets."""
+from array import array
+from bisect import bisect_right
+import re
+
+_NON_ASCII = re.compile(r"[^\x00-\x7f]")
+
+
+class OffsetIndex:
+    """
+    Map UTF-8 byte offsets of a text to character offsets.
+
+    ASCII texts map offsets to themselves. Otherwise the index records, for
+    each non-ASCII character, the character and byte offsets just after it,
+    so a lookup is a binary search plus the distance from the preceding
+    multi-byte character. The index is built once per text without encoding
+    it.
+    """
+
+    __slots__ = ("_char_offsets", "_byte_offsets")
+
+    def __init__(self, text: str):
+        """
+        Build the index.
+
+        Args:
+            text: The text DLP inspected
+        """
+        self._char_offsets = None
+        self._byte_offsets = None
+        if text.isascii():
+            return
+
+        char_offsets = array("q")
+        byte_offsets = array("q")
+        extra = 0  # Bytes beyond one per character seen so far
+        for match in _NON_ASCII.finditer(text):
+            code_point = ord(match.group())
+            extra += 1 if code_point < 0x800 else 2 if code_point < 0x10000 else 3
+            position = match.end()
+            char_offsets.append(position)
+            byte_offsets.append(position + extra)
+        self._char_offsets = char_offsets
+        self._byte_offsets = byte_offsets
+
+    def to_char(self, byte_offset: int) -> int:
+        """Convert a UTF-8 byte offset into a character offset."""
+        if self._byte_offsets is None:
+            return byte_offset
+        position = bisect_right(self._byte_offsets, byte_offset) - 1
+        if position < 0:
+            return byte_offset
+        return self._char_offsets[position] + (byte_offset - self._byte_offsets[position])
+
+
+def utf8_length(text: str) -> int:
+    """Number of bytes in the UTF-8 encoding of text."""
+    if text.isascii():
+        return len(text)
+    return len(text.encode("utf-8"))
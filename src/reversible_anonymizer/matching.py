@@ -0,0 +1,287 @@
+"""Multi-pattern literal matching for locating known fake data in text."""
+from collections import OrderedDict, deque
+from typing import Iterable, List, Optional, Set, Tuple
+import threading
+
+# Words held by the automaton that takes additions, and the size ratio of
+# consecutive levels of a LiteralIndex
+_DELTA_SIZE = 256
+_GROWTH = 8
+
+
+class AhoCorasick:
+    """
+    Incremental Aho-Corasick automaton over literal strings.
+
+    Words can be added at any time; failure links are recomputed lazily on
+    the next search after an insertion. A search is a single pass over the
+    text and costs O(len(text) + matches) regardless of how many words the
+    automaton holds.
+    """
+
+    def __init__(self, words: Iterable[str] = ()):
+        """
+        Initialize the automaton.
+
+        Args:
+            words: Initial words to match
+        """
+        self._lock = threading.Lock()
+        self._goto = [{}]   # Node -> {character: child node}
+        self._fail = [0]    # Node -> longest proper suffix node
+        self._length = [0]  # Node -> length of the word ending here (0 if none)
+        self._link = [0]    # Node -> nearest suffix node ending a word (0 if none)
+        self._words = 0
+        self._dirty = False
+        for word in words:
+            self.add(word)
+
+    def add(self, word: str) -> bool:
+        """
+        Add a word to the automaton.
+
+        Returns:
+            True if the word was new
+        """
+        if not word:
+            return False
+
+        with self._lock:
+            node = 0
+            for char in word:
+                child = self._goto[node].get(char)
+                if child is None:
+                    child = len(self._goto)
+                    # Extend all node tables together so concurrent searches
+                    # never see a node without its entries
+                    self._fail.append(0)
+                    self._length.append(0)
+                    self._link.append(0)
+                    self._goto.append({})
+                    self._goto[node][char] = child
+                node = child
+
+            if self._length[node]:
+                return False
+            self._length[node] = len(word)
+            self._words += 1
+            self._dirty = True
+            return True
+
+    def update(self, words: Iterable[str]) -> int:
+        """Add several words; returns the number of new words."""
+        return sum(1 for word in words if self.add(word))
+
+    def __len__(self) -> int:
+        """Return the number of words in the automaton."""
+        return self._words
+
+    def _build(self) -> None:
+        """Recompute failure and output links breadth-first."""
+        with self._lock:
+            if not self._dirty:
+                return
+            goto, fail, length, link = self._goto, self._fail, self._length, self._link
+
+            queue = deque()
+            for child in goto[0].values():
+                fail[child] = 0
+                link[child] = 0
+                queue.append(child)
+
+            while queue:
+                node = queue.popleft()
+                for char, child in goto[node].items():
+                    state = fail[node]
+                    while state and char not in goto[state]:
+                        state = fail[state]
+                    suffix = goto[state].get(char, 0)
+                    fail[child] = suffix
+                    link[child] = suffix if length[suffix] else link[suffix]
+                    queue.append(child)
+
+            self._dirty = False
+
+    def find_all(self, text: str) -> List[Tuple[int, int]]:
+        """
+        Find every occurrence of every word in text.
+
+        Returns:
+            List of (start, end) character ranges, overlapping matches included
+        """
+        if not self._words:
+            return []
+        if self._dirty:
+            self._build()
+
+        goto, fail, length, link = self._goto, self._fail, self._length, self._link
+        matches = []
+        node = 0
+        for end, char in enumerate(text, 1):
+            while node and char not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(char, 0)
+
+            output = node if length[node] else link[node]
+            while output:
+                matches.append((end - length[output], end))
+                output = link[output]
+        return matches
+
+
+class LiteralIndex:
+    """
+    Bounded set of literal strings found in one pass per level over a text.
+
+    Words are spread over a few Aho-Corasick automata, like the levels of a
+    log-structured merge tree. Additions go to a small delta automaton, so
+    a search after an addition only rebuilds the delta's links. A full
+    delta is merged into the first level, and a level that outgrows its
+    capacity (each is _GROWTH times the previous) into the next one, so an
+    addition costs O(log n) amortized and a search O(len(text) * levels).
+
+    With max_size, the least recently added or matched words are evicted.
+    An evicted word stays in its automaton until the next merge drops it,
+    and matches of it are discarded; once evicted words outnumber live
+    ones, every level is rebuilt from the live words.
+    """
+
+    def __init__(self, max_size: Optional[int] = None, words: Iterable[str] = ()):
+        """
+        Initialize the index.
+
+        Args:
+            max_size: Maximum number of words held (None for no limit)
+            words: Initial words to match
+        """
+        self.max_size = max_size
+        self._lock = threading.Lock()
+        self._live: "OrderedDict[str, None]" = OrderedDict()  # Least recently used first
+        self._indexed: Set[str] = set()  # Words held by an automaton, evicted ones included
+        self._delta = AhoCorasick()
+        self._delta_words: List[str] = []
+        self._levels: Tuple[Optional[Tuple[AhoCorasick, List[str]]], ...] = ()
+        self.evictions = 0
+        self.update(words)
+
+    def add(self, word: str) -> bool:
+        """
+        Add a word, or mark a known one as recently used.
+
+        Returns:
+            True if the word was new
+        """
+        if not word:
+            return False
+        with self._lock:
+            return self._add_locked(word)
+
+    def update(self, words: Iterable[str]) -> int:
+        """Add several words; returns the number of new words."""
+        with self._lock:
+            return sum(1 for word in words if word and self._add_locked(word))
+
+    def __len__(self) -> int:
+        """Return the number of live words."""
+        return len(self._live)
+
+    def __contains__(self, word: str) -> bool:
+        return word in self._live
+
+    def _add_locked(self, word: str) -> bool:
+        live = self._live
+        if word in live:
+            live.move_to_end(word)
+            return False
+
+        live[word] = None
+        if word not in self._indexed:
+            self._indexed.add(word)
+            self._delta.add(word)
+            self._delta_words.append(word)
+            if len(self._delta_words) >= _DELTA_SIZE:
+                self._merge_delta()
+
+        if self.max_size is not None:
+            while len(live) > self.max_size:
+                live.popitem(last=False)
+                self.evictions += 1
+            if len(self._indexed) - len(live) > max(_DELTA_SIZE, len(live)):
+                self._compact()
+        return True
+
+    def _prune(self, words: List[str]) -> List[str]:
+        """Keep the live words, forgetting that evicted ones are indexed."""
+        kept = []
+        for word in words:
+            if word in self._live:
+                kept.append(word)
+            else:
+                self._indexed.discard(word)
+        return kept
+
+    @staticmethod
+    def _level(words: List[str]) -> Optional[Tuple[AhoCorasick, List[str]]]:
+        """Automaton over words with its links built, so searches never build it."""
+        if not words:
+            return None
+        automaton = AhoCorasick(words)
+        automaton._build()
+        return automaton, words
+
+    def _merge_delta(self) -> None:
+        """Move the delta's words into the levels, carrying full levels upward."""
+        carry = self._prune(self._delta_words)
+        levels = list(self._levels)
+        level = 0
+        while True:
+            if level == len(levels):
+                levels.append(None)
+            if levels[level] is not None:
+                carry = self._prune(levels[level][1]) + carry
+                levels[level] = None
+            if len(carry) <= _DELTA_SIZE * _GROWTH ** (level + 1):
+                levels[level] = self._level(carry)
+                break
+            level += 1
+        self._levels = tuple(levels)
+        self._delta = AhoCorasick()
+        self._delta_words = []
+
+    def _compact(self) -> None:
+        """Rebuild the levels from the live words only."""
+        words = list(self._live)
+        self._indexed = set(words)
+        level = 0
+        while len(words) > _DELTA_SIZE * _GROWTH ** (level + 1):
+            level += 1
+        self._levels = (None,) * level + (self._level(words),)
+        self._delta = AhoCorasick()
+        self._delta_words = []
+
+    def find_all(self, text: str) -> List[Tuple[int, int]]:
+        """
+        Find every occurrence of every live word in text; matched words become recently used.
+
+        Returns:
+            Sorted list of (start, end) character ranges, overlapping matches included
+        """
+        with self._lock:
+            automata = [level[0] for level in self._levels if level is not None]
+            automata.append(self._delta)
+
+        spans = set()
+        for automaton in automata:
+            spans.update(automaton.find_all(text))
+        if not spans:
+            return []
+
+        matches = []
+        with self._lock:
+            live = self._live
+            for start, end in sorted(spans):
+                word = text[start:end]
+                if word in live:
+                    live.move_to_end(word)
+                    matches.append((start, end))
+        return matches
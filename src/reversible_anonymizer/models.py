@@ -1,4 +1,4 @@
-from typing import Optional, Dict, Any, Tuple, TypedDict, List
+from typing import Optional, Dict, Any, Tuple, TypedDict, List, NamedTuple
 from collections import OrderedDict
 import time
 
@@ -11,6 +11,23 @@ class AnonymizationResult(TypedDict):
     run_id: str
 
 
+class Finding(NamedTuple):
+    """A single sensitive-data finding within an inspected text."""
+    info_type: str
+    quote: str
+    start: int
+    end: int
+    likelihood: str
+
+
+class MappingPlan(NamedTuple):
+    """Fake data resolved for one anonymization run and the writes it needs."""
+    original_to_fake_map: Dict[str, str]
+    new_mappings: List[Tuple[str, str, Dict[str, Any]]]  # (fake, original, metadata)
+    name_parts: Dict[str, str]  # Original name part -> fake name part
+    run_id: str
+
+
 class LRUCache:
     """LRU (Least Recently Used) cache implementation."""
 
@@ -26,9 +43,16 @@ class LRUCache:
         self.ttl = ttl
         self.cache: OrderedDict[Any, Tuple[Any, float]] = OrderedDict()
 
+        # Counters maintained on every operation
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
     def get(self, key: Any) -> Optional[Any]:
         """Get a value from the cache."""
         if key not in self.cache:
+            self.misses += 1
             return None
 
         value, timestamp = self.cache[key]
@@ -36,10 +60,13 @@ class LRUCache:
         # Check if item has expired
         if time.time() - timestamp > self.ttl:
             self.cache.pop(key)
+            self.expirations += 1
+            self.misses += 1
             return None
 
         # Move to end (most recently used)
         self.cache.move_to_end(key)
+        self.hits += 1
         return value
 
     def put(self, key: Any, value: Any) -> None:
@@ -49,6 +76,7 @@ class LRUCache:
         elif len(self.cache) >= self.capacity:
             # Remove least recently used item
             self.cache.popitem(last=False)
+            self.evictions += 1
 
         self.cache[key] = (value, time.time())
 
@@ -68,22 +96,16 @@ class LRUCache:
         return len(self.cache)
 
     def get_stats(self) -> Dict[str, Any]:
-        """Get cache statistics."""
-        valid_items = 0
-        expired_items = 0
-
-        current_time = time.time()
-        for _, (_, timestamp) in self.cache.items():
-            if current_time - timestamp <= self.ttl:
-                valid_items += 1
-            else:
-                expired_items += 1
-
+        """Get cache statistics from the maintained counters."""
+        lookups = self.hits + self.misses
         return {
             "total_items": len(self.cache),
-            "valid_items": valid_items,
-            "expired_items": expired_items,
             "capacity": self.capacity,
             "ttl": self.ttl,
-            "usage_percent": (len(self.cache) / self.capacity) * 100 if self.capacity > 0 else 0
+            "usage_percent": (len(self.cache) / self.capacity) * 100 if self.capacity > 0 else 0,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "evictions": self.evictions,
+            "expirations": self.expirations
         }
\ No newline at end of file
@@ -0,0 +1,79 @@
+"""Linear-time application of text replacements."""
+from typing import Any, Iterable, List, NamedTuple, Tuple, TypeVar
+
+T = TypeVar("T")
+
+
+class Replacement(NamedTuple):
+    """Replace text[start:end] with text."""
+    start: int
+    end: int
+    text: str
+
+
+class SpanMap(NamedTuple):
+    """Where a replaced source range ended up in the output text."""
+    source_start: int
+    source_end: int
+    output_start: int
+    output_end: int
+
+
+def remove_overlaps(spans: Iterable[T]) -> List[T]:
+    """
+    Sort spans by position and drop those overlapping an earlier one.
+
+    Spans are any objects with start and end attributes (half-open ranges).
+    When two spans start together the longer one wins, matching the order
+    findings are ranked in. Runs in one sort plus one sweep.
+    """
+    kept = []
+    last_end = -1
+    for span in sorted(spans, key=lambda s: (s.start, -s.end)):
+        if span.start < last_end:
+            continue
+        kept.append(span)
+        last_end = span.end
+    return kept
+
+
+def apply_replacements(text: str, replacements: Iterable[Any]) -> Tuple[str, List[SpanMap]]:
+    """
+    Apply replacements to text in a single pass.
+
+    Overlapping replacements are dropped as in remove_overlaps. The output is
+    assembled from slices of the source joined once, so the cost is linear in
+    the text length plus the number of replacements.
+
+    Args:
+        text: Source text
+        replacements: Objects with start, end and text attributes (e.g. Replacement)
+
+    Returns:
+        Tuple of (output text, span map of every applied replacement in order)
+    """
+    pieces = []
+    span_map = []
+    source_position = 0
+    output_position = 0
+
+    for replacement in remove_overlaps(replacements):
+        if replacement.start > source_position:
+            pieces.append(text[source_position:replacement.start])
+            output_position += replacement.start - source_position
+
+        pieces.append(replacement.text)
+        span_map.append(SpanMap(
+            replacement.start,
+            replacement.end,
+            output_position,
+            output_position + len(replacement.text)
+        ))
+        output_position += len(replacement.text)
+        source_position = replacement.end
+
+    if not span_map:
+        return text, span_map
+
+    pieces.append(text[source_position:])
+    return "".join(pieces), span_map
@@ -2,10 +2,14 @@
 from .base import StorageAdapter, MemoryAdapter
 from .firestore_adapter import FirestoreAdapter
 from .secure_firestore_adapter import SecureFirestoreAdapter
+from .originals_filter import OriginalsFilter
+from .write_behind import WriteBehindBuffer
 
 __all__ = [
     "StorageAdapter",
     "MemoryAdapter",
     "FirestoreAdapter",
-    "SecureFirestoreAdapter"
+    "SecureFirestoreAdapter",
+    "OriginalsFilter",
+    "WriteBehindBuffer"
 ]
\ No newline at end of file
@@ -1,11 +1,25 @@
 from abc import ABC, abstractmethod
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Callable, Tuple, Iterator
+import asyncio
+import functools
+import json
+import threading
 import time
 
+# A mapping to store: (fake_data, original_data, metadata)
+MappingRecord = Tuple[str, str, Optional[Dict[str, Any]]]
+
 
 class StorageAdapter(ABC):
     """Base storage adapter for anonymization mappings."""
 
+    # Whether calls may block on I/O (async callers run blocking adapters in a thread)
+    blocking: bool = True
+
+    # Whether claim_mapping_records keeps one mapping per original across
+    # concurrent writers
+    atomic_claims: bool = False
+
     @abstractmethod
     def store_mapping(self, fake_data: str, original_data: str, metadata: Optional[Dict[str, Any]] = None) -> None:
         """Store a mapping between fake and original data."""
@@ -41,13 +55,99 @@ class StorageAdapter(ABC):
         """Retrieve fake data for given original values efficiently."""
         pass
 
+    def batch_store_mapping_records(self, records: List[MappingRecord]) -> None:
+        """
+        Store mappings that each carry their own metadata.
+
+        The default stores each group of records with equal metadata through
+        batch_store_mappings; adapters that can write mixed metadata in one
+        commit override this.
+        """
+        groups: Dict[str, Tuple[Dict[str, str], Optional[Dict[str, Any]]]] = {}
+        for fake_data, original_data, metadata in records:
+            group_key = json.dumps(metadata, sort_keys=True, default=str)
+            groups.setdefault(group_key, ({}, metadata))[0][fake_data] = original_data
+        for mappings, metadata in groups.values():
+            self.batch_store_mappings(mappings, metadata)
+
+    def claim_mapping_records(self, records: List[MappingRecord]) -> Dict[str, str]:
+        """
+        Store records whose original has no mapping yet.
+
+        Records whose original is already mapped are not written. The
+        default looks the originals up first, so two writers can still both
+        store a mapping for the same original; adapters that set
+        atomic_claims create the mapping only if the original is unclaimed.
+
+        Returns:
+            Fake data already stored for the originals that had a mapping
+        """
+        existing = self.batch_get_fake_data_for_originals([original for _, original, _ in records])
+        self.batch_store_mapping_records([record for record in records if record[1] not in existing])
+        return existing
+
+    def iter_mappings(self, page_size: int = 1000,
+                      created_since: Optional[float] = None) -> Iterator[Dict[str, str]]:
+        """
+        Yield all mappings (fake -> original) in pages.
+
+        With created_since (a Unix timestamp), adapters that record creation
+        times yield only mappings created at or after it; others may yield
+        more. The default yields get_all_mappings() as a single page; adapters
+        backed by a remote store override this to bound memory.
+        """
+        yield self.get_all_mappings()
+
+    # Async variants. Adapters with native async clients override these; the
+    # defaults run the synchronous method inline or on the default executor.
+
+    async def _run_async(self, method: Callable[..., Any], *args: Any) -> Any:
+        if not self.blocking:
+            return method(*args)
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, functools.partial(method, *args))
+
+    async def store_mapping_async(self, fake_data: str, original_data: str,
+                                  metadata: Optional[Dict[str, Any]] = None) -> None:
+        """Store a mapping between fake and original data."""
+        await self._run_async(self.store_mapping, fake_data, original_data, metadata)
+
+    async def batch_store_mappings_async(self, mappings: Dict[str, str],
+                                         metadata: Optional[Dict[str, Any]] = None) -> None:
+        """Store multiple mappings efficiently."""
+        await self._run_async(self.batch_store_mappings, mappings, metadata)
+
+    async def batch_store_mapping_records_async(self, records: List[MappingRecord]) -> None:
+        """Store mappings that each carry their own metadata."""
+        await self._run_async(self.batch_store_mapping_records, records)
+
+    async def claim_mapping_records_async(self, records: List[MappingRecord]) -> Dict[str, str]:
+        """Store records whose original has no mapping yet."""
+        return await self._run_async(self.claim_mapping_records, records)
+
+    async def batch_get_originals_async(self, fake_data_list: List[str]) -> Dict[str, str]:
+        """Retrieve multiple original values efficiently."""
+        return await self._run_async(self.batch_get_originals, fake_data_list)
+
+    async def get_all_mappings_async(self, limit: Optional[int] = None) -> Dict[str, str]:
+        """Retrieve all mappings."""
+        return await self._run_async(self.get_all_mappings, limit)
+
+    async def batch_get_fake_data_for_originals_async(self, original_data_list: List[str]) -> Dict[str, str]:
+        """Retrieve fake data for given original values efficiently."""
+        return await self._run_async(self.batch_get_fake_data_for_originals, original_data_list)
+
 
 class MemoryAdapter(StorageAdapter):
     """In-memory storage adapter for testing."""
 
+    blocking = False
+    atomic_claims = True
+
     def __init__(self):
         """Initialize the in-memory storage."""
         self.mappings: Dict[str, Dict[str, Any]] = {}
+        self._claim_lock = threading.Lock()
 
     def store_mapping(self, fake_data: str, original_data: str, metadata: Optional[Dict[str, Any]] = None) -> None:
         """Store a mapping in memory."""
@@ -96,6 +196,21 @@ class MemoryAdapter(StorageAdapter):
 
         return result
 
+    def iter_mappings(self, page_size: int = 1000,
+                      created_since: Optional[float] = None) -> Iterator[Dict[str, str]]:
+        """Yield mappings from memory, optionally only those stored since created_since."""
+        items = [
+            (fake_data, data["original_data"])
+            for fake_data, data in list(self.mappings.items())
+            if created_since is None or data["timestamp"] >= created_since
+        ]
+        for i in range(0, len(items), page_size):
+            yield dict(items[i:i + page_size])
+
+    def claim_mapping_records(self, records: List[MappingRecord]) -> Dict[str, str]:
+        """Store records whose original has no mapping yet, atomically."""
+        with self._claim_lock:
+            return super().claim_mapping_records(records)
 
     def batch_get_fake_data_for_originals(self, original_data_list: List[str]) -> Dict[str, str]:
         """Retrieve fake data for given original values from memory."""
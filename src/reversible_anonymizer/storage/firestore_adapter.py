@@ -1,31 +1,76 @@
-from typing import Optional, Dict, List, Any
+from typing import Optional, Dict, List, Any, Iterator
+from datetime import datetime, timezone
+from concurrent.futures import ThreadPoolExecutor
+import asyncio
+import hashlib
+import threading
+from google.api_core.exceptions import Conflict
 from google.cloud import firestore
 from ..common import StorageError
-from .base import StorageAdapter
+from .base import StorageAdapter, MappingRecord
 
 
 class FirestoreAdapter(StorageAdapter):
-    """Firestore storage adapter for anonymization mappings."""
+    """
+    Firestore storage adapter for anonymization mappings.
+
+    Mapping documents are keyed by fake data. Mappings written through
+    claim_mapping_records also create a claim document, keyed by a digest
+    of the original, in the "<collection>_claims" collection.
+    """
+
+    atomic_claims = True
 
     def __init__(
             self,
             project: str,
             collection_name: str,
+            read_chunk_size: int = 100,
+            max_concurrent_reads: int = 8
     ):
-        """Initialize the Firestore adapter."""
+        """
+        Initialize the Firestore adapter.
+
+        Args:
+            project: Google Cloud project ID
+            collection_name: Collection holding the mappings
+            read_chunk_size: Documents fetched per get_all call
+            max_concurrent_reads: Chunks fetched at the same time
+        """
+        self.project = project
         self.db = firestore.Client(project=project)
         self.collection_name = collection_name
+        self.claims_collection_name = f"{collection_name}_claims"
+        self.read_chunk_size = read_chunk_size
+        self.max_concurrent_reads = max_concurrent_reads
+        self._async_clients: Dict[Any, Any] = {}
+        self._read_executor: Optional[ThreadPoolExecutor] = None
+        self._read_executor_lock = threading.Lock()
+
+    @property
+    def async_db(self) -> Any:
+        """Async Firestore client of the running event loop, created on first use in it."""
+        loop = asyncio.get_running_loop()
+        client = self._async_clients.get(loop)
+        if client is None:
+            # Clients are bound to the loop they were created in; drop those of closed loops
+            self._async_clients = {other: c for other, c in self._async_clients.items() if not other.is_closed()}
+            client = self._async_clients[loop] = firestore.AsyncClient(project=self.project)
+        return client
+
+    def _mapping_document(self, original_data: str, metadata: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        """Firestore document stored for one mapping."""
+        return {
+            "original_data": original_data,
+            "created_at": firestore.SERVER_TIMESTAMP,
+            "metadata": metadata or {}
+        }
 
     def store_mapping(self, fake_data: str, original_data: str, metadata: Optional[Dict[str, Any]] = None) -> None:
         """Store a mapping in Firestore."""
         try:
             doc_ref = self.db.collection(self.collection_name).document(fake_data)
-            data = {
-                "original_data": original_data,
-                "created_at": firestore.SERVER_TIMESTAMP,
-                "metadata": metadata or {}
-            }
-            doc_ref.set(data)
+            doc_ref.set(self._mapping_document(original_data, metadata))
         except Exception as e:
             raise StorageError(f"Failed to store mapping: {str(e)}")
 
@@ -50,12 +95,7 @@ class FirestoreAdapter(StorageAdapter):
 
             for fake_data, original_data in mappings.items():
                 doc_ref = self.db.collection(self.collection_name).document(fake_data)
-                data = {
-                    "original_data": original_data,
-                    "created_at": firestore.SERVER_TIMESTAMP,
-                    "metadata": metadata or {}
-                }
-                batch.set(doc_ref, data)
+                batch.set(doc_ref, self._mapping_document(original_data, metadata))
                 count += 1
 
                 # Commit when reaching batch limit
@@ -70,23 +110,128 @@ class FirestoreAdapter(StorageAdapter):
         except Exception as e:
             raise StorageError(f"Failed to store batch mappings: {str(e)}")
 
-    def batch_get_originals(self, fake_data_list: List[str]) -> Dict[str, str]:
-        """Retrieve multiple original values from Firestore efficiently."""
-        result = {}
+    def batch_store_mapping_records(self, records: List[MappingRecord]) -> None:
+        """Store mappings with per-mapping metadata, up to 500 per batched write."""
+        try:
+            for i in range(0, len(records), 500):
+                batch = self.db.batch()
+                for fake_data, original_data, metadata in records[i:i + 500]:
+                    doc_ref = self.db.collection(self.collection_name).document(fake_data)
+                    batch.set(doc_ref, self._mapping_document(original_data, metadata))
+                batch.commit()
+        except Exception as e:
+            raise StorageError(f"Failed to store batch mappings: {str(e)}")
+
+    def _claim_id(self, original_data: str) -> str:
+        """Claim document ID of an original."""
+        return hashlib.sha256(original_data.encode("utf-8")).hexdigest()
+
+    def _claim_batch(self, records: List[MappingRecord]) -> None:
+        """Commit mappings with their claims; fails with Conflict if any original is claimed."""
+        batch = self.db.batch()
+        claims = self.db.collection(self.claims_collection_name)
+        mappings = self.db.collection(self.collection_name)
+        for fake_data, original_data, metadata in records:
+            batch.create(claims.document(self._claim_id(original_data)), {
+                "fake_data": fake_data,
+                "created_at": firestore.SERVER_TIMESTAMP
+            })
+            batch.set(mappings.document(fake_data), self._mapping_document(original_data, metadata))
+        batch.commit()
+
+    def claim_mapping_records(self, records: List[MappingRecord]) -> Dict[str, str]:
+        """
+        Store records whose original is unclaimed, atomically per original.
+
+        Each mapping is committed together with the creation of its claim
+        document, which fails if the document exists. Batched writes are all
+        or nothing, so a chunk holding a claimed original is retried record
+        by record and the fake data of the existing claim is read back.
+        """
+        existing = {}
         try:
-            # Process in chunks of 100 due to Firestore limitations
-            for i in range(0, len(fake_data_list), 100):
-                chunk = fake_data_list[i:i + 100]
+            # Two writes per record, within the 500 writes of a batch
+            for i in range(0, len(records), 250):
+                chunk = records[i:i + 250]
+                try:
+                    self._claim_batch(chunk)
+                except Conflict:
+                    for record in chunk:
+                        try:
+                            self._claim_batch([record])
+                        except Conflict:
+                            claim = self.db.collection(self.claims_collection_name).document(
+                                self._claim_id(record[1])
+                            ).get()
+                            existing[record[1]] = claim.to_dict()["fake_data"]
+            return existing
+        except Exception as e:
+            raise StorageError(f"Failed to claim mappings: {str(e)}")
+
+    def iter_mappings(self, page_size: int = 1000,
+                      created_since: Optional[float] = None) -> Iterator[Dict[str, str]]:
+        """
+        Yield mappings in pages of page_size documents.
+
+        Without created_since, pages cover the whole collection in document
+        ID order; with it, only documents whose created_at is at or after the
+        given Unix timestamp, in creation order.
+        """
+        collection = self.db.collection(self.collection_name)
+        if created_since is None:
+            base_query = collection.order_by("__name__")
+        else:
+            since = datetime.fromtimestamp(created_since, timezone.utc)
+            base_query = collection.where("created_at", ">=", since).order_by("created_at")
+        last = None
+        while True:
+            query = base_query.limit(page_size)
+            if last is not None:
+                query = query.start_after(last)
+            try:
+                docs = list(query.stream())
+            except Exception as e:
+                raise StorageError(f"Failed to retrieve mappings: {str(e)}")
+            if not docs:
+                return
+            yield {doc.id: doc.to_dict().get("original_data") for doc in docs}
+            last = docs[-1]
+
+    def _read_chunks(self, fake_data_list: List[str]) -> List[List[str]]:
+        """Split distinct fake values into get_all-sized chunks."""
+        unique = list(dict.fromkeys(fake_data_list))
+        return [unique[i:i + self.read_chunk_size] for i in range(0, len(unique), self.read_chunk_size)]
 
-                # Get all documents in one call
-                refs = [self.db.collection(self.collection_name).document(fake_data) for fake_data in chunk]
-                docs = self.db.get_all(refs)
+    def _executor(self) -> ThreadPoolExecutor:
+        """Pool for concurrent chunk reads, created on first use."""
+        with self._read_executor_lock:
+            if self._read_executor is None:
+                self._read_executor = ThreadPoolExecutor(
+                    max_workers=self.max_concurrent_reads, thread_name_prefix="firestore-read"
+                )
+            return self._read_executor
 
-                for doc in docs:
-                    if doc.exists:
-                        data = doc.to_dict()
-                        result[doc.id] = data.get("original_data")
+    def _get_chunk(self, chunk: List[str]) -> Dict[str, str]:
+        """Fetch one chunk of documents with a single get_all call."""
+        refs = [self.db.collection(self.collection_name).document(fake_data) for fake_data in chunk]
+        return {
+            doc.id: doc.to_dict().get("original_data")
+            for doc in self.db.get_all(refs)
+            if doc.exists
+        }
 
+    def batch_get_originals(self, fake_data_list: List[str]) -> Dict[str, str]:
+        """Retrieve multiple original values from Firestore, fetching chunks concurrently."""
+        result = {}
+        try:
+            chunks = self._read_chunks(fake_data_list)
+            if len(chunks) <= 1 or self.max_concurrent_reads <= 1:
+                found = [self._get_chunk(chunk) for chunk in chunks]
+            else:
+                found = self._executor().map(self._get_chunk, chunks)
+
+            for chunk_result in found:
+                result.update(chunk_result)
             return result
         except Exception as e:
             raise StorageError(f"Failed to retrieve batch mappings: {str(e)}")
@@ -121,29 +266,107 @@ class FirestoreAdapter(StorageAdapter):
         except Exception as e:
             raise StorageError(f"Failed to retrieve all mappings: {str(e)}")
 
+    def _find_by_field(self, field: str, values: List[str]) -> Dict[str, str]:
+        """Map each value to the ID of a document whose field equals it, with chunked in queries."""
+        result = {}
+        # Get chunks of values to avoid query size limits
+        for i in range(0, len(values), 10):
+            chunk = values[i:i + 10]
+
+            # Use in operator for efficient querying
+            query = self.db.collection(self.collection_name).where(field, "in", chunk)
+            for doc in query.stream():
+                data = doc.to_dict()
+                if field in data:
+                    result[data[field]] = doc.id
+        return result
+
     def batch_get_fake_data_for_originals(self, original_data_list: List[str]) -> Dict[str, str]:
         """Retrieve fake data for given original values from Firestore."""
-        result = {}
         try:
-            # Get chunks of original data to avoid query size limits
-            for i in range(0, len(original_data_list), 10):
-                chunk = original_data_list[i:i + 10]
+            return self._find_by_field("original_data", original_data_list)
+        except Exception as e:
+            raise StorageError(f"Failed to retrieve mappings: {str(e)}")
 
-                # Run a query to find documents with matching original_data
-                query = self.db.collection(self.collection_name)
+    async def store_mapping_async(self, fake_data: str, original_data: str,
+                                  metadata: Optional[Dict[str, Any]] = None) -> None:
+        """Store a mapping in Firestore using the async client."""
+        try:
+            doc_ref = self.async_db.collection(self.collection_name).document(fake_data)
+            await doc_ref.set(self._mapping_document(original_data, metadata))
+        except Exception as e:
+            raise StorageError(f"Failed to store mapping: {str(e)}")
 
-                # Use in operator for efficient querying
-                query = query.where("original_data", "in", chunk)
+    async def batch_store_mappings_async(self, mappings: Dict[str, str],
+                                         metadata: Optional[Dict[str, Any]] = None) -> None:
+        """Store multiple mappings in Firestore using async batched writes."""
+        try:
+            items = list(mappings.items())
+            for i in range(0, len(items), 500):
+                batch = self.async_db.batch()
+                for fake_data, original_data in items[i:i + 500]:
+                    doc_ref = self.async_db.collection(self.collection_name).document(fake_data)
+                    batch.set(doc_ref, self._mapping_document(original_data, metadata))
+                await batch.commit()
+        except Exception as e:
+            raise StorageError(f"Failed to store batch mappings: {str(e)}")
 
-                # Execute query
-                docs = query.stream()
+    async def batch_store_mapping_records_async(self, records: List[MappingRecord]) -> None:
+        """Store mappings with per-mapping metadata using async batched writes."""
+        try:
+            for i in range(0, len(records), 500):
+                batch = self.async_db.batch()
+                for fake_data, original_data, metadata in records[i:i + 500]:
+                    doc_ref = self.async_db.collection(self.collection_name).document(fake_data)
+                    batch.set(doc_ref, self._mapping_document(original_data, metadata))
+                await batch.commit()
+        except Exception as e:
+            raise StorageError(f"Failed to store batch mappings: {str(e)}")
 
-                # Process results
-                for doc in docs:
-                    data = doc.to_dict()
-                    if "original_data" in data:
-                        result[data["original_data"]] = doc.id
+    async def batch_get_originals_async(self, fake_data_list: List[str]) -> Dict[str, str]:
+        """Retrieve multiple original values using the async client, fetching chunks concurrently."""
+        semaphore = asyncio.Semaphore(max(1, self.max_concurrent_reads))
 
+        async def get_chunk(chunk: List[str]) -> Dict[str, str]:
+            async with semaphore:
+                refs = [self.async_db.collection(self.collection_name).document(fake_data) for fake_data in chunk]
+                return {
+                    doc.id: doc.to_dict().get("original_data")
+                    async for doc in self.async_db.get_all(refs)
+                    if doc.exists
+                }
+
+        result = {}
+        try:
+            chunks = self._read_chunks(fake_data_list)
+            for chunk_result in await asyncio.gather(*(get_chunk(chunk) for chunk in chunks)):
+                result.update(chunk_result)
             return result
         except Exception as e:
-            raise StorageError(f"Failed to retrieve mappings: {str(e)}")
\ No newline at end of file
+            raise StorageError(f"Failed to retrieve batch mappings: {str(e)}")
+
+    async def _find_by_field_async(self, field: str, values: List[str]) -> Dict[str, str]:
+        """Async counterpart of _find_by_field."""
+        result = {}
+        for i in range(0, len(values), 10):
+            chunk = values[i:i + 10]
+            query = self.async_db.collection(self.collection_name).where(field, "in", chunk)
+            async for doc in query.stream():
+                data = doc.to_dict()
+                if field in data:
+                    result[data[field]] = doc.id
+        return result
+
+    async def batch_get_fake_data_for_originals_async(self, original_data_list: List[str]) -> Dict[str, str]:
+        """Retrieve fake data for given original values using the async client."""
+        try:
+            return await self._find_by_field_async("original_data", original_data_list)
+        except Exception as e:
+            raise StorageError(f"Failed to retrieve mappings: {str(e)}")
+
+    def close(self) -> None:
+        """Stop the chunk read pool, if it was started."""
+        with self._read_executor_lock:
+            if self._read_executor is not None:
+                self._read_executor.shutdown(wait=False)
+                self._read_executor = None
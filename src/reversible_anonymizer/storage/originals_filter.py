@@ -0,0 +1,271 @@
+from typing import Optional, Union, Iterable, Iterator, Dict, Any, List
+from contextlib import contextmanager
+import atexit
+import hashlib
+import logging
+import math
+import os
+import struct
+import threading
+import time
+
+try:
+    import fcntl
+
+    FCNTL_AVAILABLE = True
+except ImportError:
+    FCNTL_AVAILABLE = False
+
+# File header: magic, format version, bit count, hash count, items added
+_HEADER = struct.Struct(">4sBQIQ")
+_MAGIC = b"RABF"
+_VERSION = 1
+
+
+class OriginalsFilter:
+    """
+    Bloom filter of every original value ever stored.
+
+    A negative answer is definite only for what this filter has seen: its
+    own additions, storage at startup and the shared file as of the last
+    merge. With single_writer set, nothing else writes mappings, so an
+    unseen original has no stored mapping and the anonymizer skips the
+    storage lookup. Otherwise another process may have stored it since,
+    and skipping is only safe when new mappings are written with an atomic
+    per-original claim (StorageAdapter.atomic_claims). A positive answer
+    may be wrong at the configured false-positive rate; the anonymizer then
+    pays the lookup as before and counts the false positive.
+
+    Positions come from a 16-byte BLAKE2b digest (keyed when a secret is
+    given), so they are stable across processes and the filter can be
+    saved to a file that other processes merge into. The file is re-read
+    every refresh_interval seconds and saves hold an exclusive lock on
+    path + ".lock" while they merge and replace it. Without a secret,
+    anyone who can read that file can test guesses of originals.
+    """
+
+    def __init__(
+            self,
+            expected_items: int = 1_000_000,
+            false_positive_rate: float = 0.001,
+            secret: Optional[Union[str, bytes]] = None,
+            path: Optional[str] = None,
+            save_interval: Optional[float] = 60.0,
+            refresh_interval: Optional[float] = 5.0,
+            single_writer: bool = False
+    ):
+        """
+        Initialize the filter, loading it from path if the file exists.
+
+        Args:
+            expected_items: Number of originals the filter is sized for
+            false_positive_rate: Target false-positive rate at expected_items
+            secret: Optional BLAKE2b key (up to 64 bytes) for the bit positions
+            path: Optional file the filter is loaded from and saved to; other
+                processes using the same file share their additions
+            save_interval: Minimum seconds between automatic saves after
+                additions (None saves only on save() and at exit)
+            refresh_interval: Seconds between re-reads of the file at path,
+                picking up what other processes saved (None never re-reads)
+            single_writer: Whether this process is the only one writing
+                mappings, so a negative answer proves an original is new
+        """
+        if expected_items < 1:
+            raise ValueError("expected_items must be positive")
+        if not 0 < false_positive_rate < 1:
+            raise ValueError("false_positive_rate must be between 0 and 1")
+
+        if isinstance(secret, str):
+            secret = secret.encode("utf-8")
+        if secret is not None and len(secret) > hashlib.blake2b.MAX_KEY_SIZE:
+            secret = hashlib.blake2b(secret).digest()
+        self._secret = secret or b""
+
+        bit_count = math.ceil(-expected_items * math.log(false_positive_rate) / math.log(2) ** 2)
+        self.bit_count = (bit_count + 7) // 8 * 8
+        self.hash_count = max(1, round(self.bit_count / expected_items * math.log(2)))
+        self._bits = bytearray(self.bit_count // 8)
+        self.items_added = 0
+
+        self.path = path
+        self.save_interval = save_interval
+        self.refresh_interval = refresh_interval
+        self.single_writer = single_writer
+        self._lock = threading.Lock()
+        self._save_lock = threading.Lock()  # One save at a time per process
+        self._dirty = False
+        self._last_save = time.monotonic()
+        self._last_refresh = time.monotonic()
+
+        # Counters of lookups answered by the filter
+        self.checks = 0
+        self.skipped = 0
+        self.false_positives = 0
+
+        self.loaded = False
+        if path is not None:
+            self.loaded = self._merge_file()
+            atexit.register(self._save_at_exit)
+
+    def _positions(self, original: str) -> List[int]:
+        """Bit positions of an original (double hashing over one digest)."""
+        digest = hashlib.blake2b(original.encode("utf-8"), digest_size=16, key=self._secret).digest()
+        first = int.from_bytes(digest[:8], "little")
+        step = int.from_bytes(digest[8:], "little") | 1
+        bit_count = self.bit_count
+        return [(first + i * step) % bit_count for i in range(self.hash_count)]
+
+    def __contains__(self, original: str) -> bool:
+        bits = self._bits
+        return all(bits[p >> 3] & (1 << (p & 7)) for p in self._positions(original))
+
+    def add_many(self, originals: Iterable[str]) -> None:
+        """Record originals that now have stored mappings."""
+        positions = [self._positions(original) for original in originals]
+        if not positions:
+            return
+        with self._lock:
+            bits = self._bits
+            for original_positions in positions:
+                for p in original_positions:
+                    bits[p >> 3] |= 1 << (p & 7)
+            self.items_added += len(positions)
+            self._dirty = True
+            due = (
+                self.path is not None
+                and self.save_interval is not None
+                and time.monotonic() - self._last_save >= self.save_interval
+            )
+        if due:
+            self.save()
+
+    def split(self, originals: Iterable[str]) -> List[str]:
+        """
+        Return the originals that may be stored, dropping definitely new ones.
+
+        Updates the check and skip counters.
+        """
+        self._refresh_if_due()
+        originals = list(originals)
+        candidates = [original for original in originals if original in self]
+        with self._lock:
+            self.checks += len(originals)
+            self.skipped += len(originals) - len(candidates)
+        return candidates
+
+    def record_false_positives(self, count: int) -> None:
+        """Count candidates that storage did not know after all."""
+        if count:
+            with self._lock:
+                self.false_positives += count
+
+    def populate(self, storage: Any, page_size: int = 1000) -> int:
+        """
+        Add every original in a storage adapter, one page at a time.
+
+        Returns:
+            Number of originals read
+        """
+        count = 0
+        for page in storage.iter_mappings(page_size):
+            self.add_many(page.values())
+            count += len(page)
+        return count
+
+    def _refresh_if_due(self) -> None:
+        """Merge the file at path when refresh_interval has passed since the last read."""
+        if self.path is None or self.refresh_interval is None:
+            return
+        now = time.monotonic()
+        with self._lock:
+            if now - self._last_refresh < self.refresh_interval:
+                return
+            self._last_refresh = now
+        self._merge_file()
+
+    def _merge_file(self) -> bool:
+        """OR the bits saved at path into this filter. Returns whether it was read."""
+        try:
+            with open(self.path, "rb") as f:
+                header = f.read(_HEADER.size)
+                bits = f.read()
+        except FileNotFoundError:
+            return False
+
+        if len(header) < _HEADER.size:
+            logging.warning(f"Ignoring truncated originals filter file: {self.path}")
+            return False
+        magic, version, bit_count, hash_count, items_added = _HEADER.unpack(header)
+        if (magic, version, bit_count, hash_count) != (_MAGIC, _VERSION, self.bit_count, self.hash_count) \
+                or len(bits) != len(self._bits):
+            logging.warning(f"Ignoring originals filter file with a different layout: {self.path}")
+            return False
+
+        with self._lock:
+            merged = int.from_bytes(self._bits, "little") | int.from_bytes(bits, "little")
+            self._bits = bytearray(merged.to_bytes(len(self._bits), "little"))
+            self.items_added = max(self.items_added, items_added)
+            self._last_refresh = time.monotonic()
+        return True
+
+    def save(self) -> None:
+        """Merge with the file at path and write the result back atomically."""
+        if self.path is None:
+            return
+        try:
+            with self._save_lock, self._file_lock():
+                self._write_file()
+        except OSError as e:
+            logging.warning(f"Failed to save originals filter: {str(e)}")
+
+    @contextmanager
+    def _file_lock(self) -> Iterator[None]:
+        """Hold an exclusive lock shared with other processes saving to path."""
+        if not FCNTL_AVAILABLE:
+            yield
+            return
+        with open(f"{self.path}.lock", "a") as lock_file:
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+
+    def _write_file(self) -> None:
+        # Pick up additions saved by other processes sharing the file; the
+        # file lock keeps them from replacing it between merge and replace
+        self._merge_file()
+        with self._lock:
+            data = _HEADER.pack(_MAGIC, _VERSION, self.bit_count, self.hash_count, self.items_added)
+            data += bytes(self._bits)
+            self._dirty = False
+            self._last_save = time.monotonic()
+
+        temp_path = f"{self.path}.{os.getpid()}.tmp"
+        with open(temp_path, "wb") as f:
+            f.write(data)
+        os.replace(temp_path, self.path)
+
+    def _save_at_exit(self) -> None:
+        if self._dirty:
+            self.save()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get filter size, estimated false-positive rate and lookup counters."""
+        with self._lock:
+            items, checks, skipped, false_positives = (
+                self.items_added, self.checks, self.skipped, self.false_positives
+            )
+        return {
+            "bit_count": self.bit_count,
+            "hash_count": self.hash_count,
+            "items_added": items,
+            "estimated_false_positive_rate": (
+                1 - math.exp(-self.hash_count * items / self.bit_count)
+            ) ** self.hash_count,
+            "checks": checks,
+            "skipped_lookups": skipped,
+            "false_positives": false_positives,
+            "single_writer": self.single_writer,
+            "path": self.path
+        }
@@ -1,19 +1,48 @@
+import hashlib
+import hmac
 import logging
-from typing import Optional, Dict, List, Any
+from typing import Optional, Dict, List, Any, Union, Iterator
+from ..common import StorageError
 from .firestore_adapter import FirestoreAdapter
 
+# Field holding the keyed HMAC of the original, queryable for equality
+BLIND_INDEX_FIELD = "original_index"
+
 
 class SecureFirestoreAdapter(FirestoreAdapter):
-    """Firestore adapter with encryption for sensitive mappings."""
+    """
+    Firestore adapter with encryption for sensitive mappings.
+
+    Fernet encryption is randomized, so the ciphertext cannot be queried.
+    Next to it, every document stores a blind index: an HMAC-SHA256 of the
+    original under a separate key. Reverse lookups (original -> fake) are
+    then indexed in queries on that field, while the original stays
+    encrypted at rest. Documents written before the index existed need
+    tools/backfill_blind_index.py to be found by reverse lookups.
+    """
 
     def __init__(
             self,
             project: str,
             collection_name: str,
-            encryption_key: Optional[str] = None
+            encryption_key: Optional[str] = None,
+            read_chunk_size: int = 100,
+            max_concurrent_reads: int = 8,
+            blind_index_key: Optional[Union[str, bytes]] = None
     ):
-        """Initialize the secure Firestore adapter with encryption."""
-        super().__init__(project, collection_name)
+        """
+        Initialize the secure Firestore adapter with encryption.
+
+        Args:
+            project: Google Cloud project ID
+            collection_name: Collection holding the mappings
+            encryption_key: Fernet key for the stored originals
+            read_chunk_size: Documents fetched per get_all call
+            max_concurrent_reads: Chunks fetched at the same time
+            blind_index_key: HMAC key of the blind index (default: derived
+                from the encryption key)
+        """
+        super().__init__(project, collection_name, read_chunk_size, max_concurrent_reads)
 
         # Setup encryption if key is provided
         self.encryption_enabled = False
@@ -27,24 +56,42 @@ class SecureFirestoreAdapter(FirestoreAdapter):
             except Exception as e:
                 logging.warning(f"Failed to initialize encryption: {str(e)}")
 
+        # The blind index key never equals the encryption key itself
+        if isinstance(blind_index_key, str):
+            blind_index_key = blind_index_key.encode("utf-8")
+        if blind_index_key is None and encryption_key:
+            key_material = encryption_key.encode() if isinstance(encryption_key, str) else encryption_key
+            blind_index_key = hmac.new(key_material, b"reversible-anonymizer blind index", hashlib.sha256).digest()
+        self._blind_index_key = blind_index_key
+
+    def blind_index(self, original_data: str) -> str:
+        """Keyed HMAC of an original, as stored in the blind index field."""
+        return hmac.new(self._blind_index_key, original_data.encode("utf-8"), hashlib.sha256).hexdigest()
+
+    def _claim_id(self, original_data: str) -> str:
+        """Claim document ID of an original; keyed, so IDs cannot be tested against guesses."""
+        if self.encryption_enabled:
+            return self.blind_index(original_data)
+        return super()._claim_id(original_data)
+
     def _encrypt(self, data: str) -> str:
         """Encrypt data if encryption is enabled."""
         if self.encryption_enabled:
-            from cryptography.fernet import Fernet
             return self.fernet.encrypt(data.encode()).decode()
         return data
 
     def _decrypt(self, data: str) -> str:
         """Decrypt data if encryption is enabled."""
         if self.encryption_enabled:
-            from cryptography.fernet import Fernet
             return self.fernet.decrypt(data.encode()).decode()
         return data
 
-    def store_mapping(self, fake_data: str, original_data: str, metadata: Optional[Dict[str, Any]] = None) -> None:
-        """Store mapping with encryption."""
-        encrypted_data = self._encrypt(original_data)
-        super().store_mapping(fake_data, encrypted_data, metadata)
+    def _mapping_document(self, original_data: str, metadata: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        """Encrypted mapping document with the blind index of the original."""
+        document = super()._mapping_document(self._encrypt(original_data), metadata)
+        if self.encryption_enabled:
+            document[BLIND_INDEX_FIELD] = self.blind_index(original_data)
+        return document
 
     def get_original_data(self, fake_data: str) -> Optional[str]:
         """Retrieve and decrypt original data."""
@@ -53,14 +100,6 @@ class SecureFirestoreAdapter(FirestoreAdapter):
             return self._decrypt(encrypted_data)
         return None
 
-    def batch_store_mappings(self, mappings: Dict[str, str], metadata: Optional[Dict[str, Any]] = None) -> None:
-        """Store multiple mappings with encryption."""
-        encrypted_mappings = {
-            fake_data: self._encrypt(original_data)
-            for fake_data, original_data in mappings.items()
-        }
-        super().batch_store_mappings(encrypted_mappings, metadata)
-
     def batch_get_originals(self, fake_data_list: List[str]) -> Dict[str, str]:
         """Retrieve and decrypt multiple original values."""
         encrypted_data = super().batch_get_originals(fake_data_list)
@@ -77,18 +116,43 @@ class SecureFirestoreAdapter(FirestoreAdapter):
             for fake_data, data in encrypted_data.items()
         }
 
-    def batch_get_fake_data_for_originals(self, original_data_list: List[str]) -> Dict[str, str]:
-        """Retrieve fake data for given original values, handling encrypted data."""
-        # First, get all mappings
-        all_mappings = self.get_all_mappings(limit=5000)
+    async def batch_get_originals_async(self, fake_data_list: List[str]) -> Dict[str, str]:
+        """Retrieve and decrypt multiple original values using the async client."""
+        encrypted_data = await super().batch_get_originals_async(fake_data_list)
+        return {
+            fake_data: self._decrypt(data)
+            for fake_data, data in encrypted_data.items()
+        }
 
-        # Create a reverse mapping
-        reverse_map = {original: fake for fake, original in all_mappings.items()}
+    def iter_mappings(self, page_size: int = 1000,
+                      created_since: Optional[float] = None) -> Iterator[Dict[str, str]]:
+        """Yield mappings in decrypted pages."""
+        for page in super().iter_mappings(page_size, created_since):
+            yield {fake_data: self._decrypt(data) for fake_data, data in page.items()}
 
-        # Look up each original data
-        result = {}
-        for original_data in original_data_list:
-            if original_data in reverse_map:
-                result[original_data] = reverse_map[original_data]
+    async def get_all_mappings_async(self, limit: Optional[int] = None) -> Dict[str, str]:
+        """Retrieve and decrypt all mappings without blocking the event loop."""
+        return await self._run_async(self.get_all_mappings, limit)
+
+    def batch_get_fake_data_for_originals(self, original_data_list: List[str]) -> Dict[str, str]:
+        """Retrieve fake data for given original values with in queries on the blind index."""
+        if not self.encryption_enabled:
+            # Originals are stored in plain text and can be queried directly
+            return super().batch_get_fake_data_for_originals(original_data_list)
+        try:
+            index_to_original = {self.blind_index(original): original for original in original_data_list}
+            found = self._find_by_field(BLIND_INDEX_FIELD, list(index_to_original))
+            return {index_to_original[index]: fake_data for index, fake_data in found.items()}
+        except Exception as e:
+            raise StorageError(f"Failed to retrieve mappings: {str(e)}")
 
-        return result
\ No newline at end of file
+    async def batch_get_fake_data_for_originals_async(self, original_data_list: List[str]) -> Dict[str, str]:
+        """Retrieve fake data for given original values with in queries on the blind index."""
+        if not self.encryption_enabled:
+            return await super().batch_get_fake_data_for_originals_async(original_data_list)
+        try:
+            index_to_original = {self.blind_index(original): original for original in original_data_list}
+            found = await self._find_by_field_async(BLIND_INDEX_FIELD, list(index_to_original))
+            return {index_to_original[index]: fake_data for index, fake_data in found.items()}
+        except Exception as e:
+            raise StorageError(f"Failed to retrieve mappings: {str(e)}")
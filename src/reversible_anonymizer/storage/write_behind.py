@@ -0,0 +1,481 @@
+from typing import Optional, List, Dict, Any, Deque
+from collections import deque
+from concurrent.futures import Future
+import atexit
+import json
+import logging
+import os
+import random
+import threading
+import time
+import weakref
+
+from ..common import StorageError
+from .base import StorageAdapter, MappingRecord
+
+# Buffers still open at interpreter exit are flushed and closed
+_open_buffers: "weakref.WeakSet[WriteBehindBuffer]" = weakref.WeakSet()
+
+
+@atexit.register
+def _close_open_buffers() -> None:
+    for buffer in list(_open_buffers):
+        buffer.close()
+
+
+class _Submission:
+    """Records of one submit call, with their ack Future and log sequence number."""
+
+    __slots__ = ("records", "future", "submitted_at", "seq")
+
+    def __init__(self, records: List[MappingRecord], future: Future, seq: Optional[int]):
+        self.records = records
+        self.future = future
+        self.submitted_at = time.monotonic()
+        self.seq = seq
+
+
+class WriteBehindBuffer:
+    """
+    Durable write-behind queue for mapping writes.
+
+    Callers submit the records of one request and get a Future back; a
+    background thread gathers submissions until max_batch_size records are
+    waiting or the oldest has waited flush_interval seconds, coalesces
+    repeated writes of the same fake value, and writes the batch with one
+    batch_store_mapping_records call. Failed batches are retried with
+    exponential backoff and jitter; each Future resolves with None once its
+    records are stored, or with the error once retries run out. Waiting on
+    the Future is the durability acknowledgement.
+
+    When max_pending records are already waiting, submit blocks until the
+    writer catches up, so a slow backend slows producers instead of growing
+    the queue without bound.
+
+    With a wal_path, every submission is appended to a local write-ahead
+    log before it is queued and acknowledged there once stored. Records
+    still unacknowledged when the process stops (crash, or retries ran out)
+    are replayed into the queue when the next buffer opens the same file.
+    With a wal_cipher, or when the storage adapter encrypts its mappings,
+    log entries are encrypted with that cipher; otherwise the log holds
+    originals in plain text, so keep it on an encrypted, access-restricted
+    volume. Open buffers are flushed at interpreter exit.
+    """
+
+    def __init__(
+            self,
+            storage: StorageAdapter,
+            max_batch_size: int = 500,
+            flush_interval: float = 0.05,
+            max_pending: int = 10000,
+            submit_timeout: Optional[float] = None,
+            max_retries: int = 5,
+            retry_backoff: float = 0.1,
+            max_backoff: float = 10.0,
+            wal_path: Optional[str] = None,
+            wal_sync: bool = True,
+            wal_cipher: Optional[Any] = None
+    ):
+        """
+        Initialize the buffer, replay its write-ahead log and start the writer thread.
+
+        Args:
+            storage: Storage adapter the records are written to
+            max_batch_size: Records that trigger an immediate flush
+            flush_interval: Longest time in seconds a record waits for a flush
+            max_pending: Records waiting before submit blocks
+            submit_timeout: Longest time in seconds submit blocks (None waits
+                indefinitely); StorageError is raised when it runs out
+            max_retries: Retries of a failed batch before its Futures fail
+            retry_backoff: Delay in seconds before the first retry; doubles
+                on every further retry
+            max_backoff: Longest delay in seconds between retries
+            wal_path: Optional write-ahead log file for crash recovery
+            wal_sync: Whether to fsync the log on every submission
+            wal_cipher: Optional Fernet-compatible cipher (encrypt/decrypt of
+                bytes) for log entries; defaults to the storage adapter's
+                cipher when it encrypts mappings
+
+        Raises:
+            StorageError: If the log holds entries that cannot be decrypted
+        """
+        if max_batch_size < 1 or max_pending < 1:
+            raise ValueError("max_batch_size and max_pending must be positive")
+
+        self.storage = storage
+        self.max_batch_size = max_batch_size
+        self.flush_interval = flush_interval
+        self.max_pending = max_pending
+        self.submit_timeout = submit_timeout
+        self.max_retries = max_retries
+        self.retry_backoff = retry_backoff
+        self.max_backoff = max_backoff
+        self.wal_path = wal_path
+        self.wal_sync = wal_sync
+        if wal_cipher is None and getattr(storage, "encryption_enabled", False):
+            wal_cipher = getattr(storage, "fernet", None)
+        self.wal_cipher = wal_cipher
+
+        self._condition = threading.Condition()
+        self._pending: Deque[_Submission] = deque()
+        self._pending_records = 0
+        self._in_flight = 0
+        self._reserved = 0  # Records of submissions being appended to the log
+        self._flush_waiters = 0  # While positive, pending records are written without delay
+        self._closed = False
+
+        # Write-ahead log: open file, next sequence number and failed submissions to keep
+        self._wal_lock = threading.Lock()
+        self._wal = None
+        self._next_seq = 0
+        self._failed: List[_Submission] = []
+
+        # Counters
+        self._started_at = time.monotonic()
+        self._batches = 0
+        self._commits = 0
+        self._commit_seconds = 0.0
+        self._last_commit_seconds: Optional[float] = None
+        self._last_write_lag: Optional[float] = None
+        self._records_written = 0
+        self._records_failed = 0
+        self._records_coalesced = 0
+        self._records_replayed = 0
+        self._retries = 0
+        self._blocked_submits = 0
+        self._max_pending_seen = 0
+
+        if wal_path is not None:
+            self._open_wal()
+
+        self._writer = threading.Thread(target=self._run, name="anonymizer-write-behind", daemon=True)
+        self._writer.start()
+        _open_buffers.add(self)
+
+    def __enter__(self) -> "WriteBehindBuffer":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    # Write-ahead log
+
+    def _open_wal(self) -> None:
+        """Queue the submissions the log holds without an ack, then rewrite it with just those."""
+        unacked: Dict[int, List[MappingRecord]] = {}
+        if os.path.exists(self.wal_path):
+            with open(self.wal_path, "r", encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        break  # Torn final line from a crash mid-append
+                    if "ack" in entry:
+                        for seq in entry["ack"]:
+                            unacked.pop(seq, None)
+                    else:
+                        unacked[entry["seq"]] = [tuple(record) for record in self._entry_records(entry)]
+
+        for seq, records in unacked.items():
+            self._pending.append(_Submission(records, Future(), seq))
+            self._pending_records += len(records)
+            self._records_replayed += len(records)
+        self._next_seq = max(unacked, default=-1) + 1
+        self._rewrite_wal(list(self._pending))
+        if unacked:
+            logging.info(f"Replaying {self._records_replayed} unacknowledged mappings from {self.wal_path}")
+
+    def _entry(self, submission: _Submission) -> Dict[str, Any]:
+        """Log entry of a submission, sealed with the cipher if there is one."""
+        if self.wal_cipher is None:
+            return {"seq": submission.seq, "records": submission.records}
+        sealed = self.wal_cipher.encrypt(json.dumps(submission.records).encode("utf-8"))
+        return {"seq": submission.seq, "sealed": sealed.decode("ascii")}
+
+    def _entry_records(self, entry: Dict[str, Any]) -> List[Any]:
+        """Records of a logged submission, decrypted if sealed."""
+        if "sealed" not in entry:
+            return entry["records"]
+        if self.wal_cipher is None:
+            raise StorageError(f"Write-ahead log {self.wal_path} is encrypted; a wal_cipher is required")
+        try:
+            return json.loads(self.wal_cipher.decrypt(entry["sealed"].encode("ascii")))
+        except Exception as e:
+            raise StorageError(f"Failed to decrypt write-ahead log {self.wal_path}: {type(e).__name__}")
+
+    def _rewrite_wal(self, submissions: List[_Submission]) -> None:
+        """Atomically replace the log with the given submissions."""
+        temp_path = f"{self.wal_path}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as f:
+            for submission in submissions:
+                f.write(json.dumps(self._entry(submission)) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, self.wal_path)
+        if self._wal is not None:
+            self._wal.close()
+        self._wal = open(self.wal_path, "a", encoding="utf-8")
+
+    def _append_wal(self, entry: Dict[str, Any], sync: bool) -> None:
+        self._wal.write(json.dumps(entry) + "\n")
+        self._wal.flush()
+        if sync:
+            os.fsync(self._wal.fileno())
+
+    # Producer side
+
+    def submit(self, records: List[MappingRecord]) -> Future:
+        """
+        Queue records for the next batched write.
+
+        Returns:
+            Future resolved once the records are stored
+
+        Raises:
+            StorageError: If the buffer is closed, stays full past
+                submit_timeout or cannot append to its write-ahead log
+        """
+        future: Future = Future()
+        if not records:
+            future.set_result(None)
+            return future
+
+        with self._condition:
+            if self._closed:
+                raise StorageError("Write-behind buffer is closed")
+
+            # Backpressure: wait while the buffer is full (a single oversized
+            # submission is still accepted into an empty buffer)
+            if self._queued() and self._queued() + len(records) > self.max_pending:
+                self._blocked_submits += 1
+                deadline = None if self.submit_timeout is None else time.monotonic() + self.submit_timeout
+                while self._queued() and self._queued() + len(records) > self.max_pending:
+                    remaining = None if deadline is None else deadline - time.monotonic()
+                    if remaining is not None and remaining <= 0:
+                        raise StorageError("Write-behind buffer is full")
+                    self._condition.wait(remaining)
+                    if self._closed:
+                        raise StorageError("Write-behind buffer is closed")
+
+            # Hold the space while the log is written without the condition,
+            # so producers and the writer do not wait on disk I/O
+            self._reserved += len(records)
+
+        submission = _Submission(list(records), future, None)
+        try:
+            if self.wal_path is not None:
+                self._log_submission(submission)
+        except BaseException:
+            with self._condition:
+                self._reserved -= len(records)
+                self._condition.notify_all()
+            raise
+
+        with self._condition:
+            self._reserved -= len(records)
+            self._pending.append(submission)
+            self._pending_records += len(records)
+            self._max_pending_seen = max(self._max_pending_seen, self._pending_records)
+            self._condition.notify_all()
+        return future
+
+    def _queued(self) -> int:
+        """Records counted against max_pending. Call with the condition held."""
+        return self._pending_records + self._reserved
+
+    def _log_submission(self, submission: _Submission) -> None:
+        """Append a submission to the log before it is queued."""
+        with self._wal_lock:
+            if self._wal is None:
+                raise StorageError("Write-ahead log is closed")
+            submission.seq = self._next_seq
+            self._next_seq += 1
+            try:
+                self._append_wal(self._entry(submission), self.wal_sync)
+            except (OSError, TypeError, ValueError) as e:
+                raise StorageError(f"Failed to append to write-ahead log: {str(e)}")
+
+    # Writer side
+
+    def _take_batch(self) -> List[_Submission]:
+        """Wait until a flush is due and remove its submissions. Holds no lock on return."""
+        with self._condition:
+            while True:
+                if self._pending:
+                    waited = time.monotonic() - self._pending[0].submitted_at
+                    if (self._pending_records >= self.max_batch_size or waited >= self.flush_interval
+                            or self._flush_waiters or self._closed):
+                        break
+                    self._condition.wait(self.flush_interval - waited)
+                elif self._closed and not self._reserved:
+                    return []
+                else:
+                    self._condition.wait()
+
+            batch = []
+            count = 0
+            while self._pending and (not batch or count + len(self._pending[0].records) <= self.max_batch_size):
+                submission = self._pending.popleft()
+                batch.append(submission)
+                count += len(submission.records)
+            self._pending_records -= count
+            self._in_flight += count
+            self._condition.notify_all()
+            return batch
+
+    def _store(self, records: List[MappingRecord]) -> Optional[StorageError]:
+        """Write records, retrying with backoff. Returns the last error as a StorageError, if any."""
+        attempt = 0
+        while True:
+            started = time.monotonic()
+            try:
+                self.storage.batch_store_mapping_records(records)
+                with self._condition:
+                    self._commits += 1
+                    self._last_commit_seconds = time.monotonic() - started
+                    self._commit_seconds += self._last_commit_seconds
+                return None
+            except Exception as e:
+                if attempt >= self.max_retries:
+                    if isinstance(e, StorageError):
+                        return e
+                    error = StorageError(f"Failed to store {len(records)} mappings: {str(e)}")
+                    error.__cause__ = e
+                    return error
+                delay = min(self.max_backoff, self.retry_backoff * 2 ** attempt) * random.uniform(0.5, 1.0)
+                logging.warning(
+                    f"Write-behind batch of {len(records)} mappings failed, retrying in {delay:.2f}s: {str(e)}"
+                )
+                attempt += 1
+                with self._condition:
+                    self._retries += 1
+                time.sleep(delay)
+
+    def _run(self) -> None:
+        while True:
+            batch = self._take_batch()
+            if not batch:
+                return
+
+            # Later writes of the same fake value replace earlier ones
+            coalesced = {record[0]: record for submission in batch for record in submission.records}
+            records = list(coalesced.values())
+            submitted = sum(len(submission.records) for submission in batch)
+
+            error = self._store(records)
+            if error is not None:
+                logging.error(f"Write-behind batch of {len(records)} mappings failed: {str(error)}")
+            self._acknowledge(batch, error)
+
+            for submission in batch:
+                if error is None:
+                    submission.future.set_result(None)
+                else:
+                    submission.future.set_exception(error)
+
+            with self._condition:
+                self._in_flight -= submitted
+                self._batches += 1
+                self._records_coalesced += submitted - len(records)
+                if error is None:
+                    self._records_written += len(records)
+                    self._last_write_lag = time.monotonic() - batch[0].submitted_at
+                else:
+                    self._records_failed += len(records)
+                drained = not self._pending and not self._in_flight
+                self._condition.notify_all()
+
+            if drained:
+                self._compact_wal()
+
+    def _acknowledge(self, batch: List[_Submission], error: Optional[StorageError]) -> None:
+        """Record stored submissions in the log; keep failed ones for the next start."""
+        if self._wal is None:
+            return
+        with self._wal_lock:
+            if error is not None:
+                self._failed.extend(batch)
+                return
+            try:
+                self._append_wal({"ack": [submission.seq for submission in batch]}, sync=False)
+            except OSError as e:
+                # Without the ack the records are written again on replay, which is harmless
+                logging.warning(f"Failed to acknowledge write-ahead log entries: {str(e)}")
+
+    def _compact_wal(self) -> None:
+        """Shrink the log to the failed submissions once the queue is empty."""
+        if self._wal is None:
+            return
+        # Under the condition no submission can be reserved meanwhile; a
+        # reserved one may already be in the log but not yet queued
+        with self._condition, self._wal_lock:
+            if self._pending or self._in_flight or self._reserved:
+                return
+            try:
+                self._rewrite_wal(self._failed)
+            except OSError as e:
+                logging.warning(f"Failed to compact write-ahead log: {str(e)}")
+
+    # Lifecycle
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """
+        Write everything submitted so far and wait for it.
+
+        Returns:
+            Whether the buffer drained before the timeout
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._condition:
+            # Write pending records now instead of after flush_interval
+            self._flush_waiters += 1
+            self._condition.notify_all()
+            try:
+                while self._pending or self._in_flight or self._reserved:
+                    remaining = None if deadline is None else deadline - time.monotonic()
+                    if remaining is not None and remaining <= 0:
+                        return False
+                    self._condition.wait(remaining)
+            finally:
+                self._flush_waiters -= 1
+        return True
+
+    def close(self, timeout: Optional[float] = None) -> None:
+        """Flush pending records and stop the writer thread. Safe to call more than once."""
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+        self._writer.join(timeout)
+        _open_buffers.discard(self)
+        if not self._writer.is_alive():
+            with self._wal_lock:
+                if self._wal is not None:
+                    self._wal.close()
+                    self._wal = None
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get queue depth, lag, throughput and write counters."""
+        with self._condition:
+            now = time.monotonic()
+            return {
+                "pending": self._pending_records + self._reserved,
+                "in_flight": self._in_flight,
+                "max_pending": self.max_pending,
+                "max_pending_seen": self._max_pending_seen,
+                "lag_seconds": now - self._pending[0].submitted_at if self._pending else 0.0,
+                "last_write_lag_seconds": self._last_write_lag,
+                "records_per_second": self._records_written / (now - self._started_at),
+                "batches": self._batches,
+                "average_batch_size": (
+                    (self._records_written + self._records_failed) / self._batches if self._batches else 0.0
+                ),
+                "average_commit_seconds": self._commit_seconds / self._commits if self._commits else None,
+                "last_commit_seconds": self._last_commit_seconds,
+                "records_written": self._records_written,
+                "records_failed": self._records_failed,
+                "records_coalesced": self._records_coalesced,
+                "records_replayed": self._records_replayed,
+                "retries": self._retries,
+                "blocked_submits": self._blocked_submits,
+                "wal_path": self.wal_path
+            }
@@ -0,0 +1,132 @@
+"""In-memory stand-in for the parts of the Firestore client the adapters use."""
+import threading
+
+
+class FakeSnapshot:
+    def __init__(self, reference, data):
+        self.reference = reference
+        self.id = reference.id
+        self.exists = data is not None
+        self._data = data
+
+    def to_dict(self):
+        return dict(self._data) if self._data is not None else None
+
+
+class FakeDocument:
+    def __init__(self, db, collection, doc_id):
+        self._db = db
+        self._collection = collection
+        self.id = doc_id
+
+    def get(self):
+        return FakeSnapshot(self, self._db.data.get(self._collection, {}).get(self.id))
+
+    def set(self, data):
+        self._db.data.setdefault(self._collection, {})[self.id] = dict(data)
+
+    def update(self, data):
+        self._db.data[self._collection][self.id].update(data)
+
+    def delete(self):
+        self._db.data.get(self._collection, {}).pop(self.id, None)
+
+
+class FakeQuery:
+    def __init__(self, db, collection, filters=(), order=None, limit=None, after=None):
+        self._db = db
+        self._collection = collection
+        self._filters = filters
+        self._order = order
+        self._limit = limit
+        self._after = after
+
+    def _copy(self, **changes):
+        state = dict(filters=self._filters, order=self._order, limit=self._limit, after=self._after)
+        state.update(changes)
+        return FakeQuery(self._db, self._collection, **state)
+
+    def where(self, field, op, value):
+        assert op in ("==", "in", ">="), op
+        if op == "in":
+            assert len(value) <= 10, "Firestore allows at most 10 values in an in query"
+        return self._copy(filters=self._filters + ((field, op, value),))
+
+    def order_by(self, field):
+        return self._copy(order=field)
+
+    def limit(self, count):
+        return self._copy(limit=count)
+
+    def start_after(self, snapshot):
+        return self._copy(after=snapshot.id)
+
+    def _matches(self, data):
+        for field, op, value in self._filters:
+            if field not in data:
+                return False
+            if op == "==" and data[field] != value:
+                return False
+            if op == "in" and data[field] not in value:
+                return False
+            if op == ">=" and data[field] < value:
+                return False
+        return True
+
+    def stream(self):
+        self._db.queries.append(self._filters)
+        docs = sorted(self._db.data.get(self._collection, {}).items())
+        if self._after is not None:
+            docs = [(doc_id, data) for doc_id, data in docs if doc_id > self._after]
+        snapshots = [
+            FakeSnapshot(FakeDocument(self._db, self._collection, doc_id), data)
+            for doc_id, data in docs
+            if self._matches(data)
+        ]
+        return iter(snapshots[:self._limit])
+
+
+class FakeCollection(FakeQuery):
+    def document(self, doc_id):
+        return FakeDocument(self._db, self._collection, doc_id)
+
+
+class FakeBatch:
+    def __init__(self, db):
+        self._db = db
+        self._writes = []
+
+    def set(self, reference, data):
+        self._writes.append(lambda: reference.set(data))
+
+    def update(self, reference, data):
+        self._writes.append(lambda: reference.update(data))
+
+    def commit(self):
+        for write in self._writes:
+            write()
+        self._db.commits += 1
+
+
+class FakeFirestore:
+    """Firestore client over a dict of collections, recording queries and get_all calls."""
+
+    def __init__(self, project=None):
+        self.project = project
+        self.data = {}
+        self.queries = []
+        self.get_all_calls = []
+        self.commits = 0
+        self._lock = threading.Lock()
+
+    def collection(self, name):
+        return FakeCollection(self, name)
+
+    def batch(self):
+        return FakeBatch(self)
+
+    def get_all(self, references):
+        references = list(references)
+        with self._lock:
+            self.get_all_calls.append([reference.id for reference in references])
+        return [reference.get() for reference in references]
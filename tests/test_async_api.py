@@ -0,0 +1,115 @@
+import asyncio
+import re
+
+import pytest
+
+from reversible_anonymizer import AnonymizationError, ReversibleAnonymizer
+from reversible_anonymizer.detection.base import Detector
+from reversible_anonymizer.models import Finding
+
+EMAIL = re.compile(r"[\w.]+@example\.com")
+
+
+class StubDetector(Detector):
+    """Finds example.com addresses; async calls sleep and track how many overlap."""
+
+    def __init__(self, delay=0.0):
+        self.delay = delay
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    def supports(self, info_type):
+        return info_type == "EMAIL_ADDRESS"
+
+    def inspect(self, text):
+        if "boom" in text:
+            raise RuntimeError("detector failed")
+        return [
+            Finding("EMAIL_ADDRESS", match.group(), match.start(), match.end(), "LIKELY")
+            for match in EMAIL.finditer(text)
+        ]
+
+    async def inspect_async(self, text):
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            # Later texts finish first, so completion order differs from input order
+            await asyncio.sleep(self.delay / (1 + len(text)))
+            return self.inspect(text)
+        finally:
+            self.in_flight -= 1
+
+
+def _anonymizer(mode="strict", delay=0.0):
+    return ReversibleAnonymizer(
+        project="test-project",
+        info_types=["EMAIL_ADDRESS"],
+        check_services=False,
+        storage_type="memory",
+        detector=StubDetector(delay),
+        use_realistic_fake_data=False,
+        mode=mode
+    )
+
+
+TEXT = "Write to jane@example.com, cc john@example.com and jane@example.com again."
+
+
+def test_async_round_trip_matches_the_sync_path():
+    first, second = _anonymizer(), _anonymizer()
+    second.storage = first.storage
+
+    result = asyncio.run(first.anonymize_async(TEXT, detailed_result=True))
+    anonymized = result["anonymized_text"]
+
+    assert "jane@example.com" not in anonymized
+    assert result["stats"]["total_findings"] == 3
+    assert result["stats"]["new_generations"] == 2
+    # A second instance resolves the same mappings from storage, sync or async
+    assert second.anonymize(TEXT) == anonymized
+    assert asyncio.run(second.anonymize_async(TEXT)) == anonymized
+    assert asyncio.run(first.deanonymize_async(anonymized)) == TEXT
+    assert second.deanonymize(anonymized) == asyncio.run(second.deanonymize_async(anonymized)) == TEXT
+
+
+def test_anonymize_many_async_bounds_concurrency_and_reports_indexes():
+    anonymizer = _anonymizer(delay=0.5)
+    texts = [f"{'x' * i} user{i}@example.com" for i in range(12)]
+
+    async def collect():
+        return [item async for item in anonymizer.anonymize_many_async(texts, max_concurrency=4)]
+
+    results = asyncio.run(collect())
+
+    assert anonymizer.detector.max_in_flight == 4
+    assert [index for index, _ in results] != list(range(12))
+    assert sorted(index for index, _ in results) == list(range(12))
+    assert all(anonymizer.deanonymize(anonymized) == texts[index] for index, anonymized in results)
+
+
+def test_async_errors_follow_strict_mode():
+    anonymizer = _anonymizer(mode="strict")
+
+    with pytest.raises(AnonymizationError):
+        asyncio.run(anonymizer.anonymize_async("boom jane@example.com"))
+
+    async def collect():
+        return [item async for item in anonymizer.anonymize_many_async(["a@example.com", "boom"])]
+
+    with pytest.raises(AnonymizationError):
+        asyncio.run(collect())
+
+
+def test_async_errors_follow_tolerant_mode():
+    anonymizer = _anonymizer(mode="tolerant")
+    texts = ["ann@example.com", "boom bob@example.com", "cy@example.com"]
+
+    assert asyncio.run(anonymizer.anonymize_async(texts[1])) == texts[1]
+
+    async def collect():
+        return dict([item async for item in anonymizer.anonymize_many_async(texts)])
+
+    results = asyncio.run(collect())
+    assert results[1] == texts[1]
+    assert results[0] != texts[0] and results[2] != texts[2]
+    assert anonymizer.deanonymize(results[2]) == texts[2]
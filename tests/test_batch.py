@@ -0,0 +1,75 @@
+from reversible_anonymizer.detection.batch import SEPARATOR, inspect_batch, pack_texts, split_findings
+from reversible_anonymizer.detection.offsets import utf8_length
+from reversible_anonymizer.models import Finding
+
+
+def _finding(text, quote, info_type="PERSON_NAME"):
+    start = text.index(quote)
+    return Finding(info_type, quote, start, start + len(quote), "LIKELY")
+
+
+def test_pack_offsets_point_at_source_texts():
+    texts = ["Grüße von Jürgen", "", "東京の山田太郎", "plain ascii"]
+    packs = pack_texts(texts)
+
+    assert len(packs) == 1
+    packed = packs[0]
+    assert packed.indices == [0, 2, 3]
+    for index, start, end in zip(packed.indices, packed.starts, packed.ends):
+        assert packed.content[start:end] == texts[index]
+    assert packed.content == SEPARATOR.join(text for text in texts if text)
+
+
+def test_pack_budget_counts_utf8_bytes():
+    # 10 characters, 30 bytes each
+    texts = ["東" * 10] * 4
+    budget = 2 * 30 + utf8_length(SEPARATOR)
+    packs = pack_texts(texts, max_request_bytes=budget)
+
+    assert [packed.indices for packed in packs] == [[0, 1], [2, 3]]
+    assert all(utf8_length(packed.content) <= budget for packed in packs)
+
+
+def test_pack_oversized_text_goes_alone():
+    texts = ["a" * 50, "ß" * 40, "b"]
+    packs = pack_texts(texts, max_request_bytes=60)
+
+    assert [packed.indices for packed in packs] == [[0], [1], [2]]
+
+
+def test_split_rebases_findings_and_drops_straddlers():
+    texts = ["Ünïcödé Jürgen", "Call Zoë now"]
+    packed = pack_texts(texts)[0]
+    content = packed.content
+    jurgen = _finding(content, "Jürgen")
+    zoe = _finding(content, "Zoë")
+    straddler = Finding("PERSON_NAME", content[10:20], 10, 20, "LIKELY")
+
+    result = split_findings(packed, [jurgen, zoe, straddler])
+
+    assert [texts[0][f.start:f.end] for f in result[0]] == ["Jürgen"]
+    assert [texts[1][f.start:f.end] for f in result[1]] == ["Zoë"]
+
+
+def test_inspect_batch_splits_truncated_packs():
+    texts = ["Jürgen", "Zoë", "Øyvind", "Åsa"]
+    calls = []
+
+    def inspect_fn(content):
+        calls.append(content)
+        findings = [_finding(content, name) for name in texts if name in content]
+        # Report truncation whenever more than one text is packed together
+        return findings, SEPARATOR in content
+
+    results = inspect_batch(texts, inspect_fn, max_workers=1)
+
+    assert [[f.quote for f in findings] for findings in results] == [[name] for name in texts]
+    assert [text[f.start:f.end] for text, findings in zip(texts, results) for f in findings] == texts
+    assert len(calls) == 7
+
+
+def test_inspect_batch_marks_failed_packs():
+    def inspect_fn(content):
+        raise RuntimeError("quota exceeded")
+
+    assert inspect_batch(["a", "b"], inspect_fn, raise_on_error=False) == [None, None]
@@ -0,0 +1,88 @@
+import asyncio
+
+from reversible_anonymizer.cache.memory_cache import MemoryCacheAdapter
+from reversible_anonymizer.detection.cached_detector import CachedDetector
+from reversible_anonymizer.detection.local_detector import LocalDetector
+
+
+class CountingDetector(LocalDetector):
+    """Local detector recording every text it inspects."""
+
+    def __init__(self, info_types):
+        super().__init__(info_types)
+        self.texts = []
+
+    def inspect(self, text):
+        self.texts.append(text)
+        return super().inspect(text)
+
+
+def _cached(cache=None, info_types=("EMAIL_ADDRESS",), min_likelihood="POSSIBLE"):
+    return CachedDetector(
+        detector=CountingDetector(list(info_types)),
+        cache=cache if cache is not None else MemoryCacheAdapter(shards=1),
+        info_types=list(info_types),
+        min_likelihood=min_likelihood
+    )
+
+
+TEXT = "Reset link sent to jane@example.com"
+
+
+def test_repeated_text_is_served_from_the_cache():
+    detector = _cached()
+
+    first = detector.inspect(TEXT)
+    assert detector.inspect(TEXT) == first
+    assert asyncio.run(detector.inspect_async(TEXT)) == first
+    assert [f.quote for f in first] == ["jane@example.com"]
+
+    assert detector.detector.texts == [TEXT]
+    stats = detector.get_cache_stats()
+    assert (stats["hits"], stats["misses"], stats["dlp_calls_avoided"]) == (2, 1, 2)
+
+
+def test_changed_settings_miss():
+    cache = MemoryCacheAdapter(shards=1)
+    _cached(cache).inspect(TEXT)
+
+    for detector in (
+            _cached(cache, min_likelihood="LIKELY"),
+            _cached(cache, info_types=("EMAIL_ADDRESS", "PHONE_NUMBER")),
+    ):
+        detector.inspect(TEXT)
+        assert detector.detector.texts == [TEXT]
+
+    # The same settings in another order share entries
+    detector = _cached(cache, info_types=("PHONE_NUMBER", "EMAIL_ADDRESS"))
+    detector.inspect(TEXT)
+    assert detector.detector.texts == []
+
+
+def test_calls_avoided_in_a_partly_cached_batch():
+    texts = [f"message {i} to user{i}@example.com" for i in range(4)]
+    detector = _cached()
+    detector.inspect_batch(texts[:2], max_request_bytes=40)
+
+    # One request per text: two are cached and a duplicate rides on its first copy
+    results = detector.inspect_batch(texts[:3] + [texts[2]], max_request_bytes=40)
+
+    assert detector.detector.texts == texts[:3]
+    assert [[f.quote for f in findings] for findings in results] == [
+        ["user0@example.com"], ["user1@example.com"], ["user2@example.com"], ["user2@example.com"]
+    ]
+    stats = detector.get_cache_stats()
+    assert (stats["hits"], stats["misses"], stats["dlp_calls_avoided"]) == (3, 3, 3)
+
+
+def test_hits_packed_with_misses_avoid_no_call():
+    texts = [f"message {i} to user{i}@example.com" for i in range(3)]
+    detector = _cached()
+    detector.inspect_batch(texts[:2])
+
+    # All texts share one request, which is still sent for the miss
+    detector.inspect_batch(texts)
+    assert detector.get_cache_stats()["dlp_calls_avoided"] == 0
+
+    detector.inspect_batch(texts)
+    assert detector.get_cache_stats()["dlp_calls_avoided"] == 1
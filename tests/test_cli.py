@@ -0,0 +1,51 @@
+import pytest
+
+from reversible_anonymizer import ReversibleAnonymizer
+from reversible_anonymizer import cli
+
+TEXT = "".join(f"Line {i}: write to user{i}@example.com today.\n" for i in range(30))
+
+
+@pytest.fixture
+def created(monkeypatch):
+    """Run the CLI against offline anonymizers and collect the instances it creates."""
+    instances = []
+
+    def offline_anonymizer(**options):
+        anonymizer = ReversibleAnonymizer(
+            check_services=False, storage_type="memory", detector="local", use_realistic_fake_data=False, **options
+        )
+        instances.append(anonymizer)
+        return anonymizer
+
+    monkeypatch.setattr(cli, "ReversibleAnonymizer", offline_anonymizer)
+    return instances
+
+
+def _run(monkeypatch, *args):
+    monkeypatch.setattr("sys.argv", ["anonymizer", "--project", "test-project", *args])
+    return cli.main()
+
+
+@pytest.mark.parametrize("options", [["--chunk-size", "64"], ["--chunk-size", "64", "--overlap", "40"]])
+def test_anonymize_streams_with_small_chunks(monkeypatch, created, tmp_path, options):
+    source, target = tmp_path / "input.txt", tmp_path / "output.txt"
+    source.write_text(TEXT, encoding="utf-8")
+
+    assert _run(monkeypatch, "anonymize", "-i", str(source), "-o", str(target),
+                "--info-types", "EMAIL_ADDRESS", *options) == 0
+
+    (anonymizer,) = created
+    output = target.read_text(encoding="utf-8")
+    assert "user7@example.com" not in output
+    assert output == anonymizer.anonymize(TEXT)
+    assert anonymizer.deanonymize(output) == TEXT
+
+
+def test_overlap_not_below_chunk_size_is_an_error(monkeypatch, created, tmp_path, capsys):
+    source = tmp_path / "input.txt"
+    source.write_text(TEXT, encoding="utf-8")
+
+    assert _run(monkeypatch, "anonymize", "-i", str(source), "-o", str(tmp_path / "output.txt"),
+                "--info-types", "EMAIL_ADDRESS", "--chunk-size", "64", "--overlap", "64") == 1
+    assert "chunk_size must be positive" in capsys.readouterr().out
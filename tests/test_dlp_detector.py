@@ -0,0 +1,50 @@
+import pytest
+
+from reversible_anonymizer import AnonymizationError, ReversibleAnonymizer
+from reversible_anonymizer.detection import dlp_detector
+from reversible_anonymizer.detection.dlp_detector import DlpDetector
+
+
+@pytest.fixture
+def failing_client(monkeypatch):
+    calls = []
+
+    def create_client(*args, **kwargs):
+        calls.append(1)
+        raise RuntimeError("no credentials")
+
+    monkeypatch.setattr(dlp_detector.dlp_v2, "DlpServiceClient", create_client)
+    return calls
+
+
+def _anonymizer(mode):
+    return ReversibleAnonymizer(
+        project="test-project",
+        info_types=["EMAIL_ADDRESS"],
+        check_services=False,
+        storage_type="memory",
+        detector="dlp",
+        mode=mode
+    )
+
+
+def test_detector_creates_its_client_on_first_use(failing_client):
+    detector = DlpDetector("test-project", ["EMAIL_ADDRESS"])
+    assert failing_client == []
+
+    with pytest.raises(RuntimeError):
+        detector.inspect_content("mail jane@example.com")
+
+
+def test_tolerant_construction_survives_a_failing_client(failing_client):
+    anonymizer = _anonymizer("tolerant")
+    text = "mail jane@example.com"
+
+    # Runs fail by the mode rules: tolerant mode returns the input
+    assert anonymizer.anonymize(text) == text
+    assert anonymizer.anonymize(text, detailed_result=True)["stats"]["error"]
+
+
+def test_strict_construction_fails_with_a_failing_client(failing_client):
+    with pytest.raises(AnonymizationError):
+        _anonymizer("strict")
@@ -0,0 +1,106 @@
+import asyncio
+import threading
+import types
+
+import pytest
+
+from reversible_anonymizer import ReversibleAnonymizer, StorageError
+from reversible_anonymizer.config import AnonymizerConfig
+from reversible_anonymizer.storage import firestore_adapter
+from reversible_anonymizer.storage.firestore_adapter import FirestoreAdapter
+
+from .fake_firestore import FakeFirestore
+
+
+class BarrierFirestore(FakeFirestore):
+    """get_all blocks until three calls are in flight at once."""
+
+    def __init__(self, project=None):
+        super().__init__(project)
+        self.barrier = threading.Barrier(3, timeout=5)
+
+    def get_all(self, references):
+        self.barrier.wait()
+        return super().get_all(references)
+
+
+@pytest.fixture(autouse=True)
+def fake_firestore(monkeypatch):
+    monkeypatch.setattr(firestore_adapter, "firestore", types.SimpleNamespace(
+        Client=FakeFirestore, AsyncClient=FakeFirestore, SERVER_TIMESTAMP="server-timestamp"
+    ))
+
+
+def _stored_adapter(count, **options):
+    adapter = FirestoreAdapter("test-project", "mappings", **options)
+    adapter.batch_store_mappings({f"fake-{i:02d}": f"original-{i}" for i in range(count)})
+    return adapter
+
+
+def test_read_chunks_dedupe_and_split():
+    adapter = FirestoreAdapter("test-project", "mappings", read_chunk_size=3)
+
+    assert adapter._read_chunks(["a", "b", "a", "c", "d", "b", "e"]) == [["a", "b", "c"], ["d", "e"]]
+    assert adapter._read_chunks([]) == []
+
+
+def test_batch_get_originals_reads_chunks_concurrently():
+    adapter = _stored_adapter(25, read_chunk_size=10, max_concurrent_reads=4)
+    stored, adapter.db = adapter.db, BarrierFirestore()
+    adapter.db.data = stored.data
+    wanted = [f"fake-{i:02d}" for i in range(25)] + ["fake-00", "missing"]
+
+    # The three chunks only pass the barrier if they are fetched at the same time
+    result = adapter.batch_get_originals(wanted)
+
+    assert result == {f"fake-{i:02d}": f"original-{i}" for i in range(25)}
+    assert sorted(len(call) for call in adapter.db.get_all_calls) == [6, 10, 10]
+    adapter.close()
+
+
+def test_single_chunk_is_read_inline():
+    adapter = _stored_adapter(5, read_chunk_size=10)
+
+    assert adapter.batch_get_originals(["fake-01", "fake-04"]) == {"fake-01": "original-1", "fake-04": "original-4"}
+    assert adapter._read_executor is None
+
+
+def test_failed_chunk_raises_storage_error():
+    adapter = _stored_adapter(5, read_chunk_size=2)
+    adapter.db.get_all = lambda references: (_ for _ in ()).throw(ConnectionError("unavailable"))
+
+    with pytest.raises(StorageError):
+        adapter.batch_get_originals(["fake-00", "fake-01", "fake-02"])
+    adapter.close()
+
+
+def test_read_chunk_size_setting_reaches_the_adapter():
+    anonymizer = ReversibleAnonymizer(
+        project="test-project",
+        info_types=["EMAIL_ADDRESS"],
+        check_services=False,
+        storage_type="firestore",
+        detector="local",
+        storage_config={"read_chunk_size": 4, "max_concurrent_reads": 1}
+    )
+    anonymizer.storage.batch_store_mappings({f"fake-{i}": f"original-{i}" for i in range(10)})
+
+    anonymizer.storage.batch_get_originals([f"fake-{i}" for i in range(10)])
+
+    assert [len(call) for call in anonymizer.storage.db.get_all_calls] == [4, 4, 2]
+    assert AnonymizerConfig.validate_config({"storage_config": {"read_chunk_size": 0}})
+
+
+def test_async_client_per_event_loop():
+    adapter = FirestoreAdapter("test-project", "mappings")
+
+    async def clients():
+        return adapter.async_db, adapter.async_db
+
+    first, again = asyncio.run(clients())
+    second, _ = asyncio.run(clients())
+
+    assert first is again
+    assert first is not second
+    # The client of the closed first loop was dropped
+    assert list(adapter._async_clients.values()) == [second]
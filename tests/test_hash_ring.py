@@ -0,0 +1,55 @@
+import pytest
+
+from reversible_anonymizer.cache.hash_ring import HashRing
+
+NODES = ["10.0.0.1:11211", "10.0.0.2:11211", "10.0.0.3:11211", "10.0.0.4:11211"]
+KEYS = [f"ra:v1:key-{i}" for i in range(5000)]
+
+
+def _placement(ring):
+    return {key: ring.get_node(key) for key in KEYS}
+
+
+def test_placement_ignores_node_order_and_duplicates():
+    assert _placement(HashRing(NODES)) == _placement(HashRing(reversed(NODES + NODES[:1])))
+    assert len(HashRing(NODES + NODES)) == 4
+
+
+def test_keys_spread_over_all_nodes():
+    counts = {}
+    for node in _placement(HashRing(NODES)).values():
+        counts[node] = counts.get(node, 0) + 1
+
+    assert set(counts) == set(NODES)
+    assert min(counts.values()) > len(KEYS) / len(NODES) / 2
+
+
+def test_removing_a_node_only_moves_its_keys():
+    before = _placement(HashRing(NODES))
+    after = _placement(HashRing(NODES[:-1]))
+
+    moved = [key for key in KEYS if before[key] != after[key]]
+    assert moved
+    assert all(before[key] == NODES[-1] for key in moved)
+
+
+def test_adding_a_node_moves_about_one_share_of_keys():
+    before = _placement(HashRing(NODES))
+    after = _placement(HashRing(NODES + ["10.0.0.5:11211"]))
+
+    moved = [key for key in KEYS if before[key] != after[key]]
+    assert all(after[key] == "10.0.0.5:11211" for key in moved)
+    assert len(KEYS) / 10 < len(moved) < len(KEYS) / 3
+
+
+def test_group_partitions_keys_by_node():
+    ring = HashRing(NODES)
+    groups = ring.group(KEYS[:100])
+
+    assert sorted(key for keys in groups.values() for key in keys) == sorted(KEYS[:100])
+    assert all(ring.get_node(key) == node for node, keys in groups.items() for key in keys)
+
+
+def test_empty_ring():
+    with pytest.raises(LookupError):
+        HashRing([]).get_node("key")
@@ -0,0 +1,99 @@
+import asyncio
+
+from reversible_anonymizer import ReversibleAnonymizer
+from reversible_anonymizer.detection.base import Detector
+from reversible_anonymizer.detection.hybrid_detector import HybridDetector
+from reversible_anonymizer.detection.local_detector import LocalDetector
+from reversible_anonymizer.models import Finding
+
+
+class RecordingDetector(Detector):
+    """Remote stand-in reporting every occurrence of its words, recording the texts it sees."""
+
+    def __init__(self, info_types, words=()):
+        self.info_types = list(info_types)
+        self.words = list(words)
+        self.texts = []
+
+    def supports(self, info_type):
+        return info_type in self.info_types
+
+    def inspect(self, text):
+        self.texts.append(text)
+        findings = []
+        for word in self.words:
+            start = text.find(word)
+            while start != -1:
+                findings.append(Finding(self.info_types[0], word, start, start + len(word), "LIKELY"))
+                start = text.find(word, start + 1)
+        return findings
+
+    async def inspect_async(self, text):
+        return self.inspect(text)
+
+
+def _hybrid(info_types, words=()):
+    routes = HybridDetector.split_info_types(info_types)
+    remote = RecordingDetector(routes["remote"], words) if routes["remote"] else None
+    return HybridDetector(local=LocalDetector(routes["local"]), remote=remote)
+
+
+def test_local_types_never_reach_the_remote_detector():
+    detector = _hybrid(["EMAIL_ADDRESS", "US_SOCIAL_SECURITY_NUMBER", "PERSON_NAME"], words=["Jane"])
+
+    assert detector.local.info_types == ["EMAIL_ADDRESS", "US_SOCIAL_SECURITY_NUMBER"]
+    assert detector.remote.info_types == ["PERSON_NAME"]
+    findings = detector.inspect("Jane, SSN 123-45-6789, mail x@example.com")
+    assert sorted(finding.info_type for finding in findings) == [
+        "EMAIL_ADDRESS", "PERSON_NAME", "US_SOCIAL_SECURITY_NUMBER"
+    ]
+
+
+def test_hybrid_without_remote_types_creates_no_remote_detector():
+    anonymizer = ReversibleAnonymizer(
+        project="test-project",
+        info_types=["EMAIL_ADDRESS", "PHONE_NUMBER"],
+        check_services=False,
+        storage_type="memory",
+        detector="hybrid"
+    )
+
+    assert anonymizer.detector.remote is None
+    assert anonymizer.detector.get_stats()["remote"] is None
+
+
+def test_short_and_letterless_texts_skip_the_remote_detector():
+    detector = _hybrid(["PHONE_NUMBER", "PERSON_NAME"])
+
+    detector.inspect("a")
+    detector.inspect(" 7 ")
+    detector.inspect("call 555-0100 now")
+    detector.inspect("+1 (555) 010-0199")
+    assert detector.inspect_batch(["Jane", "12345", "x"]) == [[], [], []]
+    asyncio.run(detector.inspect_async("42 / 7"))
+
+    assert detector.remote.texts == ["call 555-0100 now", "Jane"]
+    assert detector.get_stats()["remote_skipped"] == 6
+
+
+def test_letterless_texts_reach_remote_types_that_are_not_words():
+    detector = _hybrid(["PERSON_NAME", "PASSPORT"])
+
+    detector.inspect("12345678")
+    assert detector.remote.texts == ["12345678"]
+
+
+def test_merged_findings_do_not_overlap():
+    # The remote detector also reports a name inside an address and one across an edge
+    detector = _hybrid(["EMAIL_ADDRESS", "PERSON_NAME"], words=["jane", "com Jane", "Jane"])
+    text = "Mail jane@example.com Jane Roe"
+
+    for findings in (
+            detector.inspect(text),
+            asyncio.run(detector.inspect_async(text)),
+            detector.inspect_batch([text])[0]
+    ):
+        assert [(f.info_type, f.quote) for f in findings] == [
+            ("EMAIL_ADDRESS", "jane@example.com"), ("PERSON_NAME", "Jane")
+        ]
+        assert all(a.end <= b.start for a, b in zip(findings, findings[1:]))
@@ -0,0 +1,42 @@
+import re
+
+from reversible_anonymizer.cache.key_codec import KeyCodec
+
+# Memcached keys: at most 250 bytes, no whitespace or control characters
+_MEMCACHE_SAFE = re.compile(r"[\x21-\x7e]{1,250}")
+
+
+def test_keys_are_short_fixed_size_and_protocol_safe():
+    codec = KeyCodec()
+    keys = ["", "John Doe", "a b\r\nc", "Zoë 東京 😀", "x" * 10_000]
+
+    encoded = [codec.encode(key) for key in keys]
+
+    assert len({len(key) for key in encoded}) == 1
+    assert all(key.startswith("ra:v1:") for key in encoded)
+    assert all(_MEMCACHE_SAFE.fullmatch(key) for key in encoded)
+    assert len(set(encoded)) == len(keys)
+
+
+def test_encoding_is_stable():
+    # A changed digest would orphan every key already in the cache
+    assert KeyCodec().encode("John Doe") == KeyCodec().encode("John Doe")
+    assert KeyCodec().encode("John Doe") == "ra:v1:DERV14Etn31urZt21EHSsA"
+
+
+def test_originals_do_not_appear_in_keys():
+    assert "John" not in KeyCodec().encode("John Doe")
+
+
+def test_namespace_version_and_secret_separate_keys():
+    key = "John Doe"
+    encoded = {
+        KeyCodec().encode(key),
+        KeyCodec(namespace="other").encode(key),
+        KeyCodec(version=2).encode(key),
+        KeyCodec(secret="s3cret").encode(key),
+        KeyCodec(secret=b"s3cret" * 20).encode(key),
+    }
+
+    assert len(encoded) == 5
+    assert KeyCodec(secret="s3cret").encode(key) == KeyCodec(secret=b"s3cret").encode(key)
@@ -0,0 +1,73 @@
+import pytest
+
+from reversible_anonymizer.common import InfoTypeNotSupportedError
+from reversible_anonymizer.detection.local_detector import LocalDetector, iban_valid, luhn_valid
+
+
+def _quotes(detector, text):
+    return [(finding.info_type, finding.quote) for finding in detector.inspect(text)]
+
+
+def test_luhn():
+    assert luhn_valid("4111111111111111")
+    assert luhn_valid("79927398713")
+    assert not luhn_valid("4111111111111112")
+
+
+def test_iban_checksum_and_length():
+    assert iban_valid("GB82WEST12345698765432")
+    assert iban_valid("GB82 WEST 1234 5698 7654 32")
+    assert iban_valid("DE89370400440532013000")
+    assert not iban_valid("GB82WEST12345698765433")
+    assert not iban_valid("GB82WEST1234569876543")
+    assert not iban_valid("ZZ82WEST12345698765432")
+
+
+def test_credit_cards_need_a_valid_checksum():
+    detector = LocalDetector(["CREDIT_CARD_NUMBER"])
+
+    assert _quotes(detector, "card 4111 1111 1111 1111.") == [("CREDIT_CARD_NUMBER", "4111 1111 1111 1111")]
+    assert _quotes(detector, "card 4111-1111-1111-1111") == [("CREDIT_CARD_NUMBER", "4111-1111-1111-1111")]
+    assert _quotes(detector, "card 4111 1111 1111 1112") == []
+    assert _quotes(detector, "card 4111 1111-1111 1111") == []
+
+
+def test_ssn_ranges():
+    detector = LocalDetector(["US_SOCIAL_SECURITY_NUMBER"])
+
+    assert _quotes(detector, "SSN 123-45-6789") == [("US_SOCIAL_SECURITY_NUMBER", "123-45-6789")]
+    for invalid in ("000-45-6789", "666-45-6789", "900-45-6789", "123-00-6789", "123-45-0000", "123-45 6789"):
+        assert _quotes(detector, f"SSN {invalid}") == [], invalid
+
+
+def test_iban_in_text():
+    detector = LocalDetector(["IBAN_CODE"])
+
+    assert _quotes(detector, "pay to GB82 WEST 1234 5698 7654 32 today") == [
+        ("IBAN_CODE", "GB82 WEST 1234 5698 7654 32")
+    ]
+    assert _quotes(detector, "pay to GB82 WEST 1234 5698 7654 33 today") == []
+
+
+def test_email_ip_and_offsets():
+    detector = LocalDetector(["EMAIL_ADDRESS", "IP_ADDRESS"])
+    text = "Zoë <zoe.smith@example.com> from 192.168.1.20, not 999.1.1.1 or a..b@example.com"
+
+    findings = detector.inspect(text)
+
+    assert sorted((f.info_type, f.quote) for f in findings) == [
+        ("EMAIL_ADDRESS", "zoe.smith@example.com"),
+        ("IP_ADDRESS", "192.168.1.20"),
+    ]
+    assert all(text[f.start:f.end] == f.quote for f in findings)
+
+
+def test_min_likelihood_filters_patterns():
+    detector = LocalDetector(["CREDIT_CARD_NUMBER", "EMAIL_ADDRESS"], min_likelihood="VERY_LIKELY")
+
+    assert _quotes(detector, "4111111111111111 a@example.com") == [("CREDIT_CARD_NUMBER", "4111111111111111")]
+
+
+def test_unsupported_info_type():
+    with pytest.raises(InfoTypeNotSupportedError):
+        LocalDetector(["PERSON_NAME"])
@@ -0,0 +1,58 @@
+import base64
+from unittest import mock
+
+from reversible_anonymizer import ReversibleAnonymizer
+from reversible_anonymizer.cache.mapping_cache import REVERSE_PREFIX, MappingCache
+from reversible_anonymizer.cache.memory_cache import MemoryCacheAdapter
+
+
+class ReversingCipher:
+    """Stands in for Fernet: anything with encrypt and decrypt over bytes."""
+
+    def encrypt(self, data):
+        return base64.b64encode(data[::-1])
+
+    def decrypt(self, token):
+        return base64.b64decode(token, validate=True)[::-1]
+
+
+def test_both_directions_are_cached_together():
+    mapping_cache = MappingCache(MemoryCacheAdapter(shards=1))
+    mapping_cache.put({"Jane Roe": "Fake One"})
+
+    assert mapping_cache.get_fakes(["Jane Roe", "John Doe"]) == {"Jane Roe": "Fake One"}
+    assert mapping_cache.get_originals(["Fake One"]) == {"Fake One": "Jane Roe"}
+
+    mapping_cache.delete("Jane Roe", "Fake One")
+    assert mapping_cache.get_originals(["Fake One"]) == {}
+
+
+def test_reverse_values_are_sealed_with_the_cipher():
+    cache = MemoryCacheAdapter(shards=1)
+    mapping_cache = MappingCache(cache, cipher=ReversingCipher())
+    mapping_cache.put({"Jane Roe": "Fake One"})
+
+    assert cache.get(REVERSE_PREFIX + "Fake One") != "Jane Roe"
+    assert mapping_cache.get_originals(["Fake One"]) == {"Fake One": "Jane Roe"}
+
+    # Entries written without the cipher are misses, not garbage
+    cache.put(REVERSE_PREFIX + "Fake Two", "John Doe")
+    assert mapping_cache.get_originals(["Fake Two"]) == {}
+
+
+def test_deanonymize_serves_hot_values_from_the_reverse_cache():
+    anonymizer = ReversibleAnonymizer(
+        project="test-project",
+        info_types=["EMAIL_ADDRESS"],
+        check_services=False,
+        storage_type="memory",
+        detector="local",
+        use_realistic_fake_data=False
+    )
+    text = "mail jane@example.com and john@example.com"
+    anonymized = anonymizer.anonymize(text)
+
+    storage = anonymizer.storage
+    with mock.patch.object(storage, "batch_get_originals", wraps=storage.batch_get_originals) as read:
+        assert anonymizer.deanonymize(anonymized) == text
+    read.assert_not_called()
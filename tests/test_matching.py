@@ -0,0 +1,139 @@
+from unittest import mock
+
+from reversible_anonymizer import ReversibleAnonymizer
+from reversible_anonymizer.matching import AhoCorasick, LiteralIndex
+from reversible_anonymizer.storage.base import MemoryAdapter
+
+
+def test_find_all_reports_overlapping_and_nested_words():
+    automaton = AhoCorasick(["he", "she", "his", "hers"])
+
+    assert sorted(automaton.find_all("ushers")) == [(1, 4), (2, 4), (2, 6)]
+    assert automaton.find_all("ahishe") == [(1, 4), (3, 6), (4, 6)]
+
+
+def test_find_all_repeated_and_self_overlapping():
+    automaton = AhoCorasick(["aa", "aaa"])
+
+    assert sorted(automaton.find_all("aaaa")) == [(0, 2), (0, 3), (1, 3), (1, 4), (2, 4)]
+
+
+def test_words_added_after_a_search_are_found():
+    automaton = AhoCorasick(["Jane Roe"])
+    text = "Jane Roe met Ada Lovelace and Jane Roe-Smith"
+
+    assert automaton.find_all(text) == [(0, 8), (30, 38)]
+    assert automaton.add("Jane Roe-Smith")
+    assert not automaton.add("Jane Roe")
+    assert not automaton.add("")
+    assert automaton.update(["Ada Lovelace", "Jane Roe"]) == 1
+    assert len(automaton) == 3
+    assert sorted(automaton.find_all(text)) == [(0, 8), (13, 25), (30, 38), (30, 44)]
+
+
+def test_non_ascii_words():
+    automaton = AhoCorasick(["Zoë", "東京"])
+
+    assert automaton.find_all("Zoë lives in 東京, not Zoe") == [(0, 3), (13, 15)]
+    assert AhoCorasick().find_all("anything") == []
+
+
+def test_literal_index_evicts_least_recently_used():
+    index = LiteralIndex(max_size=3, words=["one", "two", "three"])
+
+    # A match marks a word as used, so "two" is evicted rather than "one"
+    assert index.find_all("one") == [(0, 3)]
+    assert index.add("four")
+    assert len(index) == 3
+    assert "two" not in index
+    assert index.evictions == 1
+    assert index.find_all("one two three four") == [(0, 3), (8, 13), (14, 18)]
+
+    # An evicted word can come back
+    assert index.add("two")
+    assert index.find_all("two") == [(0, 3)]
+
+
+def test_literal_index_merges_levels_without_losing_words():
+    words = [f"word-{i:05d}" for i in range(5000)]
+    index = LiteralIndex()
+    for start in range(0, len(words), 100):
+        index.update(words[start:start + 100])
+
+    assert len(index) == len(words)
+    assert len(index._delta_words) < 256
+    assert sum(level is not None for level in index._levels) > 1
+    text = " ".join(words[::499])
+    assert [text[s:e] for s, e in index.find_all(text)] == words[::499]
+
+
+def test_literal_index_compacts_evicted_words():
+    index = LiteralIndex(max_size=10)
+    index.update(f"value-{i}" for i in range(2000))
+
+    assert len(index) == 10
+    assert len(index._indexed) < 2000
+    assert index.find_all("value-5 value-1999") == [(8, 18)]
+
+
+def _anonymizer(**fake_data_index):
+    return ReversibleAnonymizer(
+        project="test-project",
+        info_types=["EMAIL_ADDRESS"],
+        check_services=False,
+        storage_type="memory",
+        detector="local",
+        fake_data_index=fake_data_index
+    )
+
+
+def test_deanonymize_picks_up_mappings_of_other_processes():
+    writer, reader = _anonymizer(), _anonymizer(refresh_interval=0)
+    reader.storage = writer.storage
+    writer.storage.store_mapping("Jane Roe", "Alice Smith")
+
+    assert reader.deanonymize("Dear Jane Roe,") == "Dear Alice Smith,"
+
+    # A later mapping is found too, not just those stored before the first read
+    writer.storage.store_mapping("John Doe", "Bob Jones")
+    assert reader.deanonymize("Dear John Doe,") == "Dear Bob Jones,"
+
+
+def test_text_without_fake_data_does_not_rescan_storage():
+    anonymizer = _anonymizer(refresh_interval=60)
+    storage = mock.Mock(wraps=MemoryAdapter())
+    storage.blocking = False
+    anonymizer.storage = storage
+
+    for _ in range(5):
+        assert anonymizer.deanonymize("nothing to see here") == "nothing to see here"
+
+    storage.get_all_mappings.assert_not_called()
+    assert storage.iter_mappings.call_count == 1
+
+
+def test_later_refreshes_read_only_new_mappings():
+    anonymizer = _anonymizer(refresh_interval=None)
+    anonymizer.storage = storage = mock.Mock(wraps=MemoryAdapter())
+
+    anonymizer.refresh_fake_data_index()
+    anonymizer.refresh_fake_data_index()
+
+    first, second = storage.iter_mappings.call_args_list
+    assert first.kwargs["created_since"] is None
+    assert second.kwargs["created_since"] is not None
+
+
+def test_fake_data_index_is_bounded():
+    reader = _anonymizer(max_size=3, refresh_interval=None)
+    reader.storage.batch_store_mappings({"Fake One": "a", "Fake Two": "b", "Fake Three": "c"})
+    reader.refresh_fake_data_index()
+    assert len(reader.fake_data_index) == 3
+
+    reader._add_fake_data(["Fake Four"])
+    assert len(reader.fake_data_index) == 3
+    assert reader.deanonymize("Fake One") == "Fake One"
+
+    # Evicted values are found again after a re-read
+    reader.refresh_fake_data_index()
+    assert reader.deanonymize("Fake One") == "a"
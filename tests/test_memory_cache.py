@@ -0,0 +1,265 @@
+import math
+import threading
+
+import pytest
+
+from reversible_anonymizer.cache import memory_cache
+from reversible_anonymizer.cache.expiry import TimingWheel
+from reversible_anonymizer.cache.memory_cache import MemoryCacheAdapter
+from reversible_anonymizer.cache.tinylfu import FrequencySketch
+from reversible_anonymizer.common import ConfigurationError
+
+
+def test_lru_evicts_least_recently_used():
+    cache = MemoryCacheAdapter(capacity=3, shards=1)
+    cache.batch_put({"a": "1", "b": "2", "c": "3"})
+
+    assert cache.get("a") == "1"
+    cache.put("d", "4")
+
+    assert cache.get("b") is None
+    assert cache.batch_get(["a", "b", "c", "d"]) == {"a": "1", "c": "3", "d": "4"}
+    assert len(cache) == 3
+
+
+def test_capacity_is_split_over_shards_exactly():
+    cache = MemoryCacheAdapter(capacity=10, shards=4)
+    assert sum(shard.capacity for shard in cache._shards) == 10
+
+    cache.batch_put({f"key-{i}": str(i) for i in range(100)})
+    assert len(cache) <= 10
+
+    # Never more shards than items
+    assert len(MemoryCacheAdapter(capacity=3, shards=16)._shards) == 3
+
+
+def test_concurrent_writers_respect_capacity():
+    cache = MemoryCacheAdapter(capacity=200, shards=8)
+
+    def worker(offset):
+        for i in range(1000):
+            key = f"key-{(offset * 1000 + i) % 600}"
+            cache.put(key, key)
+            value = cache.get(key)
+            assert value is None or value == key
+
+    threads = [threading.Thread(target=worker, args=(n,)) for n in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(cache) <= 200
+    assert all(key == value for key, value in cache.batch_get([f"key-{i}" for i in range(600)]).items())
+
+
+def test_delete_and_clear():
+    cache = MemoryCacheAdapter(capacity=10)
+    cache.put("a", "1")
+
+    assert cache.delete("a")
+    assert not cache.delete("a")
+    cache.put("b", "2")
+    cache.clear()
+    assert len(cache) == 0
+    assert cache.get("b") is None
+
+
+def test_stats_counters():
+    cache = MemoryCacheAdapter(capacity=2, shards=1)
+    cache.batch_put({"a": "1", "b": "2"})
+    cache.get("a")
+    cache.get("missing")
+    cache.batch_get(["a", "b", "other"])
+    cache.put("c", "3")
+
+    stats = cache.get_stats()
+    assert stats["hits"] == 3
+    assert stats["misses"] == 2
+    assert stats["hit_rate"] == pytest.approx(0.6)
+    assert stats["evictions"] == 1
+    assert stats["total_items"] == 2
+    assert stats["usage_percent"] == 100
+    assert stats["shards"] == 1
+
+
+def test_stats_of_an_unused_cache():
+    stats = MemoryCacheAdapter(capacity=10).get_stats()
+    assert (stats["hits"], stats["misses"], stats["hit_rate"], stats["total_items"]) == (0, 0, 0.0, 0)
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 1_000_000.0
+
+    def time(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = _Clock()
+    monkeypatch.setattr(memory_cache, "time", clock)
+    return clock
+
+
+def test_entries_expire_at_their_own_ttl(clock):
+    cache = MemoryCacheAdapter(capacity=10, default_ttl=60, shards=1)
+    cache.put("short", "1", ttl=5)
+    cache.put("default", "2")
+    cache.put("forever", "3", ttl=0)
+
+    clock.now += 10
+    assert cache.get("short") is None
+    assert cache.get("default") == "2"
+
+    clock.now += 3600
+    assert cache.batch_get(["short", "default", "forever"]) == {"forever": "3"}
+    assert cache.get_stats()["expirations"] == 2
+
+
+def test_expire_reclaims_without_lookups(clock):
+    cache = MemoryCacheAdapter(capacity=100, default_ttl=30, shards=1)
+    cache.batch_put({f"old-{i}": "x" for i in range(20)})
+    cache.put("kept", "y", ttl=300)
+
+    clock.now += 31
+    assert cache.expire() == 20
+    assert len(cache) == 1
+    assert cache.get_stats()["expirations"] == 20
+
+
+def test_rewritten_entry_keeps_its_new_expiry(clock):
+    cache = MemoryCacheAdapter(capacity=10, shards=1)
+    cache.put("key", "old", ttl=5)
+    clock.now += 4
+    cache.put("key", "new", ttl=60)
+
+    clock.now += 5
+    assert cache.expire() == 0
+    assert cache.get("key") == "new"
+
+
+def test_writes_reclaim_expired_entries(clock):
+    cache = MemoryCacheAdapter(capacity=10, shards=1)
+    cache.batch_put({"a": "1", "b": "2"}, ttl=5)
+
+    clock.now += 6
+    cache.put("c", "3")
+    assert len(cache) == 1
+
+
+def test_timing_wheel_orders_buckets():
+    wheel = TimingWheel(resolution=1.0)
+    wheel.schedule("late", 30.5)
+    wheel.schedule("early", 10.2)
+    wheel.schedule("early-too", 10.9)
+
+    assert wheel.next_due() == 11.0
+    assert sorted(wheel.due(20.0)) == ["early", "early-too"]
+    assert list(wheel.due(20.0)) == []
+    assert len(wheel) == 1
+    assert list(wheel.due(31.0)) == ["late"]
+    assert wheel.next_due() == math.inf
+
+
+def _accounted_bytes(cache):
+    return sum(entry.size for shard in cache._shards for entry in shard.entries.values())
+
+
+@pytest.mark.parametrize("policy", ["lru", "tinylfu"])
+def test_byte_budget_is_never_exceeded(policy):
+    cache = MemoryCacheAdapter(max_bytes=20_000, shards=2, policy=policy)
+    for i in range(2000):
+        cache.put(f"key-{i}", "v" * (i % 300))
+        if i % 3 == 0:
+            cache.delete(f"key-{i - 1}")
+
+    stats = cache.get_stats()
+    assert 0 < stats["bytes_used"] <= 20_000
+    assert stats["bytes_used"] == _accounted_bytes(cache)
+    assert stats["capacity"] is None
+    assert stats["usage_percent"] == pytest.approx(stats["bytes_used"] / 200)
+
+
+def test_entry_larger_than_the_budget_is_rejected():
+    cache = MemoryCacheAdapter(max_bytes=4_000, shards=1)
+    cache.put("small", "x")
+
+    assert not cache.put("huge", "x" * 5_000)
+    assert not cache.batch_put({"huge": "x" * 5_000, "fine": "y"})
+    assert cache.batch_get(["small", "huge", "fine"]) == {"small": "x", "fine": "y"}
+
+
+def test_byte_budget_evicts_by_size_not_count():
+    cache = MemoryCacheAdapter(max_bytes=6_000, shards=1)
+    cache.batch_put({f"small-{i}": "s" for i in range(10)})
+    assert len(cache) == 10
+
+    cache.put("large", "l" * 4_000)
+    assert cache.get("large") is not None
+    assert len(cache) < 10
+    assert cache.get_stats()["bytes_used"] <= 6_000
+
+
+def test_interned_values_are_shared():
+    cache = MemoryCacheAdapter(capacity=10, shards=1, intern_values=True)
+    cache.put("a", "".join(["shared ", "value"]))
+    cache.put("b", "".join(["shared ", "value"]))
+
+    assert cache.get("a") is cache.get("b")
+
+
+def _hot_keys_after_scan(policy):
+    cache = MemoryCacheAdapter(capacity=100, shards=1, policy=policy)
+    hot = [f"hot-{i}" for i in range(50)]
+    for _ in range(5):
+        cache.batch_put({key: key for key in hot})
+        cache.batch_get(hot)
+    for i in range(1000):
+        cache.put(f"scan-{i}", "x")
+    return cache, len(cache.batch_get(hot))
+
+
+def test_tinylfu_keeps_frequent_keys_through_a_scan():
+    cache, survivors = _hot_keys_after_scan("tinylfu")
+
+    assert survivors >= 45
+    assert _hot_keys_after_scan("lru")[1] == 0
+    assert len(cache) <= 100
+
+
+def test_tinylfu_segments_stay_consistent():
+    cache = MemoryCacheAdapter(capacity=50, shards=1, policy="tinylfu")
+    for i in range(3000):
+        key = f"key-{(i * 7919) % 400}"
+        if i % 5 == 0:
+            cache.delete(key)
+        elif i % 2:
+            cache.get(key)
+        else:
+            cache.put(key, key)
+
+    shard = cache._shards[0]
+    segment_keys = [key for order in shard.segments for key in order]
+    assert sorted(segment_keys) == sorted(shard.entries)
+    assert shard.used == [len(order) for order in shard.segments]
+    assert sum(shard.used) <= shard.limit
+    assert shard.bytes == _accounted_bytes(cache)
+
+
+def test_frequency_sketch_saturates_and_ages():
+    sketch = FrequencySketch(expected_entries=16)
+    for _ in range(20):
+        sketch.increment("popular")
+    assert sketch.frequency("popular") == 15
+
+    # Ten accesses per expected entry halve every counter
+    for _ in range(140):
+        sketch.increment("popular")
+    assert sketch.frequency("popular") == 7
+
+
+def test_unknown_policy():
+    with pytest.raises(ConfigurationError):
+        MemoryCacheAdapter(policy="lfu")
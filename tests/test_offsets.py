@@ -0,0 +1,19 @@
+from reversible_anonymizer.detection.offsets import OffsetIndex, utf8_length
+
+
+def test_offset_index_maps_utf8_bytes_to_characters():
+    text = "aé東😀b Zoë"
+    index = OffsetIndex(text)
+    encoded = text.encode("utf-8")
+
+    for char_offset in range(len(text) + 1):
+        byte_offset = len(text[:char_offset].encode("utf-8"))
+        assert index.to_char(byte_offset) == char_offset
+    assert index.to_char(len(encoded)) == len(text)
+
+
+def test_offset_index_ascii_is_identity():
+    index = OffsetIndex("plain")
+    assert [index.to_char(offset) for offset in range(6)] == list(range(6))
+    assert utf8_length("plain") == 5
+    assert utf8_length("Zoë") == 4
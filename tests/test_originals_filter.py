@@ -0,0 +1,142 @@
+import threading
+
+import pytest
+
+from reversible_anonymizer import ReversibleAnonymizer
+from reversible_anonymizer.storage.base import MemoryAdapter
+from reversible_anonymizer.storage.originals_filter import OriginalsFilter
+
+ORIGINALS = [f"person-{i}@example.com" for i in range(2000)]
+
+
+def test_added_originals_are_always_candidates():
+    originals_filter = OriginalsFilter(expected_items=2000, false_positive_rate=0.01)
+    originals_filter.add_many(ORIGINALS)
+
+    assert all(original in originals_filter for original in ORIGINALS)
+    assert originals_filter.split(ORIGINALS[:50]) == ORIGINALS[:50]
+
+
+def test_false_positive_rate_is_near_the_target():
+    originals_filter = OriginalsFilter(expected_items=2000, false_positive_rate=0.01)
+    originals_filter.add_many(ORIGINALS)
+
+    probes = [f"stranger-{i}@example.com" for i in range(20_000)]
+    false_positives = sum(probe in originals_filter for probe in probes)
+
+    assert false_positives / len(probes) < 0.03
+    assert originals_filter.get_stats()["estimated_false_positive_rate"] == pytest.approx(0.01, rel=0.2)
+
+
+def test_split_counts_checks_and_skips():
+    originals_filter = OriginalsFilter(expected_items=100)
+    originals_filter.add_many(["known"])
+
+    assert originals_filter.split(["known", "new-1", "new-2"]) == ["known"]
+    originals_filter.record_false_positives(1)
+    stats = originals_filter.get_stats()
+    assert (stats["checks"], stats["skipped_lookups"], stats["false_positives"]) == (3, 2, 1)
+
+
+def test_secret_changes_positions():
+    assert OriginalsFilter(100)._positions("x") != OriginalsFilter(100, secret="s3cret")._positions("x")
+
+
+def test_populate_reads_storage_in_pages():
+    storage = MemoryAdapter()
+    storage.batch_store_mappings({f"fake-{i}": original for i, original in enumerate(ORIGINALS)})
+    originals_filter = OriginalsFilter(expected_items=2000)
+
+    assert originals_filter.populate(storage, page_size=300) == len(ORIGINALS)
+    assert all(original in originals_filter for original in ORIGINALS)
+
+
+def test_processes_share_additions_through_the_file(tmp_path):
+    path = str(tmp_path / "originals.bloom")
+    first = OriginalsFilter(expected_items=1000, path=path, save_interval=None, refresh_interval=0)
+    second = OriginalsFilter(expected_items=1000, path=path, save_interval=None, refresh_interval=0)
+
+    first.add_many(["from-first"])
+    first.save()
+    second.add_many(["from-second"])
+    second.save()
+
+    # The second save merged the first; a re-read picks up the second
+    assert first.split(["from-first", "from-second"]) == ["from-first", "from-second"]
+    assert OriginalsFilter(expected_items=1000, path=path).loaded
+
+
+def test_file_with_another_layout_is_ignored(tmp_path):
+    path = str(tmp_path / "originals.bloom")
+    small = OriginalsFilter(expected_items=10, path=path, save_interval=None)
+    small.add_many(["x"])
+    small.save()
+
+    large = OriginalsFilter(expected_items=1000, path=path)
+    assert not large.loaded
+    assert "x" not in large
+
+
+def test_memory_claims_are_atomic():
+    storage = MemoryAdapter()
+    results = {}
+
+    def claim(n):
+        results[n] = storage.claim_mapping_records([(f"fake-{n}", "jane@example.com", None)])
+
+    threads = [threading.Thread(target=claim, args=(n,)) for n in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    (winner,) = storage.get_all_mappings()
+    assert [n for n, existing in results.items() if not existing] == [int(winner.split("-")[1])]
+    assert all(existing in ({}, {"jane@example.com": winner}) for existing in results.values())
+
+
+def _anonymizer(**options):
+    return ReversibleAnonymizer(
+        project="test-project",
+        info_types=["EMAIL_ADDRESS"],
+        check_services=False,
+        storage_type="memory",
+        detector="local",
+        use_realistic_fake_data=False,
+        **options
+    )
+
+
+def test_concurrent_writers_agree_on_one_mapping():
+    first = _anonymizer(originals_filter={"expected_items": 1000})
+    second = _anonymizer(originals_filter={"expected_items": 1000})
+    second.storage = first.storage
+    second._generate_fake_data = lambda info_type, original: "EMAIL-other@example.com"
+
+    text = "mail jane@example.com"
+    anonymized = first.anonymize(text)
+
+    # The second filter never saw jane; the claim makes it adopt the stored fake
+    result = second.anonymize(text, detailed_result=True)
+    assert result["anonymized_text"] == anonymized
+    assert result["stats"]["claim_conflicts"] == 1
+    assert len(first.storage.get_all_mappings()) == 1
+    assert second.deanonymize(anonymized) == text
+
+
+def test_single_writer_skips_lookups_of_new_originals():
+    anonymizer = _anonymizer(originals_filter={"expected_items": 1000, "single_writer": True})
+
+    anonymizer.anonymize("mail jane@example.com and john@example.com")
+
+    assert anonymizer.originals_filter.get_stats()["skipped_lookups"] == 2
+    assert not anonymizer._claim_new_mappings
+
+
+def test_filter_does_not_skip_without_claims():
+    anonymizer = _anonymizer(originals_filter={"expected_items": 1000}, async_storage_updates=True)
+    with anonymizer:
+        anonymizer.anonymize("mail jane@example.com")
+
+    assert not anonymizer._claim_new_mappings
+    assert anonymizer.originals_filter.get_stats()["checks"] == 0
@@ -0,0 +1,99 @@
+import pytest
+
+from reversible_anonymizer.cache import pymemcache_adapter
+from reversible_anonymizer.cache.pymemcache_adapter import PymemcacheAdapter
+
+NODES = ["10.0.0.1:11211", "10.0.0.2:11211", "10.0.0.3:11211"]
+KEYS = {f"f2o:fake-{i}": f"original-{i} Zoë" for i in range(60)}
+
+
+class FakePooledClient:
+    """pymemcache PooledClient over a dict per node, recording the calls it gets."""
+
+    stores = {}
+
+    def __init__(self, server, **options):
+        self.store = self.stores.setdefault(server, {})
+        self.options = options
+        self.calls = []
+
+    def get(self, key):
+        self.calls.append(("get", None))
+        return self.store.get(key)
+
+    def get_many(self, keys):
+        self.calls.append(("get_many", None))
+        return {key: self.store[key] for key in keys if key in self.store}
+
+    def set(self, key, value, expire=0, noreply=None):
+        self.calls.append(("set", noreply))
+        self.store[key] = value if isinstance(value, bytes) else value.encode("utf-8")
+        return True
+
+    def set_many(self, values, expire=0, noreply=None):
+        self.calls.append(("set_many", noreply))
+        for key, value in values.items():
+            self.store[key] = value
+        return []
+
+    def delete(self, key, noreply=None):
+        return self.store.pop(key, None) is not None
+
+    def close(self):
+        pass
+
+
+@pytest.fixture
+def create(monkeypatch):
+    FakePooledClient.stores = {}
+    monkeypatch.setattr(pymemcache_adapter, "PooledClient", FakePooledClient, raising=False)
+    monkeypatch.setattr(PymemcacheAdapter, "client_available", True)
+    adapters = []
+
+    def create_adapter(**options):
+        adapter = PymemcacheAdapter("test-project", servers=NODES, check_service=False, **options)
+        for client in adapter._topology[1].values():
+            client.calls.clear()
+        adapters.append(adapter)
+        return adapter
+
+    yield create_adapter
+    for adapter in adapters:
+        adapter.close()
+
+
+def _calls(adapter):
+    return [call for client in adapter._topology[1].values() for call in client.calls]
+
+
+def test_pipelined_get_many_matches_single_key_calls(create):
+    adapter = create()
+    assert adapter.batch_put(KEYS)
+
+    batch = adapter.batch_get(list(KEYS) + ["f2o:missing"])
+    assert [name for name, _ in _calls(adapter)].count("get_many") == len(NODES)
+    assert [name for name, _ in _calls(adapter)].count("get") == 0
+
+    single = {key: adapter.get(key) for key in list(KEYS) + ["f2o:missing"]}
+    assert batch == {key: value for key, value in single.items() if value is not None} == KEYS
+    # Keys are spread over every node
+    assert all(store for store in FakePooledClient.stores.values())
+
+
+def test_batch_put_is_one_set_many_per_node(create):
+    adapter = create()
+    adapter.batch_put(KEYS)
+
+    assert sorted(_calls(adapter)) == [("set_many", False)] * len(NODES)
+
+
+def test_noreply_writes_go_through(create):
+    adapter = create(noreply=True)
+
+    assert adapter.put("o2f:Jane Roe", "Fake One")
+    assert adapter.batch_put(KEYS)
+
+    assert {noreply for name, noreply in _calls(adapter) if name.startswith("set")} == {True}
+    assert adapter.get("o2f:Jane Roe") == "Fake One"
+    assert adapter.batch_get(list(KEYS)) == KEYS
+    assert adapter.get_stats()["noreply"] is True
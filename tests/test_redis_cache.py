@@ -0,0 +1,87 @@
+from unittest import mock
+
+import pytest
+
+from reversible_anonymizer.cache import redis_adapter
+
+fakeredis = pytest.importorskip("fakeredis")
+
+KEYS = {f"f2o:fake-{i}": f"original-{i}" for i in range(40)}
+
+
+@pytest.fixture
+def adapter(monkeypatch):
+    server = fakeredis.FakeServer()
+
+    def fake_redis(host=None, port=None, db=0, max_connections=None, **options):
+        return fakeredis.FakeRedis(server=server, db=db, **options)
+
+    monkeypatch.setattr(redis_adapter.redis, "Redis", fake_redis)
+    return redis_adapter.RedisCacheAdapter(default_ttl=3600)
+
+
+def test_batch_get_is_one_mget(adapter):
+    adapter.batch_put(KEYS)
+
+    with mock.patch.object(adapter.client, "mget", wraps=adapter.client.mget) as mget, \
+            mock.patch.object(adapter.client, "get", wraps=adapter.client.get) as get:
+        found = adapter.batch_get(list(KEYS) + ["f2o:missing"])
+
+    assert found == KEYS
+    assert mget.call_count == 1
+    get.assert_not_called()
+    assert (adapter.get_stats()["hits"], adapter.get_stats()["misses"]) == (40, 1)
+
+
+def test_batch_put_is_one_pipeline(adapter):
+    with mock.patch.object(adapter.client, "pipeline", wraps=adapter.client.pipeline) as pipeline, \
+            mock.patch.object(adapter.client, "set", wraps=adapter.client.set) as single_set:
+        assert adapter.batch_put(KEYS)
+
+    assert pipeline.call_count == 1
+    single_set.assert_not_called()
+    assert all(adapter.get(key) == value for key, value in KEYS.items())
+
+
+def test_keys_on_the_wire_are_digests(adapter):
+    adapter.put("o2f:Jane Roe", "fake")
+
+    (key,) = adapter.client.keys("*")
+    assert key == adapter.key_codec.encode("o2f:Jane Roe")
+    assert "Jane" not in key
+
+
+def test_ttl(adapter):
+    adapter.put("default", "v")
+    adapter.put("short", "v", ttl=60)
+    adapter.put("forever", "v", ttl=0)
+    adapter.batch_put({"batch": "v"}, ttl=120)
+
+    def ttl(key):
+        return adapter.client.ttl(adapter.key_codec.encode(key))
+
+    assert 3590 < ttl("default") <= 3600
+    assert 50 < ttl("short") <= 60
+    assert ttl("forever") == -1
+    assert 110 < ttl("batch") <= 120
+
+
+def test_slot_grouped_batches_match_single_key_calls(adapter):
+    adapter.batch_put(KEYS)
+    single = {key: adapter.get(key) for key in list(KEYS) + ["f2o:missing"]}
+
+    # On a cluster, keys are grouped per hash slot and the MGETs pipelined
+    adapter.cluster = True
+    groups = adapter._slot_groups([adapter.key_codec.encode(key) for key in KEYS])
+    assert len(groups) > 1
+    assert sorted(key for group in groups for key in group) == sorted(adapter.key_codec.encode(key) for key in KEYS)
+
+    with mock.patch.object(adapter.client, "pipeline", wraps=adapter.client.pipeline) as pipeline:
+        grouped = adapter.batch_get(list(KEYS) + ["f2o:missing"])
+
+    assert pipeline.call_count == 1
+    assert grouped == {key: value for key, value in single.items() if value is not None}
+
+    adapter.batch_put({"f2o:fake-0": "changed", "f2o:new": "added"})
+    assert adapter.get("f2o:fake-0") == "changed"
+    assert adapter.get("f2o:new") == "added"
@@ -0,0 +1,40 @@
+from reversible_anonymizer.replacement import Replacement, SpanMap, apply_replacements, remove_overlaps
+
+
+def test_remove_overlaps_keeps_the_earliest_then_longest():
+    spans = [Replacement(5, 9, "b"), Replacement(0, 4, "a"), Replacement(5, 12, "c"), Replacement(10, 14, "d")]
+
+    assert remove_overlaps(spans) == [Replacement(0, 4, "a"), Replacement(5, 12, "c")]
+
+
+def test_adjacent_spans_are_both_kept():
+    spans = [Replacement(3, 6, "y"), Replacement(0, 3, "x"), Replacement(6, 6, "")]
+
+    assert remove_overlaps(spans) == [Replacement(0, 3, "x"), Replacement(3, 6, "y"), Replacement(6, 6, "")]
+    assert apply_replacements("abcdef", [Replacement(0, 3, "X"), Replacement(3, 6, "Y")])[0] == "XY"
+
+
+def test_length_changing_replacements_and_span_map():
+    text = "Hi Jane Roe, mail jane@example.com now"
+    replacements = [Replacement(18, 34, "e@x.io"), Replacement(3, 11, "Alexandra Smithson")]
+
+    output, span_map = apply_replacements(text, replacements)
+
+    assert output == "Hi Alexandra Smithson, mail e@x.io now"
+    assert span_map == [SpanMap(3, 11, 3, 21), SpanMap(18, 34, 28, 34)]
+    for entry, replacement in zip(span_map, sorted(replacements)):
+        assert output[entry.output_start:entry.output_end] == replacement.text
+        assert text[entry.source_start:entry.source_end] in ("Jane Roe", "jane@example.com")
+
+
+def test_overlapping_replacements_are_dropped_from_output_and_map():
+    output, span_map = apply_replacements("abcdefgh", [Replacement(2, 6, "[1]"), Replacement(4, 8, "[2]")])
+
+    assert output == "ab[1]gh"
+    assert span_map == [SpanMap(2, 6, 2, 5)]
+
+
+def test_no_replacements_return_the_text_unchanged():
+    assert apply_replacements("unchanged", []) == ("unchanged", [])
+    assert apply_replacements("", []) == ("", [])
+    assert apply_replacements("abc", [Replacement(0, 3, "")]) == ("", [SpanMap(0, 3, 0, 0)])
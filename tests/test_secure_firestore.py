@@ -0,0 +1,113 @@
+import base64
+import hashlib
+import hmac
+import importlib.util
+import os
+import types
+
+import pytest
+
+from reversible_anonymizer.storage import firestore_adapter
+from reversible_anonymizer.storage.secure_firestore_adapter import BLIND_INDEX_FIELD, SecureFirestoreAdapter
+
+from .fake_firestore import FakeFirestore
+
+KEY = "encryption-key"
+
+
+class ReversingCipher:
+    """Stands in for Fernet: anything with encrypt and decrypt over bytes."""
+
+    def encrypt(self, data):
+        return base64.b64encode(data[::-1])
+
+    def decrypt(self, token):
+        return base64.b64decode(token)[::-1]
+
+
+@pytest.fixture(autouse=True)
+def fake_firestore(monkeypatch):
+    monkeypatch.setattr(firestore_adapter, "firestore", types.SimpleNamespace(
+        Client=FakeFirestore, AsyncClient=FakeFirestore, SERVER_TIMESTAMP="server-timestamp"
+    ))
+
+
+def _adapter(encrypted=True, **options):
+    adapter = SecureFirestoreAdapter("test-project", "mappings", encryption_key=KEY, **options)
+    # A real key needs the cryptography package; any cipher does for the adapter
+    adapter.fernet = ReversingCipher()
+    adapter.encryption_enabled = encrypted
+    return adapter
+
+
+def test_blind_index_key_is_derived_from_the_encryption_key():
+    first, second = _adapter(), _adapter()
+
+    assert first._blind_index_key != KEY.encode()
+    assert first._blind_index_key == hmac.new(
+        KEY.encode(), b"reversible-anonymizer blind index", hashlib.sha256
+    ).digest()
+    assert first.blind_index("Jane Roe") == second.blind_index("Jane Roe")
+    assert first.blind_index("Jane Roe") != _adapter(blind_index_key="other").blind_index("Jane Roe")
+
+
+def test_documents_hold_ciphertext_and_the_blind_index():
+    adapter = _adapter()
+    adapter.store_mapping("fake-1", "Jane Roe")
+
+    document = adapter.db.data["mappings"]["fake-1"]
+    assert "Jane Roe" not in str(document)
+    assert document[BLIND_INDEX_FIELD] == adapter.blind_index("Jane Roe")
+    assert adapter.get_original_data("fake-1") == "Jane Roe"
+
+
+def test_reverse_lookups_query_the_blind_index_in_chunks_of_ten():
+    adapter = _adapter()
+    originals = [f"person-{i}" for i in range(25)]
+    adapter.batch_store_mappings({f"fake-{i}": original for i, original in enumerate(originals)})
+
+    found = adapter.batch_get_fake_data_for_originals(originals + ["stranger"])
+
+    assert found == {original: f"fake-{i}" for i, original in enumerate(originals)}
+    in_queries = [query for query in adapter.db.queries if query and query[0][1] == "in"]
+    assert [len(query[0][2]) for query in in_queries] == [10, 10, 6]
+    assert all(query[0][0] == BLIND_INDEX_FIELD for query in in_queries)
+
+
+def test_plaintext_when_encryption_is_off():
+    adapter = _adapter(encrypted=False)
+    adapter.store_mapping("fake-1", "Jane Roe")
+
+    document = adapter.db.data["mappings"]["fake-1"]
+    assert document["original_data"] == "Jane Roe"
+    assert BLIND_INDEX_FIELD not in document
+    assert adapter.batch_get_fake_data_for_originals(["Jane Roe"]) == {"Jane Roe": "fake-1"}
+    assert adapter.db.queries[-1][0][0] == "original_data"
+
+
+def _load_backfill_tool():
+    path = os.path.join(os.path.dirname(__file__), os.pardir, "tools", "backfill_blind_index.py")
+    spec = importlib.util.spec_from_file_location("backfill_blind_index", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def test_backfill_skips_indexed_documents():
+    backfill = _load_backfill_tool().backfill
+    adapter = _adapter()
+    adapter.store_mapping("fake-new", "Jane Roe")
+    collection = adapter.db.data["mappings"]
+    collection["fake-old"] = {"original_data": adapter._encrypt("John Doe")}
+    collection["fake-new"][BLIND_INDEX_FIELD] = "kept"
+
+    counts = backfill(adapter, page_size=1, batch_size=500, force=False, dry_run=False)
+
+    assert counts == {"scanned": 2, "indexed": 1, "already_indexed": 1, "failed": 0}
+    assert collection["fake-old"][BLIND_INDEX_FIELD] == adapter.blind_index("John Doe")
+    assert collection["fake-new"][BLIND_INDEX_FIELD] == "kept"
+    assert adapter.batch_get_fake_data_for_originals(["John Doe"]) == {"John Doe": "fake-old"}
+
+    # With force, existing indexes are recomputed
+    backfill(adapter, page_size=1, batch_size=500, force=True, dry_run=False)
+    assert collection["fake-new"][BLIND_INDEX_FIELD] == adapter.blind_index("Jane Roe")
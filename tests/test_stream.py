@@ -0,0 +1,60 @@
+import io
+
+import pytest
+
+from reversible_anonymizer import ConfigurationError, ReversibleAnonymizer
+
+TEXT = "".join(
+    f"Line {i}: Zoë wrote from user{i}@example.com, SSN 123-45-{6000 + i:04d}, "
+    f"card 4111 1111 1111 1111.\n"
+    for i in range(40)
+)
+
+
+@pytest.fixture
+def anonymizer():
+    return ReversibleAnonymizer(
+        project="test-project",
+        info_types=["EMAIL_ADDRESS", "US_SOCIAL_SECURITY_NUMBER", "CREDIT_CARD_NUMBER"],
+        check_services=False,
+        storage_type="memory",
+        detector="local",
+        use_realistic_fake_data=False
+    )
+
+
+def _chunks(text, size):
+    return [text[i:i + size] for i in range(0, len(text), size)]
+
+
+@pytest.mark.parametrize("chunk_size, overlap, read_size", [(64, 40, 7), (200, 60, 1000), (4096, 512, 13)])
+def test_stream_round_trip(anonymizer, chunk_size, overlap, read_size):
+    anonymized = "".join(anonymizer.anonymize_stream(_chunks(TEXT, read_size), chunk_size=chunk_size, overlap=overlap))
+
+    assert "@example.com" in anonymized
+    assert "user7@example.com" not in anonymized
+    assert "123-45-6007" not in anonymized
+    assert "4111 1111 1111 1111" not in anonymized
+    assert anonymized == anonymizer.anonymize(TEXT)
+    assert anonymizer.deanonymize(anonymized) == TEXT
+
+
+def test_stream_handles_empty_and_entity_free_input(anonymizer):
+    assert list(anonymizer.anonymize_stream([])) == []
+    assert "".join(anonymizer.anonymize_stream(["no ", "", "sensitive data"], chunk_size=4, overlap=2)) == (
+        "no sensitive data"
+    )
+
+
+def test_anonymize_file(anonymizer):
+    output = io.StringIO()
+
+    stats = anonymizer.anonymize_file(io.StringIO(TEXT), output, chunk_size=128, overlap=48)
+
+    assert stats["total_findings"] == 120
+    assert anonymizer.deanonymize(output.getvalue()) == TEXT
+
+
+def test_stream_rejects_overlap_not_below_chunk_size(anonymizer):
+    with pytest.raises(ConfigurationError):
+        list(anonymizer.anonymize_stream([TEXT], chunk_size=10, overlap=10))
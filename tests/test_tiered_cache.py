@@ -0,0 +1,71 @@
+from unittest import mock
+
+from reversible_anonymizer.cache.memory_cache import MemoryCacheAdapter
+from reversible_anonymizer.cache.tiered_cache import TieredCacheAdapter
+
+
+def _tiered(l1_ttl=None):
+    return TieredCacheAdapter(l1=MemoryCacheAdapter(shards=1), l2=MemoryCacheAdapter(shards=1), l1_ttl=l1_ttl)
+
+
+def test_reads_fill_l1_from_l2():
+    cache = _tiered()
+    cache.l2.put("shared", "from another process")
+
+    assert cache.get("shared") == "from another process"
+    assert cache.l1.get("shared") == "from another process"
+
+    # Served from L1 now: L2 is not asked again
+    with mock.patch.object(cache.l2, "get") as l2_get:
+        assert cache.get("shared") == "from another process"
+    l2_get.assert_not_called()
+
+    assert cache.get("missing") is None
+    stats = cache.get_stats()
+    assert (stats["l1_hits"], stats["l2_hits"], stats["misses"]) == (1, 1, 1)
+
+
+def test_batch_reads_ask_l2_only_for_l1_misses():
+    cache = _tiered()
+    cache.l1.put("near", "1")
+    cache.l2.batch_put({"near": "stale", "far": "2"})
+
+    with mock.patch.object(cache.l2, "batch_get", wraps=cache.l2.batch_get) as l2_batch_get:
+        assert cache.batch_get(["near", "far", "missing"]) == {"near": "1", "far": "2"}
+    l2_batch_get.assert_called_once_with(["far", "missing"])
+    assert cache.l1.get("far") == "2"
+
+    stats = cache.get_stats()
+    assert (stats["l1_hits"], stats["l2_hits"], stats["misses"]) == (1, 1, 1)
+
+
+def test_writes_go_through_to_both_tiers():
+    cache = _tiered()
+    cache.put("one", "1")
+    cache.batch_put({"two": "2", "three": "3"})
+
+    for tier in (cache.l1, cache.l2):
+        assert tier.batch_get(["one", "two", "three"]) == {"one": "1", "two": "2", "three": "3"}
+
+
+def test_delete_and_clear_reach_l1():
+    cache = _tiered()
+    cache.batch_put({"one": "1", "two": "2"})
+
+    assert cache.delete("one")
+    assert cache.get("one") is None
+    assert cache.l1.get("one") is None and cache.l2.get("one") is None
+
+    cache.clear()
+    assert cache.batch_get(["two"]) == {}
+    assert cache.l1.get("two") is None
+
+
+def test_l1_ttl_caps_near_entries():
+    cache = _tiered(l1_ttl=5)
+
+    with mock.patch.object(cache.l1, "put", wraps=cache.l1.put) as l1_put:
+        cache.put("long", "v", ttl=3600)
+        cache.put("short", "v", ttl=2)
+        cache.put("forever", "v", ttl=0)
+    assert [call.args[2] for call in l1_put.call_args_list] == [5, 2, 5]
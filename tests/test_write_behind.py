@@ -0,0 +1,240 @@
+import base64
+import json
+import threading
+
+import pytest
+
+from reversible_anonymizer import ReversibleAnonymizer, StorageError
+from reversible_anonymizer.storage.base import MemoryAdapter
+from reversible_anonymizer.storage.write_behind import WriteBehindBuffer
+
+
+class RecordingAdapter(MemoryAdapter):
+    """Memory storage counting batch writes, optionally blocked until released."""
+
+    def __init__(self):
+        super().__init__()
+        self.batches = []
+        self.release = threading.Event()
+        self.release.set()
+
+    def batch_store_mapping_records(self, records):
+        self.release.wait()
+        self.batches.append(list(records))
+        super().batch_store_mapping_records(records)
+
+
+def _records(prefix, count):
+    return [(f"{prefix}-fake-{i}", f"{prefix}-original-{i}", {"run_id": prefix}) for i in range(count)]
+
+
+def test_submissions_are_batched_and_acknowledged():
+    storage = RecordingAdapter()
+    with WriteBehindBuffer(storage, max_batch_size=100, flush_interval=60) as buffer:
+        futures = [buffer.submit(_records(f"run{n}", 10)) for n in range(5)]
+        assert buffer.flush(timeout=5)
+
+        assert all(future.result(timeout=0) is None for future in futures)
+        assert len(storage.batches) == 1
+        assert storage.batch_get_originals(["run3-fake-7"]) == {"run3-fake-7": "run3-original-7"}
+        assert buffer.get_stats()["pending"] == 0
+
+
+def test_batches_are_capped_at_max_batch_size():
+    storage = RecordingAdapter()
+    storage.release.clear()
+    with WriteBehindBuffer(storage, max_batch_size=25, flush_interval=60) as buffer:
+        for n in range(6):
+            buffer.submit(_records(f"run{n}", 10))
+        storage.release.set()
+        assert buffer.flush(timeout=5)
+
+    assert sum(len(batch) for batch in storage.batches) == 60
+    assert all(len(batch) <= 25 for batch in storage.batches)
+
+
+def test_full_buffer_blocks_until_submit_timeout():
+    storage = RecordingAdapter()
+    storage.release.clear()
+    buffer = WriteBehindBuffer(storage, max_pending=10, flush_interval=60, submit_timeout=0.05)
+    try:
+        buffer.submit(_records("first", 10))
+        with pytest.raises(StorageError):
+            buffer.submit(_records("second", 1))
+        assert buffer.get_stats()["blocked_submits"] == 1
+    finally:
+        storage.release.set()
+        buffer.close()
+
+
+def test_submit_after_close_fails():
+    buffer = WriteBehindBuffer(MemoryAdapter())
+    buffer.close()
+
+    with pytest.raises(StorageError):
+        buffer.submit(_records("late", 1))
+    assert buffer.submit([]).result(timeout=0) is None
+
+
+def test_anonymizer_writes_each_run_in_one_batch():
+    anonymizer = ReversibleAnonymizer(
+        project="test-project",
+        info_types=["EMAIL_ADDRESS", "US_SOCIAL_SECURITY_NUMBER"],
+        check_services=False,
+        storage_type="memory",
+        detector="local",
+        use_realistic_fake_data=False
+    )
+    anonymizer.storage = storage = RecordingAdapter()
+
+    text = "a@example.com, b@example.com and SSN 123-45-6789"
+    anonymized = anonymizer.anonymize(text)
+
+    assert len(storage.batches) == 1
+    assert len(storage.batches[0]) == 3
+    assert anonymizer.deanonymize(anonymized) == text
+
+
+class FailingAdapter(MemoryAdapter):
+    def __init__(self, failures):
+        super().__init__()
+        self.failures = failures
+
+    def batch_store_mapping_records(self, records):
+        if self.failures:
+            self.failures -= 1
+            raise ConnectionError("backend unavailable")
+        super().batch_store_mapping_records(records)
+
+
+class ReversingCipher:
+    """Stands in for Fernet: anything with encrypt and decrypt over bytes."""
+
+    def encrypt(self, data):
+        return base64.b64encode(data[::-1])
+
+    def decrypt(self, token):
+        return base64.b64decode(token)[::-1]
+
+
+def test_failed_batches_are_retried():
+    storage = FailingAdapter(failures=2)
+    with WriteBehindBuffer(storage, max_retries=3, retry_backoff=0.001) as buffer:
+        buffer.submit(_records("run", 3)).result(timeout=5)
+
+    assert buffer.get_stats()["retries"] == 2
+    assert len(storage.get_all_mappings()) == 3
+
+
+def test_exhausted_retries_fail_the_future_with_storage_error():
+    with WriteBehindBuffer(FailingAdapter(failures=10), max_retries=1, retry_backoff=0.001) as buffer:
+        future = buffer.submit(_records("run", 2))
+        error = future.exception(timeout=5)
+
+    assert isinstance(error, StorageError)
+    assert isinstance(error.__cause__, ConnectionError)
+
+
+def test_repeated_fake_values_are_coalesced():
+    storage = RecordingAdapter()
+    with WriteBehindBuffer(storage, flush_interval=60) as buffer:
+        buffer.submit([("fake", "first", None)])
+        buffer.submit([("fake", "second", None)])
+        buffer.flush(timeout=5)
+
+    assert storage.batches == [[("fake", "second", None)]]
+    assert buffer.get_stats()["records_coalesced"] == 1
+
+
+def test_unacknowledged_submissions_are_replayed(tmp_path):
+    wal_path = str(tmp_path / "mappings.wal")
+    with WriteBehindBuffer(FailingAdapter(failures=10), max_retries=0, wal_path=wal_path) as buffer:
+        assert buffer.submit(_records("lost", 3)).exception(timeout=5) is not None
+
+    storage = MemoryAdapter()
+    with WriteBehindBuffer(storage, wal_path=wal_path) as buffer:
+        assert buffer.flush(timeout=5)
+        assert buffer.get_stats()["records_replayed"] == 3
+
+    assert storage.batch_get_originals(["lost-fake-1"]) == {"lost-fake-1": "lost-original-1"}
+
+    # Replayed and stored entries are not replayed again
+    with WriteBehindBuffer(MemoryAdapter(), wal_path=wal_path) as buffer:
+        assert buffer.get_stats()["records_replayed"] == 0
+
+
+def test_stored_submissions_are_not_replayed(tmp_path):
+    wal_path = str(tmp_path / "mappings.wal")
+    with WriteBehindBuffer(MemoryAdapter(), wal_path=wal_path) as buffer:
+        buffer.submit(_records("stored", 5)).result(timeout=5)
+
+    storage = RecordingAdapter()
+    with WriteBehindBuffer(storage, wal_path=wal_path) as buffer:
+        buffer.flush(timeout=5)
+    assert storage.batches == []
+
+
+def test_replay_after_a_crash_ignores_a_torn_line(tmp_path):
+    wal_path = tmp_path / "mappings.wal"
+    wal_path.write_text(
+        json.dumps({"seq": 0, "records": [["fake-0", "original-0", None]]}) + "\n"
+        + json.dumps({"seq": 1, "records": [["fake-1", "original-1", None]]}) + "\n"
+        + json.dumps({"ack": [0]}) + "\n"
+        + '{"seq": 2, "rec',
+        encoding="utf-8"
+    )
+
+    storage = MemoryAdapter()
+    with WriteBehindBuffer(storage, wal_path=str(wal_path)) as buffer:
+        buffer.flush(timeout=5)
+        buffer.submit([("fake-3", "original-3", None)]).result(timeout=5)
+
+    assert storage.get_all_mappings() == {"fake-1": "original-1", "fake-3": "original-3"}
+
+
+def test_log_entries_are_sealed_with_the_cipher(tmp_path):
+    wal_path = str(tmp_path / "mappings.wal")
+    with WriteBehindBuffer(
+            FailingAdapter(failures=10), max_retries=0, wal_path=wal_path, wal_cipher=ReversingCipher()
+    ) as buffer:
+        buffer.submit([("fake", "secret original", None)]).exception(timeout=5)
+
+    with open(wal_path, encoding="utf-8") as f:
+        content = f.read()
+    assert "secret original" not in content
+    assert '"sealed"' in content
+
+    # Sealed entries cannot be replayed without the cipher
+    with pytest.raises(StorageError):
+        WriteBehindBuffer(MemoryAdapter(), wal_path=wal_path)
+
+    storage = MemoryAdapter()
+    with WriteBehindBuffer(storage, wal_path=wal_path, wal_cipher=ReversingCipher()) as buffer:
+        buffer.flush(timeout=5)
+    assert storage.get_all_mappings() == {"fake": "secret original"}
+
+
+def test_async_storage_updates_are_flushed_on_close():
+    anonymizer = ReversibleAnonymizer(
+        project="test-project",
+        info_types=["EMAIL_ADDRESS"],
+        check_services=False,
+        storage_type="memory",
+        detector="local",
+        async_storage_updates=True,
+        write_behind={"flush_interval": 60}
+    )
+    with anonymizer:
+        anonymizer.anonymize("write to a@example.com or b@example.com")
+
+    assert len(anonymizer.storage.get_all_mappings()) == 2
+
+
+def test_encrypting_storage_seals_the_log_by_default(tmp_path):
+    fernet = pytest.importorskip("cryptography.fernet")
+    storage = MemoryAdapter()
+    storage.encryption_enabled = True
+    storage.fernet = fernet.Fernet(fernet.Fernet.generate_key())
+
+    with WriteBehindBuffer(storage, wal_path=str(tmp_path / "mappings.wal")) as buffer:
+        assert buffer.wal_cipher is storage.fernet
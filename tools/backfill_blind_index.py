@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+Backfill the blind index of encrypted mappings written before it existed.
+
+SecureFirestoreAdapter finds existing mappings for an original by querying
+the keyed HMAC stored next to the encrypted original. Documents written by
+older versions lack that field, so reverse lookups miss them and the same
+original would get a second fake value. This tool pages through the
+collection, decrypts each original lacking the field, and adds its blind
+index with batched updates. It is safe to re-run; with --force it also
+recomputes existing indexes, e.g. after changing the blind index key.
+"""
+import argparse
+import os
+import sys
+import time
+
+from reversible_anonymizer.storage.secure_firestore_adapter import SecureFirestoreAdapter, BLIND_INDEX_FIELD
+
+
+def backfill(adapter, page_size, batch_size, force, dry_run):
+    """Add missing blind indexes. Returns counts by outcome."""
+    counts = {"scanned": 0, "indexed": 0, "already_indexed": 0, "failed": 0}
+    collection = adapter.db.collection(adapter.collection_name)
+    batch = adapter.db.batch()
+    pending = 0
+    last = None
+
+    while True:
+        query = collection.order_by("__name__").limit(page_size)
+        if last is not None:
+            query = query.start_after(last)
+        docs = list(query.stream())
+        if not docs:
+            break
+
+        for doc in docs:
+            counts["scanned"] += 1
+            data = doc.to_dict()
+            if BLIND_INDEX_FIELD in data and not force:
+                counts["already_indexed"] += 1
+                continue
+            try:
+                original = adapter._decrypt(data["original_data"])
+            except Exception as e:
+                print(f"Skipping {doc.id}: cannot decrypt ({type(e).__name__})", file=sys.stderr)
+                counts["failed"] += 1
+                continue
+
+            counts["indexed"] += 1
+            if dry_run:
+                continue
+            batch.update(doc.reference, {BLIND_INDEX_FIELD: adapter.blind_index(original)})
+            pending += 1
+            if pending >= batch_size:
+                batch.commit()
+                batch = adapter.db.batch()
+                pending = 0
+
+        last = docs[-1]
+        print(f"{counts['scanned']:,} scanned, {counts['indexed']:,} indexed", file=sys.stderr)
+
+    if pending:
+        batch.commit()
+    return counts
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Backfill blind indexes of encrypted mappings")
+    parser.add_argument("--project", required=True, help="Google Cloud project ID")
+    parser.add_argument("--collection", default="anonymization_mappings", help="Mappings collection")
+    parser.add_argument("--encryption-key", default=os.environ.get("ANONYMIZER_ENCRYPTION_KEY"),
+                        help="Fernet key (default: $ANONYMIZER_ENCRYPTION_KEY)")
+    parser.add_argument("--blind-index-key", default=os.environ.get("ANONYMIZER_BLIND_INDEX_KEY"),
+                        help="Blind index key, if the anonymizer sets one (default: $ANONYMIZER_BLIND_INDEX_KEY)")
+    parser.add_argument("--page-size", type=int, default=1000, help="Documents read per query")
+    parser.add_argument("--batch-size", type=int, default=500, help="Updates per batched write (max 500)")
+    parser.add_argument("--force", action="store_true", help="Recompute indexes that already exist")
+    parser.add_argument("--dry-run", action="store_true", help="Count documents without writing")
+    args = parser.parse_args()
+
+    if not args.encryption_key:
+        parser.error("an encryption key is required (--encryption-key or $ANONYMIZER_ENCRYPTION_KEY)")
+
+    adapter = SecureFirestoreAdapter(
+        project=args.project,
+        collection_name=args.collection,
+        encryption_key=args.encryption_key,
+        blind_index_key=args.blind_index_key
+    )
+    if not adapter.encryption_enabled:
+        sys.exit("Encryption could not be enabled with this key; nothing to backfill")
+
+    start = time.perf_counter()
+    counts = backfill(adapter, args.page_size, min(args.batch_size, 500), args.force, args.dry_run)
+    elapsed = time.perf_counter() - start
+
+    print(", ".join(f"{name}: {count:,}" for name, count in counts.items()) + f" in {elapsed:.1f}s")
+    if args.dry_run:
+        print("Dry run: no documents were updated")
+    sys.exit(1 if counts["failed"] else 0)
+
+
+if __name__ == "__main__":
+    main()
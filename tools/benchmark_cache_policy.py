@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+Compare the hit ratio of the memory cache eviction policies on a key trace.
+
+Replays a trace as a read-through cache: every key is looked up and stored
+on a miss. The trace is read from a file with one key per line, or
+generated: Zipf-distributed lookups of recurring keys interleaved with
+bursts of single-use keys, as produced by bulk imports.
+"""
+import argparse
+import random
+import time
+
+from reversible_anonymizer.cache.memory_cache import MemoryCacheAdapter, POLICIES
+
+
+def synthetic_trace(length, hot_keys, skew, burst_every, burst_length, seed):
+    """Generate recurring Zipf lookups interrupted by one-off bursts."""
+    rng = random.Random(seed)
+    weights = [1 / (rank ** skew) for rank in range(1, hot_keys + 1)]
+    keys = [f"name-{i}" for i in range(hot_keys)]
+    trace = []
+    one_off = 0
+    while len(trace) < length:
+        trace.extend(rng.choices(keys, weights, k=burst_every))
+        for _ in range(burst_length):
+            trace.append(f"email-{one_off}")
+            one_off += 1
+    return trace[:length]
+
+
+def load_trace(path):
+    """Read one key per line, skipping blank lines."""
+    with open(path, "r", encoding="utf-8") as f:
+        return [line.rstrip("\n") for line in f if line.strip()]
+
+
+def replay(trace, policy, capacity, shards):
+    """Return (hit ratio, seconds) for one policy."""
+    cache = MemoryCacheAdapter(capacity=capacity, default_ttl=0, shards=shards, policy=policy)
+    start = time.perf_counter()
+    for key in trace:
+        if cache.get(key) is None:
+            cache.put(key, key)
+    elapsed = time.perf_counter() - start
+    return cache.get_stats()["hit_rate"], elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare cache policy hit ratios on a key trace")
+    parser.add_argument("--trace", help="File with one key per line (default: synthetic trace)")
+    parser.add_argument("--capacity", type=int, default=1000, help="Cache capacity in items")
+    parser.add_argument("--shards", type=int, default=16, help="Cache shards")
+    parser.add_argument("--length", type=int, default=500_000, help="Synthetic trace length")
+    parser.add_argument("--hot-keys", type=int, default=5_000, help="Recurring keys in the synthetic trace")
+    parser.add_argument("--skew", type=float, default=0.9, help="Zipf exponent of recurring keys")
+    parser.add_argument("--burst-every", type=int, default=2_000, help="Recurring lookups between bursts")
+    parser.add_argument("--burst-length", type=int, default=1_000, help="One-off keys per burst")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed")
+    args = parser.parse_args()
+
+    if args.trace:
+        trace = load_trace(args.trace)
+    else:
+        trace = synthetic_trace(args.length, args.hot_keys, args.skew,
+                                args.burst_every, args.burst_length, args.seed)
+    print(f"{len(trace):,} lookups, {len(set(trace)):,} distinct keys, capacity {args.capacity:,}")
+
+    for policy in POLICIES:
+        hit_rate, elapsed = replay(trace, policy, args.capacity, args.shards)
+        print(f"{policy:>8}: hit ratio {hit_rate:6.2%}  ({len(trace) / elapsed:,.0f} lookups/s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Measure p50/p99 latency of FirestoreAdapter.batch_get_originals.
+
+By default the adapter talks to an in-process stand-in for the Firestore
+emulator: each get_all call sleeps for one simulated round trip (log-normal
+around --latency) plus a small per-document cost. Pass --emulator to use a
+real emulator instead (FIRESTORE_EMULATOR_HOST must be set). Compares the
+serial read path (one chunk at a time) with concurrent chunk reads, on
+inputs that repeat some fake values.
+"""
+import argparse
+import os
+import random
+import statistics
+import time
+
+from reversible_anonymizer.storage import firestore_adapter
+from reversible_anonymizer.storage.firestore_adapter import FirestoreAdapter
+
+
+class _Snapshot:
+    def __init__(self, doc_id, data):
+        self.id = doc_id
+        self.exists = data is not None
+        self._data = data
+
+    def to_dict(self):
+        return self._data
+
+
+class _DocumentRef:
+    def __init__(self, doc_id):
+        self.id = doc_id
+
+
+class _Collection:
+    def document(self, doc_id):
+        return _DocumentRef(doc_id)
+
+
+class StandInClient:
+    """Firestore client stand-in serving get_all from a dict with simulated latency."""
+
+    def __init__(self, documents, latency, per_document):
+        self.documents = documents
+        self.latency = latency
+        self.per_document = per_document
+
+    def collection(self, name):
+        return _Collection()
+
+    def get_all(self, refs):
+        refs = list(refs)
+        time.sleep(random.lognormvariate(0, 0.5) * self.latency + self.per_document * len(refs))
+        return [_Snapshot(ref.id, self.documents.get(ref.id)) for ref in refs]
+
+
+def percentile(samples, fraction):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+def run(adapter, keys, tokens, duplicate_ratio, rounds):
+    """Return per-call latencies in milliseconds."""
+    latencies = []
+    for _ in range(rounds):
+        distinct = random.sample(keys, int(tokens * (1 - duplicate_ratio)))
+        request = distinct + random.choices(distinct, k=tokens - len(distinct))
+        random.shuffle(request)
+        start = time.perf_counter()
+        found = adapter.batch_get_originals(request)
+        latencies.append((time.perf_counter() - start) * 1e3)
+        assert len(found) == len(distinct)
+    return latencies
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure FirestoreAdapter.batch_get_originals latency")
+    parser.add_argument("--tokens", type=int, default=3000, help="Fake values per call")
+    parser.add_argument("--duplicates", type=float, default=0.3, help="Share of repeated values per call")
+    parser.add_argument("--rounds", type=int, default=50, help="Calls per configuration")
+    parser.add_argument("--latency", type=float, default=0.01, help="Median seconds per get_all round trip")
+    parser.add_argument("--per-document", type=float, default=0.00002, help="Seconds per fetched document")
+    parser.add_argument("--chunk-sizes", default="100,300", help="Comma-separated read_chunk_size values")
+    parser.add_argument("--concurrency", default="1,4,8,16", help="Comma-separated max_concurrent_reads values")
+    parser.add_argument("--emulator", action="store_true", help="Use the emulator at FIRESTORE_EMULATOR_HOST")
+    args = parser.parse_args()
+
+    keys = [f"fake-{i}" for i in range(max(args.tokens * 2, 10_000))]
+    documents = {key: {"original_data": f"original-{key}"} for key in keys}
+
+    if args.emulator:
+        if not os.environ.get("FIRESTORE_EMULATOR_HOST"):
+            parser.error("--emulator needs FIRESTORE_EMULATOR_HOST")
+        seeder = FirestoreAdapter("benchmark", "benchmark_mappings")
+        seeder.batch_store_mappings({key: data["original_data"] for key, data in documents.items()})
+    else:
+        stand_in = StandInClient(documents, args.latency, args.per_document)
+        firestore_adapter.firestore.Client = lambda project=None: stand_in
+
+    print(f"{args.tokens:,} values per call, {args.duplicates:.0%} repeated")
+    print(f"{'chunk':>6}{'workers':>9}{'p50 ms':>10}{'p99 ms':>10}")
+    for chunk_size in (int(value) for value in args.chunk_sizes.split(",")):
+        for workers in (int(value) for value in args.concurrency.split(",")):
+            adapter = FirestoreAdapter("benchmark", "benchmark_mappings",
+                                       read_chunk_size=chunk_size, max_concurrent_reads=workers)
+            latencies = run(adapter, keys, args.tokens, args.duplicates, args.rounds)
+            adapter.close()
+            print(f"{chunk_size:>6}{workers:>9}{statistics.median(latencies):>10.1f}"
+                  f"{percentile(latencies, 0.99):>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
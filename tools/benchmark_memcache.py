@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Compare the memcache adapters side by side on a running memcached.
+
+Measures operations per second and per-call latency percentiles for
+single gets, batch gets and batch puts with MemcacheAdapter
+(python-memcached) and PymemcacheAdapter, with and without noreply
+writes.
+"""
+import argparse
+import random
+import statistics
+import time
+
+from reversible_anonymizer.cache.memcache_adapter import MemcacheAdapter
+from reversible_anonymizer.cache.pymemcache_adapter import PymemcacheAdapter
+
+
+def percentile(samples, fraction):
+    """Return the sample at the given fraction of the sorted samples."""
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+def measure(name, calls, operation, items_per_call):
+    """Time calls to operation and print throughput and latency."""
+    latencies = []
+    start = time.perf_counter()
+    for i in range(calls):
+        began = time.perf_counter()
+        operation(i)
+        latencies.append(time.perf_counter() - began)
+    elapsed = time.perf_counter() - start
+    print(
+        f"  {name:<12} {calls * items_per_call / elapsed:>10,.0f} items/s"
+        f"  p50 {statistics.median(latencies) * 1e3:7.3f} ms"
+        f"  p99 {percentile(latencies, 0.99) * 1e3:7.3f} ms"
+    )
+
+
+def run(label, adapter, keys, calls, batch_size, seed):
+    """Run the single get, batch put and batch get workloads on one adapter."""
+    print(label)
+    rng = random.Random(seed)
+    batches = [rng.sample(keys, batch_size) for _ in range(calls)]
+    values = {key: f"fake-{key}" for key in keys}
+
+    measure("batch_put", calls, lambda i: adapter.batch_put({key: values[key] for key in batches[i]}), batch_size)
+    measure("batch_get", calls, lambda i: adapter.batch_get(batches[i]), batch_size)
+    measure("get", calls, lambda i: adapter.get(batches[i][0]), 1)
+    adapter.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the memcache adapters")
+    parser.add_argument("--servers", default="127.0.0.1:11211",
+                        help="Comma-separated host:port list of running servers")
+    parser.add_argument("--calls", type=int, default=2_000, help="Calls per workload")
+    parser.add_argument("--batch-size", type=int, default=50, help="Keys per batch call")
+    parser.add_argument("--keys", type=int, default=10_000, help="Distinct keys")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed")
+    args = parser.parse_args()
+
+    servers = args.servers.split(",")
+    keys = [f"o2f:user{i}@example.com" for i in range(args.keys)]
+    common = {"servers": servers, "check_service": False}
+
+    run("python-memcached", MemcacheAdapter("benchmark", **common),
+        keys, args.calls, args.batch_size, args.seed)
+    run("pymemcache", PymemcacheAdapter("benchmark", **common),
+        keys, args.calls, args.batch_size, args.seed)
+    run("pymemcache noreply", PymemcacheAdapter("benchmark", noreply=True, **common),
+        keys, args.calls, args.batch_size, args.seed)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+Benchmark MemoryCacheAdapter throughput under concurrent workers.
+
+Runs a read-heavy get/put/batch mix from an increasing number of threads,
+once with a single shard (equivalent to one global lock) and once with the
+sharded layout.
+"""
+import argparse
+import random
+import threading
+import time
+
+from reversible_anonymizer.cache.memory_cache import MemoryCacheAdapter
+
+
+def worker(cache, keys, operations, seed, barrier):
+    """Run a mix of single and batch operations."""
+    rng = random.Random(seed)
+    barrier.wait()
+    for i in range(operations):
+        roll = rng.random()
+        if roll < 0.7:
+            cache.get(rng.choice(keys))
+        elif roll < 0.9:
+            key = rng.choice(keys)
+            cache.put(key, key)
+        elif roll < 0.95:
+            cache.batch_get(rng.sample(keys, 16))
+        else:
+            batch = rng.sample(keys, 16)
+            cache.batch_put({key: key for key in batch})
+
+
+def run(shards, workers, operations, key_count, capacity):
+    """Return operations per second for one configuration."""
+    cache = MemoryCacheAdapter(capacity=capacity, shards=shards)
+    keys = [f"key-{i}" for i in range(key_count)]
+    cache.batch_put({key: key for key in keys[:capacity]})
+
+    barrier = threading.Barrier(workers + 1)
+    threads = [
+        threading.Thread(target=worker, args=(cache, keys, operations, seed, barrier))
+        for seed in range(workers)
+    ]
+    for thread in threads:
+        thread.start()
+    barrier.wait()
+    start = time.perf_counter()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+    return workers * operations / elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the memory cache adapter")
+    parser.add_argument("--workers", default="1,2,4,8,16",
+                        help="Comma-separated worker counts")
+    parser.add_argument("--operations", type=int, default=50_000,
+                        help="Operations per worker")
+    parser.add_argument("--keys", type=int, default=100_000)
+    parser.add_argument("--capacity", type=int, default=50_000)
+    parser.add_argument("--shards", type=int, default=16)
+    args = parser.parse_args()
+
+    print(f"{'workers':>8} {'1 shard ops/s':>15} {f'{args.shards} shards ops/s':>17}")
+    for workers in (int(w) for w in args.workers.split(",")):
+        single = run(1, workers, args.operations, args.keys, args.capacity)
+        sharded = run(args.shards, workers, args.operations, args.keys, args.capacity)
+        print(f"{workers:>8} {single:>15,.0f} {sharded:>17,.0f}")
+
+
+if __name__ == "__main__":
+    main()
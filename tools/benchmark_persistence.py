@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Benchmark how new mappings reach storage.
+
+Simulates a storage backend where every write call costs one round trip
+(--latency) and persists the mappings of concurrent requests three ways:
+one store_mapping call per mapping (the old path), one batched call per
+request, and the WriteBehindBuffer coalescing requests across workers.
+"""
+import argparse
+import threading
+import time
+
+from reversible_anonymizer.storage.base import MemoryAdapter
+from reversible_anonymizer.storage.write_behind import WriteBehindBuffer
+
+
+class SlowStorage(MemoryAdapter):
+    """In-memory storage that sleeps for one round trip per write call."""
+
+    def __init__(self, latency):
+        super().__init__()
+        self.latency = latency
+        self.round_trips = 0
+        self._lock = threading.Lock()
+
+    def _round_trip(self):
+        with self._lock:
+            self.round_trips += 1
+        time.sleep(self.latency)
+
+    def store_mapping(self, fake_data, original_data, metadata=None):
+        self._round_trip()
+        self.mappings[fake_data] = {"original_data": original_data, "timestamp": time.time(),
+                                    "metadata": metadata or {}}
+
+    def batch_store_mapping_records(self, records):
+        self._round_trip()
+        for fake_data, original_data, metadata in records:
+            self.mappings[fake_data] = {"original_data": original_data, "timestamp": time.time(),
+                                        "metadata": metadata or {}}
+
+
+def run(mode, workers, requests, entities, latency):
+    """Return (requests per second, round trips) for one mode."""
+    storage = SlowStorage(latency)
+    buffer = WriteBehindBuffer(storage) if mode == "write-behind" else None
+    barrier = threading.Barrier(workers + 1)
+
+    def worker(worker_id):
+        barrier.wait()
+        for request in range(requests):
+            records = [
+                (f"fake-{worker_id}-{request}-{i}", f"original-{worker_id}-{request}-{i}",
+                 {"info_type": "EMAIL_ADDRESS", "run_id": f"{worker_id}-{request}"})
+                for i in range(entities)
+            ]
+            if mode == "per-mapping":
+                for record in records:
+                    storage.store_mapping(*record)
+            elif mode == "batched":
+                storage.batch_store_mapping_records(records)
+            else:
+                buffer.submit(records).result()  # Wait for the acknowledgement
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(workers)]
+    for thread in threads:
+        thread.start()
+    barrier.wait()
+    start = time.perf_counter()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+    if buffer is not None:
+        buffer.close()
+    return workers * requests / elapsed, storage.round_trips
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark mapping persistence strategies")
+    parser.add_argument("--workers", type=int, default=8, help="Concurrent requests")
+    parser.add_argument("--requests", type=int, default=20, help="Requests per worker")
+    parser.add_argument("--entities", type=int, default=200, help="New mappings per request")
+    parser.add_argument("--latency", type=float, default=0.005, help="Seconds per storage round trip")
+    args = parser.parse_args()
+
+    print(f"{'mode':<14}{'requests/s':>12}{'round trips':>14}")
+    for mode in ("per-mapping", "batched", "write-behind"):
+        throughput, round_trips = run(mode, args.workers, args.requests, args.entities, args.latency)
+        print(f"{mode:<14}{throughput:>12,.1f}{round_trips:>14,}")
+
+
+if __name__ == "__main__":
+    main()
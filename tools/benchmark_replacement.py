@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Benchmark applying replacements to large texts.
+
+Compares the single-pass replacement engine with the previous approach of
+checking every processed range for overlaps and rebuilding the string per
+replacement.
+"""
+import argparse
+import random
+import string
+import time
+
+from reversible_anonymizer.replacement import Replacement, apply_replacements
+
+
+def build_case(text_size, finding_count, seed):
+    """Build a random text and non-overlapping replacements for it."""
+    rng = random.Random(seed)
+    text = "".join(rng.choice(string.ascii_letters + "     \n") for _ in range(text_size))
+
+    slot = text_size // finding_count
+    replacements = []
+    for i in range(finding_count):
+        start = i * slot + rng.randint(0, slot // 2)
+        end = start + rng.randint(1, slot // 2)
+        replacements.append(Replacement(start, end, f"PERSON-{i:08x}"))
+    rng.shuffle(replacements)
+    return text, replacements
+
+
+def legacy_apply(text, replacements):
+    """Previous algorithm: quadratic overlap scan and per-replacement rebuild."""
+    processed_ranges = []
+    kept = []
+    for replacement in sorted(replacements, key=lambda r: (r.start, -r.end)):
+        if any(replacement.start <= r_end and replacement.end >= r_start
+               for r_start, r_end in processed_ranges):
+            continue
+        processed_ranges.append((replacement.start, replacement.end))
+        kept.append(replacement)
+
+    result = text
+    for replacement in sorted(kept, key=lambda r: r.start, reverse=True):
+        result = result[:replacement.start] + replacement.text + result[replacement.end:]
+    return result
+
+
+def timed(func, *args, repeat=3):
+    """Return the best wall time of several runs and the last result."""
+    best = float("inf")
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func(*args)
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the replacement engine")
+    parser.add_argument("--text-size", type=int, default=1_000_000,
+                        help="Characters per text (default: 1 MB)")
+    parser.add_argument("--findings", type=int, default=10_000,
+                        help="Replacements per text")
+    parser.add_argument("--repeat", type=int, default=3,
+                        help="Runs per algorithm; the best time is reported")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    text, replacements = build_case(args.text_size, args.findings, args.seed)
+
+    legacy_time, legacy_result = timed(legacy_apply, text, replacements, repeat=args.repeat)
+    engine_time, (engine_result, span_map) = timed(apply_replacements, text, replacements,
+                                                   repeat=args.repeat)
+
+    if legacy_result != engine_result:
+        raise SystemExit("Results differ between algorithms")
+
+    print(f"Text size:    {len(text):,} chars, {len(span_map):,} replacements")
+    print(f"Legacy:       {legacy_time * 1000:10.1f} ms")
+    print(f"Single pass:  {engine_time * 1000:10.1f} ms")
+    print(f"Speedup:      {legacy_time / engine_time:10.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+Exercise the multi-node MemcacheAdapter against a local memcached cluster.
+
+Starts several memcached processes on consecutive ports (or uses the
+servers given with --servers) and checks that:
+
+- batch writes and reads round-trip across all nodes;
+- keys are spread evenly over the nodes;
+- removing a node only remaps the keys it owned;
+- concurrent workers see consistent results.
+
+Exits non-zero if any check fails.
+"""
+import argparse
+import shutil
+import subprocess
+import sys
+import threading
+import time
+
+from reversible_anonymizer.cache.memcache_adapter import MemcacheAdapter
+
+
+def start_cluster(nodes, base_port, memory_mb):
+    """Start memcached processes and return (processes, servers)."""
+    binary = shutil.which("memcached")
+    if binary is None:
+        sys.exit("memcached not found on PATH; install it or pass --servers")
+
+    processes = []
+    servers = []
+    for i in range(nodes):
+        port = base_port + i
+        processes.append(subprocess.Popen(
+            [binary, "-p", str(port), "-l", "127.0.0.1", "-m", str(memory_mb), "-U", "0"],
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL
+        ))
+        servers.append(f"127.0.0.1:{port}")
+    time.sleep(0.5)  # Give the servers time to bind
+    return processes, servers
+
+
+def check(name, passed, detail=""):
+    """Print one check result and return whether it passed."""
+    print(f"[{'PASS' if passed else 'FAIL'}] {name}{': ' + detail if detail else ''}")
+    return passed
+
+
+def run_checks(servers, key_count, workers):
+    """Run every check against the given servers. Returns True if all pass."""
+    adapter = MemcacheAdapter("local", servers=servers, check_service=False)
+    adapter.clear()
+    results = []
+
+    # Round trip across nodes
+    data = {f"o2f:original-{i}": f"fake-{i}" for i in range(key_count)}
+    stored = adapter.batch_put(data, ttl=0)
+    found = adapter.batch_get(list(data))
+    results.append(check("batch round trip", stored and found == data,
+                         f"{len(found):,}/{len(data):,} keys read back"))
+
+    # Distribution over nodes
+    ring, _ = adapter._topology
+    owners = ring.group(adapter.key_codec.encode(key) for key in data)
+    counts = {node: len(owners.get(node, [])) for node in ring.nodes}
+    expected = key_count / len(ring.nodes)
+    spread = max(abs(count - expected) / expected for count in counts.values())
+    results.append(check("even distribution", spread < 0.25,
+                         ", ".join(f"{node}={count:,}" for node, count in counts.items())))
+
+    # Removing a node only remaps its own keys
+    if len(servers) > 1:
+        removed = servers[-1]
+        adapter._set_nodes([adapter._parse_node(server) for server in servers[:-1]])
+        kept = adapter.batch_get(list(data))
+        lost = len(data) - len(kept)
+        results.append(check("node removal remaps only its keys", lost == counts[removed],
+                             f"{lost:,} keys moved, {counts[removed]:,} owned by {removed}"))
+        adapter._set_nodes([adapter._parse_node(server) for server in servers])
+
+    # Concurrent workers
+    errors = []
+    keys = list(data)
+
+    def worker(offset):
+        for start in range(offset, len(keys), workers * 50):
+            batch = keys[start:start + 50]
+            if adapter.batch_get(batch) != {key: data[key] for key in batch}:
+                errors.append(start)
+
+    threads = [threading.Thread(target=worker, args=(i * 50,)) for i in range(workers)]
+    began = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - began
+    results.append(check("concurrent batch reads", not errors,
+                         f"{workers} workers, {len(keys) / elapsed:,.0f} keys/s"))
+
+    print(adapter.get_stats())
+    adapter.close()
+    return all(results)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check the multi-node memcache adapter on a local cluster")
+    parser.add_argument("--nodes", type=int, default=3, help="memcached processes to start")
+    parser.add_argument("--base-port", type=int, default=21211, help="Port of the first node")
+    parser.add_argument("--memory", type=int, default=64, help="Memory per node in MB")
+    parser.add_argument("--servers", help="Comma-separated host:port list of running servers")
+    parser.add_argument("--keys", type=int, default=20_000, help="Keys to write")
+    parser.add_argument("--workers", type=int, default=8, help="Concurrent reader threads")
+    args = parser.parse_args()
+
+    processes = []
+    if args.servers:
+        servers = args.servers.split(",")
+    else:
+        processes, servers = start_cluster(args.nodes, args.base_port, args.memory)
+
+    try:
+        passed = run_checks(servers, args.keys, args.workers)
+    finally:
+        for process in processes:
+            process.terminate()
+            process.wait()
+
+    sys.exit(0 if passed else 1)
+
+
+if __name__ == "__main__":
+    main()
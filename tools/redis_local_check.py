@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Exercise RedisCacheAdapter against a local redis-server.
+
+Starts redis-server on a spare port (or uses the server given with --url)
+and checks batch round trips, TTLs, hash-slot grouping and, with
+--client-side-cache, RESP3 client-side caching. Exits non-zero if any
+check fails.
+"""
+import argparse
+import shutil
+import subprocess
+import sys
+import time
+
+from reversible_anonymizer.cache.redis_adapter import RedisCacheAdapter
+
+
+def start_server(port):
+    """Start redis-server without persistence and return the process."""
+    binary = shutil.which("redis-server")
+    if binary is None:
+        sys.exit("redis-server not found on PATH; install it or pass --url")
+    process = subprocess.Popen(
+        [binary, "--port", str(port), "--bind", "127.0.0.1", "--save", "", "--appendonly", "no"],
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL
+    )
+    time.sleep(0.5)  # Give the server time to bind
+    return process
+
+
+def check(name, passed, detail=""):
+    """Print one check result and return whether it passed."""
+    print(f"[{'PASS' if passed else 'FAIL'}] {name}{': ' + detail if detail else ''}")
+    return passed
+
+
+def run_checks(url, key_count, client_side_cache):
+    """Run every check against the server. Returns True if all pass."""
+    adapter = RedisCacheAdapter(url=url, default_ttl=60, client_side_cache=client_side_cache)
+    adapter.clear()
+    results = []
+
+    data = {f"o2f:original-{i}": f"fake-{i}" for i in range(key_count)}
+    start = time.perf_counter()
+    stored = adapter.batch_put(data)
+    found = adapter.batch_get(list(data))
+    elapsed = time.perf_counter() - start
+    results.append(check("batch round trip", stored and found == data,
+                         f"{len(found):,}/{len(data):,} keys in {elapsed * 1e3:.1f} ms"))
+
+    adapter.put("o2f:forever", "fake", ttl=0)
+    ttl = adapter.client.ttl(adapter.key_codec.encode(next(iter(data))))
+    forever = adapter.client.ttl(adapter.key_codec.encode("o2f:forever"))
+    results.append(check("TTLs", 0 < ttl <= 60 and forever == -1, f"default {ttl}s, ttl=0 -> {forever}"))
+
+    # Slot grouping must keep every multi-key command inside one slot
+    adapter.cluster = True
+    groups = adapter._slot_groups([adapter.key_codec.encode(key) for key in data])
+    grouped = adapter.batch_get(list(data))
+    adapter.cluster = False
+    results.append(check("hash-slot grouped batch", grouped == data, f"{len(groups):,} slot groups"))
+
+    if client_side_cache:
+        key = next(iter(data))
+        adapter.get(key)
+        adapter.get(key)
+        adapter.client.set(adapter.key_codec.encode(key), "changed")  # Invalidates the tracked key
+        results.append(check("client-side cache invalidation", adapter.get(key) == "changed"))
+
+    print(adapter.get_stats())
+    adapter.close()
+    return all(results)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check the Redis adapter on a local redis-server")
+    parser.add_argument("--url", help="URL of a running server (default: start redis-server)")
+    parser.add_argument("--port", type=int, default=26379, help="Port for the started server")
+    parser.add_argument("--keys", type=int, default=10_000, help="Keys to write")
+    parser.add_argument("--client-side-cache", action="store_true",
+                        help="Also check RESP3 client-side caching (Redis 6+)")
+    args = parser.parse_args()
+
+    process = None
+    url = args.url
+    if url is None:
+        process = start_server(args.port)
+        url = f"redis://127.0.0.1:{args.port}/0"
+
+    try:
+        passed = run_checks(url, args.keys, args.client_side_cache)
+    finally:
+        if process is not None:
+            process.terminate()
+            process.wait()
+
+    sys.exit(0 if passed else 1)
+
+
+if __name__ == "__main__":
+    main()